@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark the batched NumPy transform path against per-image PIL calls.
+
+The same normalize, brightness, contrast and invert chain is applied with PIL
+(ImageOps and ImageEnhance, one image at a time) and with batch operations
+over stacked arrays. The pixel stage is timed on already decoded images, then
+both full pipelines are timed end to end including decode and encode.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from image_processor.api.processor import (
+    process_images_with_batch_transformation,
+    process_images_with_transformation
+)
+from image_processor.core.batch_transform import (
+    brightness,
+    compose_batch_ops,
+    contrast,
+    decode_for_batch,
+    get_numpy,
+    invert,
+    normalize
+)
+from image_processor.core.image_loader import open_image_file
+from image_processor.utils.file_ops import get_image_files_in_directory
+
+
+def pil_chain(img):
+    """Per-image PIL equivalent of the batch chain."""
+    from PIL import ImageEnhance, ImageOps
+    img = ImageOps.autocontrast(img.convert("RGB"), preserve_tone=False)
+    img = ImageEnhance.Brightness(img).enhance(1.2)
+    img = ImageEnhance.Contrast(img).enhance(1.3)
+    return ImageOps.invert(img)
+
+
+BATCH_CHAIN = compose_batch_ops(normalize(), brightness(1.2), contrast(1.3), invert())
+
+
+def time_pixel_stage(image_paths, repeats: int) -> None:
+    """
+    Time the transform alone on decoded images, including array conversion for the batch path.
+
+    Args:
+        image_paths: Image files to use
+        repeats: Number of repetitions (best time is reported)
+    """
+    np = get_numpy()
+    images = []
+    for path in image_paths:
+        with open_image_file(path) as img:
+            images.append(img.convert("RGB"))
+    arrays = [decode_for_batch(path, "RGB") for path in image_paths]
+
+    pil_best = batch_best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for img in images:
+            pil_chain(img)
+        pil_best = min(pil_best, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        stacked = np.empty((len(arrays),) + arrays[0].shape, dtype=np.float32)
+        for position, array in enumerate(arrays):
+            stacked[position] = array
+        result = BATCH_CHAIN(stacked)
+        np.clip(np.rint(result, out=result), 0, 255, out=result).astype(np.uint8)
+        batch_best = min(batch_best, time.perf_counter() - start)
+
+    print(f"  pixel stage  PIL per image {pil_best * 1000:8.1f} ms   batched {batch_best * 1000:8.1f} ms   "
+          f"speedup {pil_best / batch_best:.2f}x")
+
+
+def time_pipelines(directory_path: str, workers: int, compress_level: int) -> None:
+    """
+    Time both full pipelines, decode and encode included.
+
+    Args:
+        directory_path: Directory of images
+        workers: Decode and encode threads for the batch path
+        compress_level: PNG compression level for both paths
+    """
+    save_options = {"compress_level": compress_level}
+    with tempfile.TemporaryDirectory() as output_directory:
+        start = time.perf_counter()
+        count = len(process_images_with_transformation(
+            directory_path, pil_chain, os.path.join(output_directory, "pil"), save_options=save_options
+        ))
+        pil_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch_count = len(process_images_with_batch_transformation(
+            directory_path, BATCH_CHAIN, os.path.join(output_directory, "batch"),
+            workers=workers, save_options=save_options
+        ))
+        batch_time = time.perf_counter() - start
+
+    print(f"  end to end   PIL per image {pil_time * 1000:8.1f} ms ({count} files)   "
+          f"batched {batch_time * 1000:8.1f} ms ({batch_count} files, {workers} workers)   "
+          f"speedup {pil_time / batch_time:.2f}x")
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark batched NumPy transforms against per-image PIL transforms."
+    )
+    default_directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "demo")
+    parser.add_argument("--directory", default=default_directory,
+                      help="Directory of same-shaped sample images")
+    parser.add_argument("--repeats", "-r", type=int, default=3,
+                      help="Repetitions of the pixel stage (best time is reported)")
+    parser.add_argument("--workers", "-w", type=int, default=os.cpu_count() or 1,
+                      help="Decode and encode threads for the batch path")
+    parser.add_argument("--compress-level", type=int, default=1,
+                      help="PNG compression level used by both pipelines")
+
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_arguments()
+    image_paths = get_image_files_in_directory(args.directory)
+    if not image_paths:
+        print(f"Error: No images found in '{args.directory}'")
+        return 1
+
+    print(f"{len(image_paths)} images from {args.directory}")
+    time_pixel_stage(image_paths, args.repeats)
+    time_pipelines(args.directory, args.workers, args.compress_level)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
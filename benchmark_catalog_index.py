@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark record lookups in a large metadata export with and without the offset index.
+
+A synthetic catalog is generated from the demo metadata (one record per demo
+image, repeated with fresh uuids) and written as NDJSON or a JSON list together
+with its sidecar index. Fetching records by uuid is then timed with a full
+streaming parse of the export and through the index.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from typing import Any, Dict, Iterator, List
+
+from image_processor.api.processor import get_metadata_for_directory
+from image_processor.utils.catalog_index import (
+    close_catalog_reader,
+    get_record,
+    lookup_records,
+    open_catalog_reader,
+    read_records,
+    write_indexed_json_list,
+    write_indexed_ndjson
+)
+from image_processor.utils.json_stream import iter_json_records
+
+
+def iter_synthetic_records(templates: List[Dict[str, Any]], count: int, uuids: List[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Generate catalog records by cycling through template records with new uuids.
+
+    Args:
+        templates: Metadata records to copy
+        count: Number of records to generate
+        uuids: List receiving the generated uuids
+    """
+    for position in range(count):
+        record = dict(templates[position % len(templates)])
+        record_uuid = str(uuid.uuid4())
+        description = record.get("description", "image")
+        record["uuid"] = record_uuid
+        record["filename"] = f"{description}_{record_uuid}.png"
+        record["path"] = f"/catalog/{position // 1000:04d}/{record['filename']}"
+        uuids.append(record_uuid)
+        yield record
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark indexed record lookups against full parses of a metadata export."
+    )
+    default_directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "demo")
+    parser.add_argument("--directory", default=default_directory,
+                      help="Directory of sample images used as record templates")
+    parser.add_argument("--records", "-n", type=int, default=200000,
+                      help="Number of records in the synthetic catalog")
+    parser.add_argument("--lookups", "-k", type=int, default=100,
+                      help="Number of uuids looked up")
+    parser.add_argument("--layout", choices=["ndjson", "list"], default="ndjson",
+                      help="Export layout")
+
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_arguments()
+    templates = get_metadata_for_directory(args.directory)
+    if not templates:
+        print(f"Error: No images found in '{args.directory}'")
+        return 1
+
+    with tempfile.TemporaryDirectory() as temp_directory:
+        export_path = os.path.join(temp_directory, f"catalog.{'ndjson' if args.layout == 'ndjson' else 'json'}")
+        writer = write_indexed_ndjson if args.layout == "ndjson" else write_indexed_json_list
+        uuids: List[str] = []
+
+        start = time.perf_counter()
+        writer(iter_synthetic_records(templates, args.records, uuids), export_path)
+        write_time = time.perf_counter() - start
+        size_mb = os.path.getsize(export_path) / (1024 * 1024)
+        index_kb = os.path.getsize(export_path + ".idx") / 1024
+        print(f"{args.records} records, {size_mb:.1f} MB {args.layout} export, {index_kb:.0f} KB index "
+              f"(written with index in {write_time:.2f} s)")
+
+        wanted = random.Random(0).sample(uuids, min(args.lookups, len(uuids)))
+
+        start = time.perf_counter()
+        remaining = set(wanted)
+        for record in iter_json_records(export_path):
+            remaining.discard(record.get("uuid"))
+            if not remaining:
+                break
+        scan_time = time.perf_counter() - start
+        print(f"  full parse until all {len(wanted)} found      {scan_time * 1000:10.1f} ms")
+
+        start = time.perf_counter()
+        found = sum(get_record(export_path, "uuid", value) is not None for value in wanted)
+        single_time = (time.perf_counter() - start) / len(wanted)
+        print(f"  indexed single lookup ({found} found)      {single_time * 1e6:10.1f} us per record")
+
+        reader = open_catalog_reader(export_path)
+        start = time.perf_counter()
+        found = sum(bool(read_records(reader, "uuid", [value])[value]) for value in wanted)
+        reader_time = (time.perf_counter() - start) / len(wanted)
+        close_catalog_reader(reader)
+        print(f"  open reader single lookup ({found} found)  {reader_time * 1e6:10.1f} us per record")
+
+        start = time.perf_counter()
+        results = lookup_records(export_path, "uuid", wanted)
+        batch_time = time.perf_counter() - start
+        found = sum(1 for records in results.values() if records)
+        print(f"  indexed batch lookup ({found} found, mmap)  {batch_time * 1000:10.1f} ms total")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
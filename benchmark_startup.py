@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Measure CLI startup cost per command.
+
+Runs each image_processor_cli.py command in a fresh interpreter with
+`-X importtime`, then reports wall time, total import time, whether PIL was
+loaded and the most expensive top-level imports. Exits non-zero when a command
+exceeds its import-time budget, so it can be used as a startup regression check.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, Any, List, Tuple
+
+CLI_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "image_processor_cli.py")
+
+# Commands that must never import PIL
+PIL_FREE_COMMANDS = {"base64", "diff", "lookup", "text"}
+
+
+def write_sample_exports(scratch_directory: str) -> Tuple[str, str]:
+    """
+    Write two small NDJSON metadata exports for the export commands.
+
+    Args:
+        scratch_directory: Directory for the exports
+
+    Returns:
+        Paths of the older and newer export
+    """
+    records = [
+        {"filename": f"sample_{position}.png", "path": f"/samples/sample_{position}.png",
+         "uuid": f"00000000-0000-0000-0000-{position:012d}", "size_bytes": 1000 + position}
+        for position in range(3)
+    ]
+    paths = []
+    for name, export in (("old.ndjson", records[:2]), ("new.ndjson", records[1:])):
+        path = os.path.join(scratch_directory, name)
+        with open(path, "w") as f:
+            for record in export:
+                f.write(json.dumps(record) + "\n")
+        paths.append(path)
+    return paths[0], paths[1]
+
+
+def build_command_arguments(sample_image: str, sample_directory: str, scratch_directory: str) -> Dict[str, List[str]]:
+    """
+    Build the argument list used to exercise each CLI command.
+
+    Args:
+        sample_image: Image file used by single-file commands
+        sample_directory: Directory used by directory commands
+        scratch_directory: Directory for command output and sample exports
+
+    Returns:
+        Dictionary mapping command name to CLI arguments
+    """
+    output_path = os.path.join(scratch_directory, "output")
+    old_export, new_export = write_sample_exports(scratch_directory)
+    return {
+        "base64": ["base64", sample_image, "--output", output_path],
+        "file": ["file", sample_image, "--output", output_path],
+        "directory": ["directory", sample_directory, "--output", output_path],
+        "gallery": ["gallery", sample_directory, "--output", output_path],
+        "atlas": ["atlas", sample_directory, "--output-dir", os.path.join(scratch_directory, "atlas")],
+        "stats": ["stats", sample_directory, "--output", output_path],
+        "text": ["text", sample_directory, "--output", output_path],
+        "diff": ["diff", old_export, new_export, "--output", output_path],
+        "lookup": ["lookup", new_export, "00000000-0000-0000-0000-000000000002"],
+    }
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """
+    Parse `-X importtime` output.
+
+    Args:
+        stderr: Captured stderr of the interpreter
+
+    Returns:
+        List of (module name, self microseconds, cumulative microseconds)
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3:
+            continue
+        entries.append((fields[2].rstrip(), int(fields[0]), int(fields[1])))
+    return entries
+
+
+def measure_command(arguments: List[str]) -> Dict[str, Any]:
+    """
+    Run one CLI invocation and collect its startup statistics.
+
+    Args:
+        arguments: CLI arguments (command and options)
+
+    Returns:
+        Dictionary with timing and import statistics
+    """
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", CLI_PATH] + arguments,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    entries = parse_importtime(completed.stderr)
+    top_level = [(name.strip(), cumulative) for name, _, cumulative in entries if not name.startswith("  ")]
+    top_level.sort(key=lambda entry: entry[1], reverse=True)
+
+    return {
+        "exit_code": completed.returncode,
+        "wall_ms": wall_ms,
+        "import_ms": sum(self_us for _, self_us, _ in entries) / 1000,
+        "module_count": len(entries),
+        "pil_loaded": any(name.strip().startswith("PIL") for name, _, _ in entries),
+        "top_imports": top_level[:5],
+    }
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Report import-time startup cost for each CLI command."
+    )
+    default_directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "demo")
+    parser.add_argument("--directory", default=default_directory,
+                      help="Directory of sample images")
+    parser.add_argument("--budget-ms", type=float, default=100.0,
+                      help="Maximum allowed import time per command (in milliseconds)")
+    parser.add_argument("--repeat", "-r", type=int, default=3,
+                      help="Runs per command; the fastest run is reported")
+
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_arguments()
+
+    from image_processor.utils.file_ops import get_image_files_in_directory
+    images = sorted(get_image_files_in_directory(args.directory))
+    if not images:
+        print(f"Error: No images found in '{args.directory}'.")
+        return 1
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as scratch:
+        commands = build_command_arguments(images[0], args.directory, scratch)
+
+        for command, arguments in commands.items():
+            runs = [measure_command(arguments) for _ in range(max(1, args.repeat))]
+            best = min(runs, key=lambda run: run["import_ms"])
+
+            over_budget = best["import_ms"] > args.budget_ms
+            unexpected_pil = command in PIL_FREE_COMMANDS and best["pil_loaded"]
+            status = "FAIL" if over_budget or unexpected_pil else "ok"
+            failures += status == "FAIL"
+
+            print(f"{command:<10} {status:<4} wall {best['wall_ms']:7.1f} ms  "
+                  f"imports {best['import_ms']:7.1f} ms  modules {best['module_count']:4d}  "
+                  f"PIL {'yes' if best['pil_loaded'] else 'no'}")
+            for name, cumulative in best["top_imports"]:
+                print(f"    {cumulative / 1000:7.1f} ms  {name}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Regression check for indexing existing metadata exports.
+
+Writes the same records as NDJSON and as a JSON list (json.dump with indent=2),
+with LF and CRLF line endings and with and without a UTF-8 BOM, indexes each
+export with build_catalog_index and verifies that every record can be fetched
+back by uuid. Exits with status 1 if any check fails.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import uuid
+from typing import Any, Dict, List
+
+from image_processor.utils.catalog_index import build_catalog_index, lookup_records
+
+
+def make_records(count: int) -> List[Dict[str, Any]]:
+    """Build records with multi-byte characters so byte and character offsets differ."""
+    records = []
+    for position in range(count):
+        record_uuid = str(uuid.uuid4())
+        records.append({
+            "filename": f"café_{position}_{record_uuid}.png",
+            "path": f"/catalog/naïve/{position}.png",
+            "uuid": record_uuid,
+            "description": "小さな画像" * (position % 3),
+        })
+    return records
+
+
+def write_export(records: List[Dict[str, Any]], export_path: str, layout: str, newline: str, bom: bool) -> None:
+    """
+    Write an export the way other tools would, outside of the indexed writers.
+
+    Args:
+        records: Records to write
+        export_path: Path of the export
+        layout: "ndjson" or "list"
+        newline: Line ending to write
+        bom: Whether to start the file with a UTF-8 BOM
+    """
+    with open(export_path, "w", encoding="utf-8-sig" if bom else "utf-8", newline=newline) as f:
+        if layout == "list":
+            json.dump(records, f, indent=2, ensure_ascii=False)
+        else:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def run_check(records: List[Dict[str, Any]], directory: str, layout: str, newline: str, bom: bool) -> bool:
+    """
+    Index one export variant and look up all of its records.
+
+    Args:
+        records: Records to write
+        directory: Directory for the export
+        layout: "ndjson" or "list"
+        newline: Line ending to write
+        bom: Whether to start the file with a UTF-8 BOM
+
+    Returns:
+        True if the index covers every record and each lookup returns the right one
+    """
+    line_endings = "CRLF" if newline == "\r\n" else "LF"
+    name = f"{layout} {line_endings}{' BOM' if bom else ''}"
+    export_path = os.path.join(directory, f"{name.replace(' ', '_')}.{'ndjson' if layout == 'ndjson' else 'json'}")
+    write_export(records, export_path, layout, newline, bom)
+
+    try:
+        count = build_catalog_index(export_path)
+        results = lookup_records(export_path, "uuid", [record["uuid"] for record in records])
+        passed = count == len(records) and all(results[record["uuid"]] == [record] for record in records)
+    except ValueError as e:
+        print(f"{name:<18} FAIL  {e}")
+        return False
+
+    print(f"{name:<18} {'ok' if passed else 'FAIL'}  {count} records indexed")
+    return passed
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Check that exports with any line endings or a BOM are indexed at the right offsets."
+    )
+    parser.add_argument("--records", "-n", type=int, default=500,
+                      help="Number of records per export")
+
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_arguments()
+    records = make_records(args.records)
+
+    ok = True
+    with tempfile.TemporaryDirectory() as directory:
+        for layout in ("ndjson", "list"):
+            for newline in ("\n", "\r\n"):
+                for bom in (False, True):
+                    ok = run_check(records, directory, layout, newline, bom) and ok
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Regression check for the transformation output cache.
+
+Runs transforms that differ only in closed-over values or callable-object state
+through the same cache directory and verifies that each run produces its own
+outputs instead of being served another transform's cached derivatives. Also
+checks that outputs linked from the store can be overwritten, by an uncached run
+or by rewriting the file in place, without changing what the store serves later.
+Exits with status 1 if any check fails.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+from image_processor.api.processor import process_images_with_transformation
+from image_processor.core.image_loader import open_image_file
+from image_processor.utils.file_ops import get_image_files_in_directory
+
+
+def make_resize(size: int):
+    """Build a resize transform closing over its target size."""
+    def resize(img):
+        return img.resize((size, size))
+    return resize
+
+
+class Rotate:
+    """Callable rotation transform holding its angle as instance state."""
+
+    def __init__(self, angle: int):
+        self.angle = angle
+
+    def __call__(self, img):
+        return img.rotate(self.angle, expand=True)
+
+
+def grayscale(img):
+    """Grayscale transform."""
+    return img.convert("L")
+
+
+def invert(img):
+    """Color inversion transform."""
+    from PIL import ImageOps
+    return ImageOps.invert(img.convert("RGB"))
+
+
+def output_sizes(paths):
+    """Read the sizes of output images."""
+    sizes = set()
+    for path in paths:
+        with open_image_file(path) as img:
+            sizes.add(img.size)
+    return sizes
+
+
+def run_check(name: str, directory_path: str, cache_directory: str, transforms, expected_sizes) -> bool:
+    """
+    Run transforms in turn through one cache and compare the output sizes.
+
+    Args:
+        name: Name of the check
+        directory_path: Directory of sample images
+        cache_directory: Shared cache directory
+        transforms: Transforms to run in order
+        expected_sizes: Expected set of output sizes for each transform
+
+    Returns:
+        True if every run produced the expected sizes
+    """
+    ok = True
+    for position, (transform_fn, expected) in enumerate(zip(transforms, expected_sizes)):
+        with tempfile.TemporaryDirectory() as output_directory:
+            paths = process_images_with_transformation(
+                directory_path, transform_fn, output_directory, cache_directory=cache_directory
+            )
+            sizes = output_sizes(paths)
+        passed = bool(paths) and sizes == expected
+        ok = ok and passed
+        print(f"{name:<18} run {position + 1}  {'ok' if passed else 'FAIL'}  sizes {sorted(sizes)}")
+    return ok
+
+
+def output_modes(paths):
+    """Read the modes of output images."""
+    modes = set()
+    for path in paths:
+        with open_image_file(path) as img:
+            modes.add(img.mode)
+    return modes
+
+
+def run_overwrite_check(directory_path: str, cache_directory: str) -> bool:
+    """
+    Overwrite cached outputs and verify the store still serves the original outputs.
+
+    Args:
+        directory_path: Directory of sample images
+        cache_directory: Shared cache directory
+
+    Returns:
+        True if every cached run produced grayscale outputs
+    """
+    ok = True
+    with tempfile.TemporaryDirectory() as output_directory:
+        def cached_grayscale():
+            return process_images_with_transformation(
+                directory_path, grayscale, output_directory, cache_directory=cache_directory
+            )
+
+        steps = [
+            ("uncached run", lambda paths: process_images_with_transformation(
+                directory_path, invert, output_directory)),
+            ("in-place write", lambda paths: [invert(open_image_file(path)).save(path) for path in paths]),
+        ]
+        paths = cached_grayscale()
+        for name, overwrite in steps:
+            overwrite(paths)
+            paths = cached_grayscale()
+            passed = bool(paths) and output_modes(paths) == {"L"}
+            ok = ok and passed
+            print(f"{name:<18} then cached  {'ok' if passed else 'FAIL'}  modes {sorted(output_modes(paths))}")
+    return ok
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Check that cached transformation outputs are never shared between different transforms."
+    )
+    default_directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "demo")
+    parser.add_argument("--directory", default=default_directory,
+                      help="Directory of sample images")
+
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_arguments()
+    images = sorted(get_image_files_in_directory(args.directory))
+    if not images:
+        print(f"Error: No images found in '{args.directory}'")
+        return 1
+    with open_image_file(images[0]) as img:
+        width, height = img.size
+
+    with tempfile.TemporaryDirectory() as cache_directory:
+        ok = run_check("closure cells", args.directory, cache_directory,
+                       [make_resize(64), make_resize(128)], [{(64, 64)}, {(128, 128)}])
+        ok = run_check("callable objects", args.directory, cache_directory,
+                       [Rotate(0), Rotate(90)], [{(width, height)}, {(height, width)}]) and ok
+        ok = run_overwrite_check(args.directory, cache_directory) and ok
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
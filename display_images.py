@@ -8,13 +8,12 @@ import os
 import sys
 import time
 import argparse
-from typing import Dict, Any, List
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
 
 # Import our image processor package
-from image_processor.api.processor import (
-    get_metadata_for_directory,
-    get_metadata_for_file
-)
+from image_processor.api.processor import get_metadata_for_file
+from image_processor.utils.file_ops import get_image_files_in_directory
 
 # ANSI color codes
 class Colors:
@@ -120,37 +119,138 @@ def display_metadata(metadata: Dict[str, Any], delay: float = 0):
         time.sleep(delay)
 
 
-def display_all_images(directory_path: str, delay: float = 2.0):
+def schedule_prefetch(
+    executor: ThreadPoolExecutor,
+    pending: Dict[int, Future],
+    image_files: List[str],
+    index: int,
+    depth: int
+) -> None:
+    """
+    Make sure metadata for the current image and the next `depth` images is being
+    extracted, and cancel work for images that fell out of that window.
+    
+    Args:
+        executor: Thread pool running the extractions
+        pending: Mapping of image index to its extraction future (updated in place)
+        image_files: List of image file paths
+        index: Index of the image about to be displayed
+        depth: Number of images to prefetch ahead of the current one (negative means 0)
+    """
+    # The current image is always in the window, whatever the depth
+    window = range(index, min(index + max(0, depth) + 1, len(image_files)))
+    
+    # Cancel extractions that are no longer needed after a seek
+    for stale_index in [i for i in pending if i not in window]:
+        pending.pop(stale_index).cancel()
+    
+    for i in window:
+        if i not in pending:
+            pending[i] = executor.submit(get_metadata_for_file, image_files[i])
+
+
+def read_navigation(index: int, count: int) -> Optional[int]:
+    """
+    Ask the user where to go next.
+    
+    Commands: Enter/n (next), p (previous), g N (go to image N),
+    s N (skip N images forward, negative to go back), q (quit).
+    
+    Args:
+        index: Index of the image currently displayed
+        count: Total number of images
+        
+    Returns:
+        Index of the next image to display, or None to stop
+    """
+    prompt = colorize("[Enter/n]ext [p]revious [g N] go to [s N] skip [q]uit: ", Colors.CYAN)
+    while True:
+        try:
+            command = input(prompt).strip().lower()
+        except EOFError:
+            return None
+        
+        parts = command.split()
+        action = parts[0] if parts else "n"
+        try:
+            if action == "n":
+                target = index + 1
+            elif action == "p":
+                target = index - 1
+            elif action == "g" and len(parts) == 2:
+                target = int(parts[1]) - 1
+            elif action == "s" and len(parts) == 2:
+                target = index + int(parts[1])
+            elif action == "q":
+                return None
+            else:
+                raise ValueError(command)
+        except ValueError:
+            print(colorize(f"Unknown command '{command}'", Colors.RED))
+            continue
+        
+        if target >= count:
+            return None
+        return max(0, target)
+
+
+def display_all_images(
+    directory_path: str,
+    delay: float = 2.0,
+    prefetch: int = 4,
+    interactive: bool = False
+):
     """
     Display metadata for all images in a directory with delay between each.
     
+    Only the file listing is done up front; metadata for the next `prefetch`
+    images is extracted in a background thread pool while the current one is shown.
+    
     Args:
         directory_path: Path to directory containing images
         delay: Time to wait between displaying images (in seconds)
+        prefetch: Number of images to extract ahead of the one being displayed
+        interactive: Whether to prompt for navigation instead of auto-advancing
     """
-    # Extract metadata for all images
-    all_metadata = get_metadata_for_directory(directory_path)
+    image_files = get_image_files_in_directory(directory_path)
     
     # If no images were found
-    if not all_metadata:
+    if not image_files:
         print(colorize(f"No images found in {directory_path}", Colors.RED))
         return
     
     # Display count
-    print(colorize(f"Found {len(all_metadata)} images in {directory_path}", Colors.GREEN))
+    count = len(image_files)
+    print(colorize(f"Found {count} images in {directory_path}", Colors.GREEN))
     print(colorize("Displaying information for each image...\n", Colors.GREEN))
     
-    # Display each one with delay
-    for i, metadata in enumerate(all_metadata):
-        # Clear screen for better visibility (not on first image)
-        if i > 0:
-            os.system('cls' if os.name == 'nt' else 'clear')
-        
-        # Display progress
-        print(colorize(f"Image {i+1} of {len(all_metadata)}", Colors.BOLD))
+    pending: Dict[int, Future] = {}
+    with ThreadPoolExecutor(max_workers=max(1, prefetch)) as executor:
+        index: Optional[int] = 0
+        first = True
+        while index is not None:
+            schedule_prefetch(executor, pending, image_files, index, prefetch)
+            metadata = pending[index].result()
+            
+            # Clear screen for better visibility (not on first image)
+            if not first and delay > 0:
+                os.system('cls' if os.name == 'nt' else 'clear')
+            first = False
+            
+            # Display progress
+            print(colorize(f"Image {index+1} of {count}", Colors.BOLD))
+            
+            # Display metadata with formatting
+            if interactive:
+                display_metadata(metadata)
+                index = read_navigation(index, count)
+            else:
+                display_metadata(metadata, delay)
+                index = index + 1 if index + 1 < count else None
         
-        # Display metadata with formatting
-        display_metadata(metadata, delay)
+        # Drop any prefetched work left when quitting early
+        for future in pending.values():
+            future.cancel()
 
 
 def parse_arguments():
@@ -163,6 +263,10 @@ def parse_arguments():
                       help="Delay between displaying images (in seconds)")
     parser.add_argument("--no-delay", action="store_true",
                       help="Display all images without delay or clearing screen")
+    parser.add_argument("--prefetch", "-p", type=int, default=4,
+                      help="Number of images to extract ahead in the background")
+    parser.add_argument("--interactive", "-i", action="store_true",
+                      help="Navigate images with keyboard commands instead of a timer")
     
     return parser.parse_args()
 
@@ -176,12 +280,16 @@ def main():
         print(colorize(f"Error: Path '{args.path}' does not exist.", Colors.RED))
         return 1
     
+    if args.prefetch < 0:
+        print(colorize(f"Error: --prefetch must be 0 or more, got {args.prefetch}.", Colors.RED))
+        return 1
+    
     # If delay is disabled
     delay = 0 if args.no_delay else args.delay
     
     # Process directory or single file
     if os.path.isdir(args.path):
-        display_all_images(args.path, delay)
+        display_all_images(args.path, delay, args.prefetch, args.interactive)
     else:
         # Single file
         metadata = get_metadata_for_file(args.path)
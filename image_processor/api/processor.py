@@ -6,19 +6,38 @@ and image data from files or directories. It composes the core functionality int
 higher-level operations that can be easily used by external systems.
 """
 
-from typing import Dict, List, Any, Optional, Tuple, Callable
+from typing import Dict, List, Any, Optional, Callable, BinaryIO, Collection, Iterable, Iterator, TextIO, TYPE_CHECKING
 import os
-import base64
-from io import BytesIO
-from PIL import Image
 
-from ..core.metadata_extractor import extract_full_metadata
+from ..core.image_loader import open_image_file
+from ..core.metadata_extractor import (
+    archive_entry_to_file_metadata,
+    extract_full_metadata,
+    extract_metadata_from_stream,
+    extract_png_text_metadata,
+    iter_archive_metadata,
+    iter_archive_png_text_metadata
+)
 from ..utils.file_ops import (
     get_image_files_in_directory,
+    is_archive_path,
+    image_name,
+    iter_entry_files,
+    open_source_file,
+    output_path_in,
+    scan_image_entries,
+    write_file_atomically,
     process_files_with_function,
     save_json,
     load_json
 )
+from ..utils.base64_stream import encode_base64_string, write_base64_stream
+
+# Everything beyond metadata extraction and base64 is imported inside the
+# functions that use it, so each CLI command only loads what it needs.
+
+if TYPE_CHECKING:
+    from PIL import Image
 
 
 def get_metadata_for_directory(directory_path: str) -> List[Dict[str, Any]]:
@@ -26,15 +45,124 @@ def get_metadata_for_directory(directory_path: str) -> List[Dict[str, Any]]:
     Get metadata for all images in a directory.
     
     Args:
-        directory_path: Path to the directory
+        directory_path: Path to the directory or zip/tar archive
         
     Returns:
         List of metadata dictionaries
     """
+    if is_archive_path(directory_path):
+        return list(iter_archive_metadata(directory_path))
+    
     image_files = get_image_files_in_directory(directory_path)
     return process_files_with_function(image_files, extract_full_metadata)
 
 
+def iter_metadata_for_directory(
+    directory_path: str,
+    workers: int = 1,
+    prefetch_depth: int = 0,
+    max_inflight_bytes: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream metadata for all images in a directory without building the full list.
+    
+    With prefetch_depth > 0, a read-ahead stage stats files and reads their
+    headers on an I/O thread pool ahead of extraction, which keeps extraction
+    busy on high-latency storage (cold disks, NFS).
+    
+    Archives are read in one sequential pass instead.
+    
+    Args:
+        directory_path: Path to the directory or zip/tar archive
+        workers: Number of threads extracting metadata concurrently
+        prefetch_depth: Number of files to prefetch ahead (0 disables read-ahead)
+        max_inflight_bytes: Read-ahead byte budget for files not yet extracted
+            (default: DEFAULT_INFLIGHT_BYTES)
+        
+    Returns:
+        Iterator of metadata dictionaries, in directory listing order
+    """
+    if is_archive_path(directory_path):
+        yield from iter_archive_metadata(directory_path)
+        return
+    
+    image_files: Iterable[str] = get_image_files_in_directory(directory_path)
+    if prefetch_depth > 0:
+        from ..utils.prefetch import DEFAULT_INFLIGHT_BYTES, iter_prefetched
+        if max_inflight_bytes is None:
+            max_inflight_bytes = DEFAULT_INFLIGHT_BYTES
+        image_files = (
+            path for path, _ in iter_prefetched(
+                image_files, prefetch_depth, max_inflight_bytes, workers=max(4, workers)
+            )
+        )
+    
+    if workers <= 1:
+        for image_path in image_files:
+            yield extract_full_metadata(image_path)
+        return
+    
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
+    
+    # Keep a bounded window of extractions in flight
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        in_flight: deque = deque()
+        for image_path in image_files:
+            in_flight.append(executor.submit(extract_full_metadata, image_path))
+            if len(in_flight) >= workers * 2:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def iter_png_text_for_directory(
+    directory_path: str,
+    keywords: Optional[Collection[str]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the text chunks (prompts, parameters, ...) of every PNG in a directory.
+    
+    Pixels are never decoded and image data is skipped, so each file costs only
+    a few KB of reads. Archives are read in one sequential pass instead.
+    
+    Args:
+        directory_path: Path to the directory or zip/tar archive
+        keywords: Text keywords to keep (default: all)
+        
+    Returns:
+        Iterator of dictionaries with file metadata, dimensions and text_chunks
+    """
+    if is_archive_path(directory_path):
+        yield from iter_archive_png_text_metadata(directory_path, keywords)
+        return
+    
+    for image_path in get_image_files_in_directory(directory_path):
+        if image_path.lower().endswith(".png"):
+            yield extract_png_text_metadata(image_path, keywords)
+
+
+def export_png_text_to_ndjson(
+    directory_path: str,
+    output: TextIO,
+    keywords: Optional[Collection[str]] = None
+) -> int:
+    """
+    Write the text chunks of every PNG in a directory as NDJSON.
+    
+    Args:
+        directory_path: Path to the directory or zip/tar archive
+        output: Writable text file object
+        keywords: Text keywords to keep (default: all)
+        
+    Returns:
+        Number of records written
+    """
+    from ..utils.json_stream import write_ndjson
+    
+    return write_ndjson(iter_png_text_for_directory(directory_path, keywords), output)
+
+
 def get_metadata_for_file(file_path: str) -> Dict[str, Any]:
     """
     Get metadata for a single image file.
@@ -48,24 +176,83 @@ def get_metadata_for_file(file_path: str) -> Dict[str, Any]:
     return extract_full_metadata(file_path)
 
 
-def encode_image_to_base64(image_path: str) -> Optional[str]:
+def encode_image_to_base64(image_path: str, as_data_uri: bool = False) -> Optional[str]:
     """
     Encode an image to base64 for embedding or transmission.
     
+    The file is read in chunks, so its raw bytes are never held whole.
+    
     Args:
         image_path: Path to the image file
+        as_data_uri: Whether to prefix the result with a data: URI header
         
     Returns:
         Base64-encoded image data or None if error
     """
     try:
-        with open(image_path, "rb") as image_file:
-            encoded_string = base64.b64encode(image_file.read()).decode("utf-8")
-            return encoded_string
+        with open_source_file(image_path) as image_file:
+            return encode_base64_string(image_file, as_data_uri)
     except Exception:
         return None
 
 
+def stream_image_to_base64(image_path: str, output: BinaryIO, as_data_uri: bool = False) -> bool:
+    """
+    Stream an image as base64 into a binary file object without loading it whole.
+    
+    Args:
+        image_path: Path to the image file
+        output: Writable binary file object (e.g. an open file or sys.stdout.buffer)
+        as_data_uri: Whether to prefix the output with a data: URI header
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        with open_source_file(image_path) as image_file:
+            write_base64_stream(image_file, output, data_uri=as_data_uri)
+        return True
+    except Exception:
+        return False
+
+
+def export_images_to_base64_files(
+    image_paths: List[str],
+    output_directory: str,
+    as_data_uri: bool = False,
+    extension: str = ".b64"
+) -> List[str]:
+    """
+    Stream many images to individual base64 files.
+    
+    Args:
+        image_paths: List of image file paths
+        output_directory: Directory where to write the encoded files
+        as_data_uri: Whether to prefix each output with a data: URI header
+        extension: Extension appended to each image filename
+        
+    Returns:
+        List of paths to the written files
+    """
+    os.makedirs(output_directory, exist_ok=True)
+    result_paths = []
+    
+    for image_path in image_paths:
+        output_path = output_path_in(output_directory, image_name(image_path) + extension)
+        try:
+            with open(output_path, "wb") as output_file:
+                success = stream_image_to_base64(image_path, output_file, as_data_uri)
+        except OSError:
+            success = False
+        if success:
+            result_paths.append(output_path)
+        elif os.path.exists(output_path):
+            # Don't leave truncated output behind
+            os.remove(output_path)
+    
+    return result_paths
+
+
 def get_image_with_metadata(image_path: str) -> Dict[str, Any]:
     """
     Get both image data (as base64) and metadata for an image.
@@ -85,57 +272,336 @@ def get_image_with_metadata(image_path: str) -> Dict[str, Any]:
     return result
 
 
-def get_image_gallery(directory_path: str, include_image_data: bool = False) -> Dict[str, Any]:
+def get_image_gallery(
+    directory_path: str,
+    include_image_data: bool = False,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    sort_by: str = "name",
+    descending: bool = False,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
     """
-    Get metadata and optionally image data for all images in a directory.
+    Get metadata and optionally image data for one page of images in a directory.
+    
+    Files are discovered and sorted from a cheap stat pass; only the requested
+    page is opened for metadata extraction.
     
     Args:
         directory_path: Path to the directory
         include_image_data: Whether to include base64-encoded image data
+        offset: Number of images to skip
+        limit: Maximum number of images in the page (None for all)
+        sort_by: Sort key: "name", "mtime" or "size"
+        descending: Whether to sort in descending order
+        cursor: Cursor token from a previous page (overrides sort and offset)
         
     Returns:
-        Dictionary with gallery info and image items
+        Dictionary with gallery info, paging info and image items
+        
+    Raises:
+        ValueError: If the sort key or cursor is invalid
     """
-    image_files = get_image_files_in_directory(directory_path)
+    from ..utils.pagination import paginate_entries
+    
+    page = paginate_entries(
+        scan_image_entries(directory_path), sort_by, descending, offset, limit, cursor
+    )
+    image_files = [entry["path"] for entry in page["entries"]]
     
-    # Process function depends on whether we want image data included
-    if include_image_data:
-        process_fn = get_image_with_metadata
+    if is_archive_path(directory_path):
+        # Read the page's members in one pass over the archive, then restore page order
+        items_by_path = {}
+        for entry, fp in iter_entry_files(page["entries"]):
+            # Closing the decoded image closes the stream, so take the image data first
+            image_data = None
+            if include_image_data:
+                try:
+                    image_data = encode_base64_string(fp)
+                except Exception:
+                    pass
+                fp.seek(0)
+            item = extract_metadata_from_stream(fp, archive_entry_to_file_metadata(entry))
+            if include_image_data:
+                item["image_data"] = image_data
+            items_by_path[entry["path"]] = item
+        items = [items_by_path[path] for path in image_files if path in items_by_path]
     else:
-        process_fn = extract_full_metadata
+        # Process function depends on whether we want image data included
+        if include_image_data:
+            process_fn = get_image_with_metadata
+        else:
+            process_fn = extract_full_metadata
         
-    # Process all files
-    items = process_files_with_function(image_files, process_fn)
+        # Process only the files on this page
+        items = process_files_with_function(image_files, process_fn)
     
     # Create gallery info
     gallery = {
         "gallery_name": os.path.basename(os.path.abspath(directory_path)),
         "image_count": len(items),
+        "total_count": page["total_count"],
+        "offset": page["offset"],
+        "sort_by": page["sort_by"],
+        "descending": page["descending"],
+        "next_cursor": page["next_cursor"],
         "items": items
     }
     
     return gallery
 
 
+def create_sprite_atlas(
+    directory_path: str,
+    output_directory: str,
+    name: str = "atlas",
+    thumb_size: int = 128,
+    sheet_size: int = 2048,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    sort_by: str = "name",
+    descending: bool = False,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Pack thumbnails of a directory (or of one gallery page) into sprite sheets.
+    
+    Paging arguments select the same images as get_image_gallery. Rebuilding into
+    the same output directory and name only redoes the work for changed images.
+    
+    Args:
+        directory_path: Path to the directory with images
+        output_directory: Directory for the sheet images and `<name>.json` atlas
+        name: Base name of the sheet files and atlas JSON
+        thumb_size: Maximum thumbnail width and height
+        sheet_size: Maximum sheet width and height
+        offset: Number of images to skip
+        limit: Maximum number of images to pack (None for all)
+        sort_by: Sort key: "name", "mtime" or "size"
+        descending: Whether to sort in descending order
+        cursor: Cursor token from a gallery page (overrides sort and offset)
+        
+    Returns:
+        Atlas dictionary mapping each uuid/filename to its sheet and rectangle
+        
+    Raises:
+        ValueError: If the sort key or cursor is invalid
+    """
+    from ..core.sprite_atlas import build_sprite_atlas
+    from ..utils.pagination import paginate_entries
+    
+    page = paginate_entries(
+        scan_image_entries(directory_path), sort_by, descending, offset, limit, cursor
+    )
+    return build_sprite_atlas(page["entries"], output_directory, name, thumb_size, sheet_size)
+
+
 def process_images_with_transformation(
     directory_path: str,
-    transform_fn: Callable[[Image.Image], Image.Image],
+    transform_fn: Callable[["Image.Image"], "Image.Image"],
     output_directory: Optional[str] = None,
-    suffix: str = "_transformed"
+    suffix: str = "_transformed",
+    cache_directory: Optional[str] = None,
+    transform_version: Optional[str] = None,
+    save_options: Optional[Dict[str, Any]] = None,
+    cache_max_bytes: Optional[int] = None
 ) -> List[str]:
     """
     Apply a transformation function to all images in a directory.
     
+    With a cache directory, outputs are memoized by input content, transform
+    identity and encoder settings: unchanged images are linked from the store
+    instead of being decoded, transformed and encoded again.
+    
     Args:
         directory_path: Path to the directory with images
         transform_fn: Function to apply to each image
         output_directory: Directory to save transformed images (default: same as input)
         suffix: Suffix to add to transformed filenames
+        cache_directory: Directory of the content-addressed output store (default: no caching)
+        transform_version: Version of the transform, bumped to invalidate its cached outputs
+        save_options: Keyword arguments passed to Image.save
+        cache_max_bytes: Size cap of the output store (default: DEFAULT_CACHE_MAX_BYTES)
         
     Returns:
         List of paths to transformed images
+        
+    Raises:
+        ValueError: If caching is requested for a transform whose state cannot be
+            hashed stably and no transform_version is given
     """
+    from ..core.transform_cache import (
+        DEFAULT_CACHE_MAX_BYTES,
+        cached_transform,
+        close_transform_cache,
+        encoder_settings,
+        get_input_hash,
+        make_cache_key,
+        open_transform_cache,
+        remembered_input_hash,
+        restore_cached,
+        transform_identity
+    )
+    
+    image_entries = scan_image_entries(directory_path)
+    save_options = save_options or {}
+    if cache_max_bytes is None:
+        cache_max_bytes = DEFAULT_CACHE_MAX_BYTES
+    
+    # Set output directory
+    if not output_directory:
+        output_directory = directory_path
+    
+    # Create output directory if it doesn't exist
+    os.makedirs(output_directory, exist_ok=True)
+    
+    cache = open_transform_cache(cache_directory, cache_max_bytes) if cache_directory else None
+    identity = transform_identity(transform_fn, transform_version) if cache else None
+    
+    def output_path_for(image_path: str) -> str:
+        name, ext = os.path.splitext(image_name(image_path))
+        return output_path_in(output_directory, f"{name}{suffix}{ext}")
+    
+    def cache_key(image_path: str, input_hash: str) -> str:
+        ext = os.path.splitext(image_path)[1]
+        return make_cache_key(input_hash, identity, encoder_settings(ext, save_options))
+    
+    written: Dict[str, str] = {}
+    pending = image_entries
+    if cache is not None:
+        # Outputs of unchanged inputs are linked from the store without opening the inputs
+        pending = []
+        for entry in image_entries:
+            image_path = entry["path"]
+            input_hash = remembered_input_hash(cache, image_path, entry["size_bytes"], entry["mtime"])
+            try:
+                if input_hash is not None and restore_cached(
+                    cache, cache_key(image_path, input_hash), output_path_for(image_path)
+                ):
+                    written[image_path] = output_path_for(image_path)
+                    continue
+            except OSError:
+                # The stored copy could not be restored: compute the output instead
+                pass
+            pending.append(entry)
+    
+    # Archive members are read in one pass over the archive
+    for entry, fp in iter_entry_files(pending):
+        image_path = entry["path"]
+        output_path = output_path_for(image_path)
+        
+        def produce(path: str) -> None:
+            fp.seek(0)
+            with open_image_file(fp, filename=entry["name"]) as img:
+                transform_fn(img).save(path, **save_options)
+        
+        try:
+            if cache is None:
+                # Replace rather than rewrite, so outputs linked from the store stay intact
+                write_file_atomically(output_path, produce)
+            else:
+                input_hash = get_input_hash(cache, image_path, entry["size_bytes"], entry["mtime"], fp)
+                cached_transform(cache, cache_key(image_path, input_hash), output_path, produce)
+            written[image_path] = output_path
+        except Exception:
+            # Skip files with errors
+            continue
+    
+    if cache is not None:
+        close_transform_cache(cache)
+    
+    return [written[entry["path"]] for entry in image_entries if entry["path"] in written]
+
+
+def process_images_with_batch_transformation(
+    directory_path: str,
+    batch_fn: Callable[[Any], Any],
+    output_directory: Optional[str] = None,
+    suffix: str = "_transformed",
+    max_batch_bytes: Optional[int] = None,
+    workers: int = 4,
+    save_options: Optional[Dict[str, Any]] = None
+) -> List[str]:
+    """
+    Apply a vectorized NumPy transformation to same-shaped images in batches.
+    
+    Images are grouped by size and mode and stacked into float32 arrays of shape
+    (batch, height, width, channels) with values 0-255, so pixel operations such
+    as those in core.batch_transform run once per batch instead of once per image.
+    Requires NumPy. Images are read by random access, which compressed tar
+    archives do not provide.
+    
+    Args:
+        directory_path: Path to the directory with images, zip or uncompressed tar
+        batch_fn: Function from a stacked batch array to the transformed batch array
+        output_directory: Directory to save transformed images (default: same as input)
+        suffix: Suffix to add to transformed filenames
+        max_batch_bytes: Maximum bytes of one stacked batch (default: DEFAULT_BATCH_BYTES)
+        workers: Number of decode and encode threads
+        save_options: Keyword arguments passed to Image.save
+        
+    Returns:
+        List of paths to transformed images
+        
+    Raises:
+        ValueError: If the directory is a compressed tar archive
+    """
+    from ..core.batch_transform import DEFAULT_BATCH_BYTES, iter_batch_transform, plan_batches
+    
+    if is_archive_path(directory_path):
+        from ..utils.archive_ops import supports_random_access
+        if not supports_random_access(directory_path):
+            raise ValueError("Batched transforms need random access to images; use a zip or uncompressed tar archive")
+    
     image_files = get_image_files_in_directory(directory_path)
+    
+    # Set output directory
+    if not output_directory:
+        output_directory = directory_path
+    
+    # Create output directory if it doesn't exist
+    os.makedirs(output_directory, exist_ok=True)
+    
+    def output_path_for(image_path: str) -> str:
+        name, ext = os.path.splitext(image_name(image_path))
+        return output_path_in(output_directory, f"{name}{suffix}{ext}")
+    
+    if max_batch_bytes is None:
+        max_batch_bytes = DEFAULT_BATCH_BYTES
+    batches = plan_batches(image_files, max_batch_bytes, workers)
+    results = iter_batch_transform(batches, batch_fn, output_path_for, workers, save_options)
+    return [path for path in results if path is not None]
+
+
+def process_images_with_tiled_transformation(
+    directory_path: str,
+    transform_fn: Callable[["Image.Image"], "Image.Image"],
+    output_directory: Optional[str] = None,
+    suffix: str = "_transformed",
+    memory_budget: Optional[int] = None
+) -> List[str]:
+    """
+    Apply a tile-local transformation to very large images in memory-bounded strips.
+    
+    Each image is decoded, transformed and written one horizontal strip at a time,
+    so peak memory follows `memory_budget` instead of the image size. Outputs are
+    always written as PNG.
+    
+    Args:
+        directory_path: Path to the directory with images
+        transform_fn: Tile-local function applied to each strip (must keep its size)
+        output_directory: Directory to save transformed images (default: same as input)
+        suffix: Suffix to add to transformed filenames
+        memory_budget: Maximum bytes to spend on strip buffers per image (default: DEFAULT_MEMORY_BUDGET)
+        
+    Returns:
+        List of paths to transformed images
+    """
+    from ..core.tiled_processing import DEFAULT_MEMORY_BUDGET, process_image_in_strips
+    
+    if memory_budget is None:
+        memory_budget = DEFAULT_MEMORY_BUDGET
+    image_entries = scan_image_entries(directory_path)
     result_paths = []
     
     # Set output directory
@@ -145,22 +611,69 @@ def process_images_with_transformation(
     # Create output directory if it doesn't exist
     os.makedirs(output_directory, exist_ok=True)
     
-    for image_path in image_files:
+    # Archive members are read in one pass over the archive
+    for entry, fp in iter_entry_files(image_entries):
+        name = os.path.splitext(entry["name"])[0]
+        output_path = output_path_in(output_directory, f"{name}{suffix}.png")
         try:
-            # Open the image
-            with Image.open(image_path) as img:
-                # Apply transformation
-                transformed_img = transform_fn(img)
-                
-                # Create output filename
-                filename = os.path.basename(image_path)
-                name, ext = os.path.splitext(filename)
-                output_filename = f"{name}{suffix}{ext}"
-                output_path = os.path.join(output_directory, output_filename)
-                
-                # Save transformed image
-                transformed_img.save(output_path)
+            if process_image_in_strips(fp, output_path, transform_fn, memory_budget, entry["name"]):
                 result_paths.append(output_path)
+        except Exception:
+            # Skip files with errors, without leaving partial output behind
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            continue
+    
+    return result_paths
+
+
+def process_images_with_transform_graph(
+    directory_path: str,
+    graph: Dict[str, Dict[str, Any]],
+    output_directory: Optional[str] = None
+) -> Dict[str, List[str]]:
+    """
+    Produce several derivatives of every image in a directory from a single decode.
+    
+    Args:
+        directory_path: Path to the directory with images
+        graph: Transform graph (node name -> node from make_transform_node)
+        output_directory: Directory to save derivatives (default: same as input)
+        
+    Returns:
+        Dictionary mapping each output node name to the list of paths it produced
+        
+    Raises:
+        ValueError: If the graph is invalid, e.g. two nodes write the same output
+    """
+    from ..core.transform_graph import iter_transform_graph, resolve_transform_order
+    
+    order = resolve_transform_order(graph)
+    image_entries = scan_image_entries(directory_path)
+    result_paths: Dict[str, List[str]] = {
+        name: [] for name in order if graph[name]["suffix"] is not None
+    }
+    
+    # Set output directory
+    if not output_directory:
+        output_directory = directory_path
+    
+    # Create output directory if it doesn't exist
+    os.makedirs(output_directory, exist_ok=True)
+    
+    # Archive members are read in one pass over the archive
+    for entry, fp in iter_entry_files(image_entries):
+        name, ext = os.path.splitext(entry["name"])
+        try:
+            with open_image_file(fp, filename=entry["name"]) as img:
+                # Decode once; every node reuses the loaded pixels
+                img.load()
+                for node_name, derived_img in iter_transform_graph(img, graph, order):
+                    node = graph[node_name]
+                    output_filename = f"{name}{node['suffix']}{node['extension'] or ext}"
+                    output_path = output_path_in(output_directory, output_filename)
+                    derived_img.save(output_path, **node["save_options"])
+                    result_paths[node_name].append(output_path)
         except Exception:
             # Skip files with errors
             continue
@@ -168,21 +681,103 @@ def process_images_with_transformation(
     return result_paths
 
 
-def export_metadata_to_json(directory_path: str, output_path: str) -> bool:
+def export_metadata_to_json(directory_path: str, output_path: str, index: bool = False) -> bool:
     """
     Extract metadata from all images in a directory and save to JSON file.
     
     Args:
         directory_path: Path to the directory with images
         output_path: Path where to save the JSON file
+        index: Whether to stream the records out and write a sidecar offset index
         
     Returns:
         True if successful, False otherwise
     """
+    if index:
+        from ..utils.catalog_index import write_indexed_json_list
+        try:
+            write_indexed_json_list(iter_metadata_for_directory(directory_path), output_path)
+            return True
+        except Exception:
+            return False
+    
     metadata_list = get_metadata_for_directory(directory_path)
     return save_json(metadata_list, output_path)
 
 
+def export_metadata_to_ndjson(directory_path: str, output_path: str, index: bool = False) -> bool:
+    """
+    Stream metadata for all images in a directory to an NDJSON file.
+    
+    Args:
+        directory_path: Path to the directory with images
+        output_path: Path where to save the NDJSON file
+        index: Whether to also write a sidecar offset index
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        records = iter_metadata_for_directory(directory_path)
+        if index:
+            from ..utils.catalog_index import write_indexed_ndjson
+            write_indexed_ndjson(records, output_path)
+        else:
+            from ..utils.json_stream import write_ndjson
+            with open(output_path, "w") as f:
+                write_ndjson(records, f)
+        return True
+    except Exception:
+        return False
+
+
+def index_metadata_export(export_path: str) -> Optional[int]:
+    """
+    Build the sidecar offset index of an existing NDJSON or JSON list export.
+    
+    Args:
+        export_path: Path to the export file
+        
+    Returns:
+        Number of records indexed, or None if the export could not be read
+    """
+    from ..utils.catalog_index import build_catalog_index
+    
+    try:
+        return build_catalog_index(export_path)
+    except (OSError, ValueError):
+        return None
+
+
+def lookup_metadata_records(
+    export_path: str,
+    values: Iterable[str],
+    field: str = "uuid",
+    build_index: bool = True
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Fetch records from a large export by uuid, path or filename without parsing all of it.
+    
+    Args:
+        export_path: Path to the export file (JSON list or NDJSON)
+        values: Values to look up
+        field: Record field to match ("uuid", "path" or "filename")
+        build_index: Whether to build the sidecar index if it is missing or stale
+        
+    Returns:
+        Dictionary mapping each value to its matching records (empty list if none)
+        
+    Raises:
+        ValueError: If the field is not indexed, or there is no current index and
+            build_index is False
+    """
+    from ..utils.catalog_index import build_catalog_index, is_index_current, lookup_records
+    
+    if build_index and not is_index_current(export_path):
+        build_catalog_index(export_path)
+    return lookup_records(export_path, field, values)
+
+
 def load_metadata_from_json(json_path: str) -> Optional[List[Dict[str, Any]]]:
     """
     Load previously exported image metadata from JSON.
@@ -193,4 +788,127 @@ def load_metadata_from_json(json_path: str) -> Optional[List[Dict[str, Any]]]:
     Returns:
         List of metadata dictionaries or None if error
     """
-    return load_json(json_path)
\ No newline at end of file
+    return load_json(json_path)
+
+
+def diff_metadata_exports(
+    old_path: str,
+    new_path: str,
+    key: str = "path",
+    include_unchanged: bool = False
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the differences between two metadata exports.
+    
+    Args:
+        old_path: Path to the older export (JSON list or NDJSON)
+        new_path: Path to the newer export (JSON list or NDJSON)
+        key: Record field to join on ("path" or "uuid")
+        include_unchanged: Whether to also emit "unchanged" records
+        
+    Returns:
+        Iterator of change records ("added", "removed", "resized", "reencoded", "modified",
+        or "unkeyed" for records without the key field)
+    """
+    from ..core.catalog_diff import diff_records
+    
+    return diff_records(old_path, new_path, key, include_unchanged)
+
+
+def export_metadata_diff(
+    old_path: str,
+    new_path: str,
+    output: TextIO,
+    key: str = "path",
+    include_unchanged: bool = False
+) -> Dict[str, int]:
+    """
+    Write the differences between two metadata exports as NDJSON.
+    
+    Args:
+        old_path: Path to the older export (JSON list or NDJSON)
+        new_path: Path to the newer export (JSON list or NDJSON)
+        output: Writable text file object
+        key: Record field to join on ("path" or "uuid")
+        include_unchanged: Whether to also emit "unchanged" records
+        
+    Returns:
+        Dictionary mapping change type to number of records written
+    """
+    from ..core.catalog_diff import diff_records
+    from ..utils.json_stream import write_ndjson
+    
+    summary: Dict[str, int] = {}
+    
+    def counted(changes: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        for change in changes:
+            summary[change["change"]] = summary.get(change["change"], 0) + 1
+            yield change
+    
+    write_ndjson(counted(diff_records(old_path, new_path, key, include_unchanged)), output)
+    return summary
+
+
+def compute_directory_stats(
+    directory_path: str,
+    workers: int = 1,
+    top_k: int = 10,
+    prefetch_depth: int = 0
+) -> Dict[str, Any]:
+    """
+    Compute mergeable aggregate statistics for a directory in one streaming pass.
+    
+    Args:
+        directory_path: Path to the directory with images
+        workers: Number of threads extracting metadata concurrently
+        top_k: Number of largest and oldest files to keep
+        prefetch_depth: Number of files to prefetch ahead (0 disables read-ahead)
+        
+    Returns:
+        Aggregate state (JSON-serializable; combine shards with combine_directory_stats)
+    """
+    from ..core.statistics import aggregate_metadata
+    
+    records = iter_metadata_for_directory(directory_path, workers, prefetch_depth)
+    return aggregate_metadata(records, top_k)
+
+
+def combine_directory_stats(partial_stats: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Combine aggregate states computed by separate workers or shards.
+    
+    Args:
+        partial_stats: List of aggregate states
+        
+    Returns:
+        Combined aggregate state, or None if the list is empty
+        
+    Raises:
+        ValueError: If a state is malformed, or the states have incompatible
+            versions or top_k settings
+    """
+    from ..core.statistics import merge_stats, validate_stats
+    
+    if not partial_stats:
+        return None
+    
+    combined = partial_stats[0]
+    validate_stats(combined)
+    for stats in partial_stats[1:]:
+        combined = merge_stats(combined, stats)
+    return combined
+
+
+def get_stats_report(stats: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build a readable report (quantiles, histograms, top files) from aggregate state.
+    
+    Args:
+        stats: Aggregate state from compute_directory_stats or combine_directory_stats
+        
+    Returns:
+        Report dictionary
+    """
+    from ..core.statistics import summarize_stats
+    
+    return summarize_stats(stats)
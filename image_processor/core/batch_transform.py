@@ -0,0 +1,434 @@
+"""
+Batched NumPy transformation module for uniform image sets.
+
+Images are grouped by (size, mode), stacked into float32 arrays of shape
+(batch, height, width, channels) in batches bounded by a byte budget, and passed
+through vectorized operations in one call per batch. Decoding the next batch and
+encoding the previous one run on worker threads while the current batch is
+transformed. NumPy is imported on first use, like PIL.
+
+Batch operations are plain functions from array to array with values in the
+0-255 range. They own the batch they are given and may update it in place, as
+the factories below do to avoid full-size temporaries; compose_batch_ops chains
+them.
+"""
+
+import importlib
+import os
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+from .image_loader import get_image_module, open_image_file
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+BatchOp = Callable[[Any], Any]
+
+DEFAULT_BATCH_BYTES = 256 * 1024 * 1024
+
+# Modes stacked as-is; other modes are converted to RGB (or RGBA) on decode
+BATCH_MODES = {"L": 1, "LA": 2, "RGB": 3, "RGBA": 4}
+CHANNEL_MODES = {channels: mode for mode, channels in BATCH_MODES.items()}
+
+# ITU-R 601-2 luma weights, as used by PIL's convert("L")
+LUMA_WEIGHTS = (0.299, 0.587, 0.114)
+
+
+def get_numpy() -> Any:
+    """
+    Import and return NumPy on first use.
+
+    Returns:
+        The numpy module
+    """
+    return importlib.import_module("numpy")
+
+
+def batch_mode(mode: str, info: Dict[str, Any]) -> str:
+    """
+    Get the mode an image is stacked in.
+
+    Args:
+        mode: PIL mode of the image
+        info: PIL info dictionary of the image
+
+    Returns:
+        One of the BATCH_MODES
+    """
+    if mode in BATCH_MODES:
+        return mode
+    return "RGBA" if mode in ("PA", "RGBa", "La") or "transparency" in info else "RGB"
+
+
+def _color_channels(batch: Any) -> Any:
+    """Get a view of a batch's color channels, leaving out alpha."""
+    return batch[..., :-1] if batch.shape[-1] in (2, 4) else batch
+
+
+def _with_color(batch: Any, color: Any) -> Any:
+    """Replace a batch's color channels (possibly changing their count), keeping alpha."""
+    if batch.shape[-1] not in (2, 4):
+        return color
+    return get_numpy().concatenate([color, batch[..., -1:]], axis=-1)
+
+
+def _reduce_pixels(batch: Any, reduction: str) -> Any:
+    """
+    Reduce each image's color channels over all pixels, keeping dimensions for broadcasting.
+
+    Rows are reduced first, and over all channels before dropping alpha: that
+    combines whole contiguous rows elementwise, which is far faster than
+    reducing both spatial axes at once with the short channel axis innermost.
+    """
+    reduced = getattr(batch, reduction)(axis=1, keepdims=True)
+    return _color_channels(getattr(reduced, reduction)(axis=2, keepdims=True))
+
+
+def _luma(color: Any) -> Any:
+    """Compute the luma of each pixel, keeping a channel axis of size one."""
+    if color.shape[-1] == 1:
+        return color
+    np = get_numpy()
+    return (color @ np.asarray(LUMA_WEIGHTS, dtype=color.dtype))[..., np.newaxis]
+
+
+def _affine(batch: Any, scale: Any, offset: Any) -> Any:
+    """
+    Apply color = color * scale + offset in place, per image and channel, leaving alpha.
+
+    Scale and offset broadcast to (batch, 1, 1, color channels). They are expanded
+    to one full contiguous row per image so NumPy's inner loop runs over whole
+    rows instead of the short channel axis.
+    """
+    np = get_numpy()
+    count, _, width, channels = batch.shape
+    colors = channels - 1 if channels in (2, 4) else channels
+
+    def row(values: Any, alpha_value: float) -> Any:
+        values = np.broadcast_to(np.asarray(values, dtype=batch.dtype), (count, 1, 1, colors))
+        if colors != channels:
+            alpha = np.full((count, 1, 1, 1), alpha_value, dtype=batch.dtype)
+            values = np.concatenate([values, alpha], axis=-1)
+        return np.ascontiguousarray(np.broadcast_to(values, (count, 1, width, channels)))
+
+    batch *= row(scale, 1.0)
+    batch += row(offset, 0.0)
+    return batch
+
+
+def normalize(low: float = 0.0, high: float = 255.0) -> BatchOp:
+    """
+    Stretch each image's color channels to the range [low, high] independently.
+
+    Args:
+        low: Output value of each channel's minimum
+        high: Output value of each channel's maximum
+
+    Returns:
+        Batch operation
+    """
+    def apply(batch: Any) -> Any:
+        np = get_numpy()
+        minimum = _reduce_pixels(batch, "min")
+        span = _reduce_pixels(batch, "max") - minimum
+        scale = np.where(span > 0, (high - low) / np.maximum(span, 1e-6), 0)
+        return _affine(batch, scale, low - minimum * scale)
+    return apply
+
+
+def brightness(factor: float) -> BatchOp:
+    """
+    Scale brightness like PIL's ImageEnhance.Brightness (0 gives black).
+
+    Args:
+        factor: Brightness factor (1.0 leaves images unchanged)
+
+    Returns:
+        Batch operation
+    """
+    def apply(batch: Any) -> Any:
+        return _affine(batch, factor, 0.0)
+    return apply
+
+
+def contrast(factor: float) -> BatchOp:
+    """
+    Scale contrast like PIL's ImageEnhance.Contrast, around each image's mean luma.
+
+    Args:
+        factor: Contrast factor (1.0 leaves images unchanged, 0 gives flat gray)
+
+    Returns:
+        Batch operation
+    """
+    def apply(batch: Any) -> Any:
+        # The mean luma is the luma of the channel means
+        mean = _luma(_reduce_pixels(batch, "mean"))
+        return _affine(batch, factor, mean * (1 - factor))
+    return apply
+
+
+def grayscale() -> BatchOp:
+    """
+    Convert color channels to a single luma channel, keeping alpha.
+
+    Returns:
+        Batch operation
+    """
+    def apply(batch: Any) -> Any:
+        return _with_color(batch, _luma(_color_channels(batch)))
+    return apply
+
+
+def invert() -> BatchOp:
+    """
+    Invert color channels, keeping alpha.
+
+    Returns:
+        Batch operation
+    """
+    def apply(batch: Any) -> Any:
+        return _affine(batch, -1.0, 255.0)
+    return apply
+
+
+def channel_mix(matrix: Sequence[Sequence[float]]) -> BatchOp:
+    """
+    Mix color channels with a matrix: output channel j = sum of matrix[j][i] * input channel i.
+
+    Args:
+        matrix: One row of input-channel weights per output channel
+
+    Returns:
+        Batch operation
+
+    Raises:
+        ValueError: If the matrix does not produce 1 or 3 color channels
+    """
+    if len(matrix) not in (1, 3):
+        raise ValueError("Channel matrix must have 1 or 3 rows")
+
+    def apply(batch: Any) -> Any:
+        color = _color_channels(batch)
+        weights = get_numpy().asarray(matrix, dtype=color.dtype)
+        if weights.shape[1] != color.shape[-1]:
+            raise ValueError(f"Channel matrix expects {weights.shape[1]} channels, got {color.shape[-1]}")
+        return _with_color(batch, color @ weights.T)
+    return apply
+
+
+def crop(box: Tuple[int, int, int, int]) -> BatchOp:
+    """
+    Crop every image in the batch to the same box.
+
+    Args:
+        box: (left, upper, right, lower) pixel box, as in PIL's Image.crop
+
+    Returns:
+        Batch operation
+    """
+    left, upper, right, lower = box
+
+    def apply(batch: Any) -> Any:
+        return batch[:, upper:lower, left:right, :]
+    return apply
+
+
+def compose_batch_ops(*ops: BatchOp) -> BatchOp:
+    """
+    Chain batch operations left to right.
+
+    Args:
+        ops: Batch operations
+
+    Returns:
+        Batch operation applying each one in turn
+    """
+    def apply(batch: Any) -> Any:
+        for op in ops:
+            batch = op(batch)
+        return batch
+    return apply
+
+
+def read_batch_key(image_path: str) -> Optional[Tuple[int, int, str]]:
+    """
+    Read an image's size and batch mode from its header, without decoding pixels.
+
+    Args:
+        image_path: Path to the image file
+
+    Returns:
+        (width, height, batch mode), or None if the image cannot be opened
+    """
+    try:
+        with open_image_file(image_path) as img:
+            return img.size[0], img.size[1], batch_mode(img.mode, img.info)
+    except Exception:
+        return None
+
+
+def plan_batches(
+    image_paths: List[str],
+    max_batch_bytes: int = DEFAULT_BATCH_BYTES,
+    workers: int = 4
+) -> List[Tuple[Tuple[int, int, str], List[str]]]:
+    """
+    Group images by (size, mode) and split each group into bounded batches.
+
+    Args:
+        image_paths: Paths of the images
+        max_batch_bytes: Maximum bytes of one stacked float32 batch
+        workers: Threads used to read headers
+
+    Returns:
+        List of (batch key, image paths) in input order of each group's first image
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        keys = list(executor.map(read_batch_key, image_paths))
+
+    groups: Dict[Tuple[int, int, str], List[str]] = {}
+    for path, key in zip(image_paths, keys):
+        if key is not None:
+            groups.setdefault(key, []).append(path)
+
+    batches = []
+    for key, paths in groups.items():
+        width, height, mode = key
+        image_bytes = width * height * BATCH_MODES[mode] * 4
+        batch_size = max(1, max_batch_bytes // max(1, image_bytes))
+        for start in range(0, len(paths), batch_size):
+            batches.append((key, paths[start:start + batch_size]))
+
+    return batches
+
+
+def decode_for_batch(image_path: str, mode: str) -> Optional[Any]:
+    """
+    Decode one image into a uint8 array of shape (height, width, channels).
+
+    Args:
+        image_path: Path to the image file
+        mode: Batch mode to convert to
+
+    Returns:
+        Array, or None if decoding failed
+    """
+    np = get_numpy()
+    try:
+        with open_image_file(image_path) as img:
+            if img.mode != mode:
+                img = img.convert(mode)
+            array = np.asarray(img)
+    except Exception:
+        return None
+    return array.reshape(array.shape[0], array.shape[1], BATCH_MODES[mode])
+
+
+def encode_from_batch(array: Any, output_path: str, save_options: Dict[str, Any]) -> Optional[str]:
+    """
+    Encode one transformed image from a batch.
+
+    Args:
+        array: float array of shape (height, width, channels) in the 0-255 range
+        output_path: Path to write
+        save_options: Keyword arguments passed to Image.save
+
+    Returns:
+        The output path, or None if encoding failed
+    """
+    np = get_numpy()
+    try:
+        channels = array.shape[-1]
+        if channels not in CHANNEL_MODES:
+            raise ValueError(f"Cannot encode an image with {channels} channels")
+        # The batch is owned by the pipeline, so round and clip in place
+        np.rint(array, out=array)
+        np.clip(array, 0, 255, out=array)
+        pixels = array.astype(np.uint8)
+        if channels == 1:
+            pixels = pixels[..., 0]
+        get_image_module().fromarray(pixels, CHANNEL_MODES[channels]).save(output_path, **save_options)
+        return output_path
+    except Exception:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        return None
+
+
+def iter_batch_transform(
+    batches: List[Tuple[Tuple[int, int, str], List[str]]],
+    batch_fn: BatchOp,
+    output_path_fn: Callable[[str], str],
+    workers: int = 4,
+    save_options: Optional[Dict[str, Any]] = None
+) -> Iterator[Optional[str]]:
+    """
+    Run planned batches through a batch operation with overlapped decode and encode.
+
+    While one batch is transformed, the next one is decoded and the previous
+    one is encoded on worker threads. At most one batch is held for encoding,
+    so memory stays within about three batches.
+
+    Args:
+        batches: Batches from plan_batches
+        batch_fn: Batch operation to apply
+        output_path_fn: Function mapping an input path to its output path
+        workers: Number of decode and encode threads
+        save_options: Keyword arguments passed to Image.save
+
+    Returns:
+        Iterator of output paths (None for images that failed), in batch order
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    np = get_numpy()
+    save_options = save_options or {}
+
+    def submit_decodes(executor: ThreadPoolExecutor, index: int) -> List["Future"]:
+        if index >= len(batches):
+            return []
+        (_, _, mode), paths = batches[index]
+        return [executor.submit(decode_for_batch, path, mode) for path in paths]
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        decodes = submit_decodes(executor, 0)
+        encodes: List["Future"] = []
+
+        for index, (_, paths) in enumerate(batches):
+            arrays = [future.result() for future in decodes]
+            decodes = submit_decodes(executor, index + 1)
+
+            decoded = [(path, array) for path, array in zip(paths, arrays) if array is not None]
+            for _ in range(len(paths) - len(decoded)):
+                yield None
+
+            if not decoded:
+                continue
+
+            # Copy straight into one float32 block instead of stacking, then converting
+            stacked = np.empty((len(decoded),) + decoded[0][1].shape, dtype=np.float32)
+            for position, (_, array) in enumerate(decoded):
+                stacked[position] = array
+            output_paths = [output_path_fn(path) for path, _ in decoded]
+            del arrays, decoded
+
+            try:
+                transformed = batch_fn(stacked)
+            except Exception:
+                for _ in output_paths:
+                    yield None
+                continue
+
+            # Bound memory: the previous batch must be written before queueing this one
+            for future in encodes:
+                yield future.result()
+            encodes = [
+                executor.submit(encode_from_batch, transformed[position], output_path, save_options)
+                for position, output_path in enumerate(output_paths)
+            ]
+
+        for future in encodes:
+            yield future.result()
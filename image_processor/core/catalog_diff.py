@@ -0,0 +1,153 @@
+"""
+Catalog diff module with functions for comparing two metadata exports.
+
+The smaller export is loaded into a hash table keyed on "path" or "uuid" (keeping
+only the fields needed for comparison), and the larger one is streamed against it,
+so memory is bounded by the smaller side.
+"""
+
+import os
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..utils.json_stream import iter_json_records
+
+# Fields kept from each record and compared between exports
+COMPARED_FIELDS = ["size_bytes", "dimensions", "format", "color_mode", "modified_time"]
+IDENTITY_FIELDS = ["filename", "path", "uuid"]
+
+DIFF_KEYS = ["path", "uuid"]
+
+
+def project_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Keep only the identity and compared fields of a metadata record.
+
+    Args:
+        record: Metadata dictionary
+
+    Returns:
+        Reduced dictionary
+    """
+    return {
+        field: record[field]
+        for field in IDENTITY_FIELDS + COMPARED_FIELDS
+        if field in record
+    }
+
+
+def classify_change(old: Dict[str, Any], new: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Compare two projected records for the same image.
+
+    Args:
+        old: Record from the old export
+        new: Record from the new export
+
+    Returns:
+        Dictionary with change type and changed fields, or None if unchanged.
+        The change is "resized" if dimensions differ, "reencoded" if the size,
+        format or color mode differ, and "modified" if only the timestamp differs.
+    """
+    changed = [field for field in COMPARED_FIELDS if old.get(field) != new.get(field)]
+    if not changed:
+        return None
+
+    if "dimensions" in changed:
+        change = "resized"
+    elif set(changed) & {"size_bytes", "format", "color_mode"}:
+        change = "reencoded"
+    else:
+        change = "modified"
+
+    return {"change": change, "fields": changed}
+
+
+def unkeyed_change(record: Dict[str, Any], is_old: bool) -> Dict[str, Any]:
+    """
+    Describe a record that lacks the join key and cannot be paired.
+
+    Args:
+        record: Projected record
+        is_old: Whether the record comes from the old export
+
+    Returns:
+        Change record of type "unkeyed"
+    """
+    old, new = (record, None) if is_old else (None, record)
+    return {"change": "unkeyed", "key": None, "old": old, "new": new, "fields": []}
+
+
+def diff_records(
+    old_path: str,
+    new_path: str,
+    key: str = "path",
+    include_unchanged: bool = False
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream change records between two metadata exports with a hash join.
+
+    Records sharing a key are paired with the other export in file order; any
+    that are left without a partner are reported as added or removed, and records
+    without the key field cannot be paired at all and are reported as "unkeyed"
+    (with the record on its old or new side), so every record of both exports
+    shows up in the output.
+
+    Args:
+        old_path: Path to the older export (JSON list or NDJSON)
+        new_path: Path to the newer export (JSON list or NDJSON)
+        key: Record field to join on ("path" or "uuid")
+        include_unchanged: Whether to also emit "unchanged" records
+
+    Returns:
+        Iterator of change records with change, key, old, new and fields
+        (key is None for "unkeyed" records)
+
+    Raises:
+        ValueError: If the join key is not supported
+    """
+    if key not in DIFF_KEYS:
+        raise ValueError(f"Unsupported diff key '{key}' (expected one of {', '.join(DIFF_KEYS)})")
+
+    # Build the hash table from the smaller file and probe it with the larger one
+    build_is_old = os.path.getsize(old_path) <= os.path.getsize(new_path)
+    build_path, probe_path = (old_path, new_path) if build_is_old else (new_path, old_path)
+
+    # Key -> projected records in file order (more than one if the key is duplicated)
+    table: Dict[Any, List[Dict[str, Any]]] = {}
+    for record in iter_json_records(build_path):
+        if record.get(key) is None:
+            yield unkeyed_change(project_record(record), build_is_old)
+            continue
+        table.setdefault(record[key], []).append(project_record(record))
+
+    for record in iter_json_records(probe_path):
+        record_key = record.get(key)
+        probe = project_record(record)
+        if record_key is None:
+            yield unkeyed_change(probe, not build_is_old)
+            continue
+        matches = table.get(record_key)
+        match = matches.pop(0) if matches else None
+        if matches is not None and not matches:
+            del table[record_key]
+
+        if match is None:
+            # Present only in the probe export
+            change = {"change": "added" if build_is_old else "removed", "fields": []}
+            old, new = (None, probe) if build_is_old else (probe, None)
+        else:
+            old, new = (match, probe) if build_is_old else (probe, match)
+            change = classify_change(old, new)
+            if change is None:
+                if not include_unchanged:
+                    continue
+                change = {"change": "unchanged", "fields": []}
+
+        yield {"change": change["change"], "key": record_key, "old": old, "new": new, "fields": change["fields"]}
+
+    # Anything left in the table was never matched by the probe side
+    leftover = "removed" if build_is_old else "added"
+    for record_key, records in table.items():
+        for record in records:
+            old, new = (record, None) if build_is_old else (None, record)
+            yield {"change": leftover, "key": record_key, "old": old, "new": new, "fields": []}
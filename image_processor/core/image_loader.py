@@ -0,0 +1,112 @@
+"""
+Lazy PIL loader module.
+
+PIL and its format plugins are only imported the first time an image is actually
+opened, so commands that never decode pixels (such as base64 export) do not pay
+for them at startup.
+"""
+
+import importlib
+import io
+import os
+from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
+
+from ..utils.file_ops import open_source_file, split_member_path
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+# Map file extensions to (PIL format name, plugin module name)
+EXTENSION_PLUGINS: Dict[str, Tuple[str, str]] = {
+    ".png": ("PNG", "PngImagePlugin"),
+    ".jpg": ("JPEG", "JpegImagePlugin"),
+    ".jpeg": ("JPEG", "JpegImagePlugin"),
+    ".gif": ("GIF", "GifImagePlugin"),
+    ".bmp": ("BMP", "BmpImagePlugin"),
+    ".tif": ("TIFF", "TiffImagePlugin"),
+    ".tiff": ("TIFF", "TiffImagePlugin"),
+    ".webp": ("WEBP", "WebPImagePlugin"),
+}
+
+_loaded_plugins: Dict[str, bool] = {}
+
+
+def get_image_module() -> Any:
+    """
+    Import and return the PIL.Image module on first use.
+
+    Returns:
+        The PIL.Image module
+    """
+    return importlib.import_module("PIL.Image")
+
+
+def get_exif_tags() -> Dict[int, str]:
+    """
+    Import and return the EXIF tag name table on first use.
+
+    Returns:
+        Dictionary mapping EXIF tag ids to tag names
+    """
+    return importlib.import_module("PIL.ExifTags").TAGS
+
+
+def load_plugin_for_path(file_path: str) -> Optional[str]:
+    """
+    Import only the PIL plugin matching a file's extension.
+
+    Args:
+        file_path: Path (or name) of the image file
+
+    Returns:
+        PIL format name registered by the plugin, or None if unknown
+    """
+    extension = os.path.splitext(file_path.lower())[1]
+    if extension not in EXTENSION_PLUGINS:
+        return None
+
+    format_name, module_name = EXTENSION_PLUGINS[extension]
+    if module_name not in _loaded_plugins:
+        try:
+            importlib.import_module(f"PIL.{module_name}")
+            _loaded_plugins[module_name] = True
+        except ImportError:
+            _loaded_plugins[module_name] = False
+
+    return format_name if _loaded_plugins[module_name] else None
+
+
+def open_image_file(source: Any, filename: Optional[str] = None) -> "Image.Image":
+    """
+    Open an image, initializing only the plugin its extension needs.
+
+    Falls back to PIL's full plugin discovery if the extension is unknown or
+    does not match the actual content. Virtual `<archive>!/<member>` paths are
+    read straight out of the archive into memory, and the member is closed
+    before the image is returned.
+
+    Args:
+        source: Path to the image file (or archive member) or a binary file object
+        filename: Name used to pick the plugin when source is a file object
+
+    Returns:
+        PIL Image object
+    """
+    Image = get_image_module()
+    if isinstance(source, str) and split_member_path(source) is not None:
+        filename = filename if filename is not None else os.path.basename(source)
+        with open_source_file(source) as member:
+            source = io.BytesIO(member.read())
+
+    name = filename if filename is not None else (source if isinstance(source, str) else "")
+    format_name = load_plugin_for_path(name) if name else None
+
+    if format_name:
+        try:
+            return Image.open(source, formats=[format_name])
+        except Image.UnidentifiedImageError:
+            if not isinstance(source, str):
+                source.seek(0)
+
+    return Image.open(source)
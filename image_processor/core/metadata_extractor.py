@@ -4,9 +4,14 @@ Metadata extractor module with pure functions for extracting metadata from image
 
 from datetime import datetime
 import os
-from typing import Dict, Any, Optional, Tuple
-from PIL import Image
-from PIL.ExifTags import TAGS as ExifTags
+from typing import Dict, Any, BinaryIO, Collection, Iterator, Optional, Tuple, TYPE_CHECKING
+
+from .image_loader import get_exif_tags, get_image_module, open_image_file
+from .png_chunks import scan_png_metadata
+from ..utils.file_ops import image_name, open_source_file, split_member_path
+
+if TYPE_CHECKING:
+    from PIL import Image
 
 
 def extract_file_metadata(file_path: str) -> Dict[str, Any]:
@@ -19,6 +24,9 @@ def extract_file_metadata(file_path: str) -> Dict[str, Any]:
     Returns:
         Dictionary with basic file metadata
     """
+    if split_member_path(file_path) is not None:
+        return extract_member_file_metadata(file_path)
+    
     try:
         file_stats = os.stat(file_path)
         return {
@@ -36,7 +44,48 @@ def extract_file_metadata(file_path: str) -> Dict[str, Any]:
         }
 
 
-def extract_image_dimensions(image: Image.Image) -> Dict[str, int]:
+def archive_entry_to_file_metadata(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert an archive member entry to basic file metadata.
+    
+    Args:
+        entry: Entry from the archive utilities
+        
+    Returns:
+        Dictionary with basic file metadata, including archive and member paths
+    """
+    return {
+        "filename": entry["name"],
+        "path": entry["path"],
+        "archive_path": entry["archive_path"],
+        "member_path": entry["member_path"],
+        "size_bytes": entry["size_bytes"],
+        "modified_time": datetime.fromtimestamp(entry["mtime"]).isoformat(),
+    }
+
+
+def extract_member_file_metadata(member_path: str) -> Dict[str, Any]:
+    """
+    Extract basic file metadata for an archive member.
+    
+    Args:
+        member_path: Virtual `<archive>!/<member>` path
+        
+    Returns:
+        Dictionary with basic file metadata
+    """
+    try:
+        from ..utils.archive_ops import get_member_entry
+        return archive_entry_to_file_metadata(get_member_entry(member_path))
+    except Exception as e:
+        return {
+            "filename": image_name(member_path),
+            "path": member_path,
+            "error": f"File metadata error: {str(e)}"
+        }
+
+
+def extract_image_dimensions(image: "Image.Image") -> Dict[str, int]:
     """
     Extract image dimensions from a PIL Image object.
     
@@ -53,7 +102,7 @@ def extract_image_dimensions(image: Image.Image) -> Dict[str, int]:
     }
 
 
-def extract_exif_data(image: Image.Image) -> Dict[str, Any]:
+def extract_exif_data(image: "Image.Image") -> Dict[str, Any]:
     """
     Extract EXIF data from a PIL Image object if available.
     
@@ -66,6 +115,7 @@ def extract_exif_data(image: Image.Image) -> Dict[str, Any]:
     if not hasattr(image, '_getexif') or image._getexif() is None:
         return {}
         
+    ExifTags = get_exif_tags()
     return {
         ExifTags[k]: v 
         for k, v in image._getexif().items() 
@@ -73,6 +123,51 @@ def extract_exif_data(image: Image.Image) -> Dict[str, Any]:
     }
 
 
+def extract_exif_bytes(exif_bytes: Optional[bytes]) -> Dict[str, Any]:
+    """
+    Extract EXIF data from raw EXIF bytes (such as a PNG eXIf chunk).
+    
+    Args:
+        exif_bytes: Raw EXIF block, or None
+        
+    Returns:
+        Dictionary with EXIF data or empty dict if none
+    """
+    if not exif_bytes:
+        return {}
+    
+    exif = get_image_module().Exif()
+    exif.load(exif_bytes)
+    ExifTags = get_exif_tags()
+    return {
+        ExifTags[k]: v
+        for k, v in exif._get_merged_dict().items()
+        if k in ExifTags
+    }
+
+
+def decode_raw_profile_exif(raw_profile: Optional[str]) -> Optional[bytes]:
+    """
+    Decode the hex dump of a "Raw profile type exif" PNG text chunk.
+    
+    The layout matches what PIL expects in Image.getexif: a blank line, the
+    profile name and the byte count on the first three lines, then hex digits.
+    
+    Args:
+        raw_profile: Text of the chunk, or None
+        
+    Returns:
+        Raw EXIF bytes, or None if there is no profile or it is malformed
+    """
+    if not raw_profile:
+        return None
+    
+    try:
+        return bytes.fromhex("".join(raw_profile.split("\n")[3:]))
+    except ValueError:
+        return None
+
+
 def extract_filename_components(filename: str) -> Dict[str, str]:
     """
     Extract useful components from an image filename.
@@ -112,7 +207,7 @@ def extract_filename_components(filename: str) -> Dict[str, str]:
     return result
 
 
-def open_image(file_path: str) -> Tuple[Optional[Image.Image], Optional[str]]:
+def open_image(file_path: str) -> Tuple[Optional["Image.Image"], Optional[str]]:
     """
     Safely open an image file and return the PIL Image object.
     
@@ -123,13 +218,13 @@ def open_image(file_path: str) -> Tuple[Optional[Image.Image], Optional[str]]:
         Tuple of (Image object or None, error message or None)
     """
     try:
-        image = Image.open(file_path)
+        image = open_image_file(file_path)
         return image, None
     except Exception as e:
         return None, str(e)
 
 
-def extract_image_info(image: Image.Image) -> Dict[str, Any]:
+def extract_image_info(image: "Image.Image") -> Dict[str, Any]:
     """
     Extract basic image information from a PIL Image object.
     
@@ -146,37 +241,178 @@ def extract_image_info(image: Image.Image) -> Dict[str, Any]:
     }
 
 
+def extract_image_metadata(image: "Image.Image", filename: str, fp: Optional[BinaryIO] = None) -> Dict[str, Any]:
+    """
+    Extract filename components, image information, EXIF data and PNG text chunks.
+    
+    For PNGs read from a file object, EXIF data and text chunks come from a chunk
+    scan of the file instead of PIL, which would decode all pixels to look for an
+    eXIf chunk after the image data. As in PIL, a "Raw profile type exif" text
+    chunk is used when there is no eXIf chunk.
+    
+    Args:
+        image: PIL Image object
+        filename: Name of the image file
+        fp: Binary file object the image was opened from, if any
+        
+    Returns:
+        Dictionary with image metadata
+    """
+    metadata = extract_filename_components(filename)
+    metadata.update(extract_image_info(image))
+    
+    if image.format == "PNG" and fp is not None:
+        fp.seek(0)
+        png_metadata = scan_png_metadata(fp)
+        exif_bytes = png_metadata["exif"]
+        if exif_bytes is None:
+            exif_bytes = decode_raw_profile_exif(png_metadata["text_chunks"].get("Raw profile type exif"))
+        metadata["exif_data"] = extract_exif_bytes(exif_bytes)
+        metadata["text_chunks"] = png_metadata["text_chunks"]
+    else:
+        metadata["exif_data"] = extract_exif_data(image)
+    
+    return metadata
+
+
+def extract_metadata_from_stream(fp: BinaryIO, file_metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract metadata from an image read from an open binary stream.
+    
+    Args:
+        fp: Readable and seekable binary file object
+        file_metadata: Basic file metadata (must contain "filename")
+        
+    Returns:
+        Dictionary with complete metadata
+    """
+    metadata = dict(file_metadata)
+    try:
+        image = open_image_file(fp, filename=metadata["filename"])
+    except Exception as e:
+        metadata["error"] = str(e)
+        return metadata
+    
+    try:
+        metadata.update(extract_image_metadata(image, metadata["filename"], fp))
+    except Exception as e:
+        metadata["error"] = str(e)
+    image.close()
+    
+    return metadata
+
+
 def extract_full_metadata(file_path: str) -> Dict[str, Any]:
     """
     Extract all available metadata from an image file.
     This is a composition of the other functions.
     
     Args:
-        file_path: Path to the image file
+        file_path: Path to the image file or virtual `<archive>!/<member>` path
         
     Returns:
         Dictionary with complete metadata
     """
     # Start with basic file metadata
     metadata = extract_file_metadata(file_path)
+    if "error" in metadata and split_member_path(file_path) is not None:
+        return metadata
     
-    # Try to open the image
-    image, error = open_image(file_path)
-    if error:
-        metadata["error"] = error
+    # Files and archive members alike are read from one open stream
+    try:
+        with open_source_file(file_path) as fp:
+            return extract_metadata_from_stream(fp, metadata)
+    except Exception as e:
+        metadata["error"] = str(e)
         return metadata
+
+
+def extract_png_text_from_stream(
+    fp: BinaryIO,
+    file_metadata: Dict[str, Any],
+    keywords: Optional[Collection[str]] = None
+) -> Dict[str, Any]:
+    """
+    Extract dimensions and text chunks of a PNG read from an open binary stream.
     
-    # Extract filename components
-    metadata.update(extract_filename_components(os.path.basename(file_path)))
+    Args:
+        fp: Readable binary file object positioned at the start of the PNG
+        file_metadata: Basic file metadata
+        keywords: Text keywords to keep (default: all)
+        
+    Returns:
+        Dictionary with file metadata, dimensions and text_chunks
+    """
+    metadata = dict(file_metadata)
+    try:
+        png_metadata = scan_png_metadata(fp, keywords)
+    except Exception as e:
+        metadata["error"] = str(e)
+        return metadata
     
-    # Extract image info
-    image_info = extract_image_info(image)
-    metadata.update(image_info)
+    metadata["dimensions"] = png_metadata["dimensions"]
+    metadata["text_chunks"] = png_metadata["text_chunks"]
+    return metadata
+
+
+def extract_png_text_metadata(file_path: str, keywords: Optional[Collection[str]] = None) -> Dict[str, Any]:
+    """
+    Extract file metadata, dimensions and text chunks of a PNG without PIL.
     
-    # Extract EXIF data
-    metadata["exif_data"] = extract_exif_data(image)
+    Only chunk headers and the chunks of interest are read, so this costs a few
+    KB of I/O per file regardless of image size.
     
-    # Ensure image is closed to free resources
-    image.close()
+    Args:
+        file_path: Path to the PNG file or virtual `<archive>!/<member>` path
+        keywords: Text keywords to keep (default: all)
+        
+    Returns:
+        Dictionary with file metadata, dimensions and text_chunks
+    """
+    metadata = extract_file_metadata(file_path)
+    if "error" in metadata:
+        return metadata
+    
+    try:
+        with open_source_file(file_path) as fp:
+            return extract_png_text_from_stream(fp, metadata, keywords)
+    except Exception as e:
+        metadata["error"] = str(e)
+        return metadata
+
+
+def iter_archive_metadata(archive_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Extract metadata for every image in a zip or tar archive in a single pass.
+    
+    Args:
+        archive_path: Path to the archive
+        
+    Returns:
+        Iterator of metadata dictionaries, in archive order
+    """
+    from ..utils.archive_ops import iter_archive_images
+    
+    for entry, fp in iter_archive_images(archive_path):
+        yield extract_metadata_from_stream(fp, archive_entry_to_file_metadata(entry))
+
+
+def iter_archive_png_text_metadata(
+    archive_path: str,
+    keywords: Optional[Collection[str]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Extract dimensions and text chunks for every PNG in a zip or tar archive in a single pass.
+    
+    Args:
+        archive_path: Path to the archive
+        keywords: Text keywords to keep (default: all)
+        
+    Returns:
+        Iterator of dictionaries with file metadata, dimensions and text_chunks, in archive order
+    """
+    from ..utils.archive_ops import iter_archive_images
     
-    return metadata
\ No newline at end of file
+    for entry, fp in iter_archive_images(archive_path):
+        if entry["name"].lower().endswith(".png"):
+            yield extract_png_text_from_stream(fp, archive_entry_to_file_metadata(entry), keywords)
@@ -0,0 +1,154 @@
+"""
+PNG chunk scanner module for reading metadata without decoding pixels.
+
+Chunks are walked straight from the file: headers are read, chunks of interest
+(IHDR, eXIf and the tEXt/zTXt/iTXt text chunks) are read in full, and every other
+chunk, IDAT included, is skipped with a seek. Only the compressed text chunks
+that are actually wanted get inflated, with a cap on their size. Text chunks
+placed after the image data are found as well, at the cost of a few header
+reads per IDAT chunk.
+"""
+
+import struct
+import zlib
+from typing import Any, BinaryIO, Collection, Dict, Iterator, Optional, Tuple
+
+from .png_stream import PNG_SIGNATURE
+
+TEXT_CHUNK_TYPES = (b"tEXt", b"zTXt", b"iTXt")
+
+# Upper bound on the inflated size of a single compressed text chunk
+MAX_TEXT_BYTES = 1024 * 1024
+
+
+def iter_png_chunks(fp: BinaryIO, wanted: Collection[bytes]) -> Iterator[Tuple[bytes, bytes]]:
+    """
+    Walk the chunks of a PNG, reading only the wanted ones.
+
+    Args:
+        fp: Binary file object positioned at the start of the file
+        wanted: Chunk types whose data should be read
+
+    Returns:
+        Iterator of (chunk type, chunk data) for wanted chunks, in file order
+
+    Raises:
+        ValueError: If the file is not a PNG
+    """
+    if fp.read(8) != PNG_SIGNATURE:
+        raise ValueError("Not a PNG file")
+
+    while True:
+        header = fp.read(8)
+        if len(header) < 8:
+            return
+        length, chunk_type = struct.unpack(">I4s", header)
+
+        if chunk_type in wanted:
+            data = fp.read(length)
+            if len(data) < length:
+                return
+            fp.seek(4, 1)  # CRC
+            yield chunk_type, data
+        else:
+            fp.seek(length + 4, 1)
+
+        if chunk_type == b"IEND":
+            return
+
+
+def inflate_text(data: bytes, max_bytes: int = MAX_TEXT_BYTES) -> bytes:
+    """
+    Inflate compressed text, stopping at a size cap.
+
+    Args:
+        data: zlib-compressed bytes
+        max_bytes: Maximum number of inflated bytes to return
+
+    Returns:
+        Inflated bytes (truncated at max_bytes)
+    """
+    return zlib.decompressobj().decompress(data, max_bytes)
+
+
+def decode_text_chunk(
+    chunk_type: bytes,
+    data: bytes,
+    keywords: Optional[Collection[str]] = None,
+    max_text_bytes: int = MAX_TEXT_BYTES
+) -> Optional[Tuple[str, str]]:
+    """
+    Decode a tEXt, zTXt or iTXt chunk.
+
+    Args:
+        chunk_type: Chunk type
+        data: Chunk data
+        keywords: Keywords to decode (default: all); other chunks are not inflated
+        max_text_bytes: Maximum inflated size of compressed text
+
+    Returns:
+        (keyword, text), or None if the chunk is filtered out or malformed
+    """
+    keyword, separator, rest = data.partition(b"\0")
+    if not separator:
+        return None
+    keyword = keyword.decode("latin-1")
+    if keywords is not None and keyword not in keywords:
+        return None
+
+    try:
+        if chunk_type == b"tEXt":
+            return keyword, rest.decode("latin-1")
+
+        if chunk_type == b"zTXt":
+            # Compression method byte (0 = zlib) precedes the compressed text
+            return keyword, inflate_text(rest[1:], max_text_bytes).decode("latin-1")
+
+        # iTXt: compression flag, method, language tag, translated keyword, UTF-8 text
+        compressed = rest[0]
+        _, _, rest = rest[2:].partition(b"\0")
+        _, _, text = rest.partition(b"\0")
+        if compressed:
+            text = inflate_text(text, max_text_bytes)
+        return keyword, text.decode("utf-8", errors="replace")
+    except (IndexError, zlib.error):
+        return None
+
+
+def scan_png_metadata(
+    fp: BinaryIO,
+    keywords: Optional[Collection[str]] = None,
+    max_text_bytes: int = MAX_TEXT_BYTES
+) -> Dict[str, Any]:
+    """
+    Read the header, text chunks and raw EXIF of a PNG without decoding pixels.
+
+    Repeated keywords have their texts joined with newlines.
+
+    Args:
+        fp: Binary file object positioned at the start of the file
+        keywords: Text keywords to keep (default: all)
+        max_text_bytes: Maximum inflated size of each compressed text chunk
+
+    Returns:
+        Dictionary with dimensions, text_chunks and exif (raw bytes or None)
+
+    Raises:
+        ValueError: If the file is not a PNG
+    """
+    result: Dict[str, Any] = {"dimensions": None, "text_chunks": {}, "exif": None}
+    text_chunks = result["text_chunks"]
+
+    for chunk_type, data in iter_png_chunks(fp, TEXT_CHUNK_TYPES + (b"IHDR", b"eXIf")):
+        if chunk_type == b"IHDR":
+            width, height = struct.unpack(">II", data[:8])
+            result["dimensions"] = {"width": width, "height": height}
+        elif chunk_type == b"eXIf":
+            result["exif"] = data
+        else:
+            decoded = decode_text_chunk(chunk_type, data, keywords, max_text_bytes)
+            if decoded is not None:
+                keyword, text = decoded
+                text_chunks[keyword] = f"{text_chunks[keyword]}\n{text}" if keyword in text_chunks else text
+
+    return result
@@ -0,0 +1,295 @@
+"""
+Streaming PNG reader and writer module.
+
+Decodes and encodes non-interlaced 8-bit PNGs in horizontal strips so that only a
+few rows are held in memory at a time; palette PNGs of any bit depth can be
+decoded too. IDAT data is inflated incrementally with zlib; each strip is then
+handed to PIL's own PNG row decoder (which undoes the per-row filters) together
+with the last unfiltered row of the previous strip.
+"""
+
+import struct
+import zlib
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Optional, Tuple, TYPE_CHECKING
+
+from .image_loader import get_image_module
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# PNG color type -> (PIL mode, bytes per pixel) for 8-bit images
+COLOR_TYPE_MODES = {
+    0: ("L", 1),
+    2: ("RGB", 3),
+    4: ("LA", 2),
+    6: ("RGBA", 4),
+}
+
+MODE_COLOR_TYPES = {mode: color_type for color_type, (mode, _) in COLOR_TYPE_MODES.items()}
+
+# Palette images: PNG bit depth -> PIL raw mode of the packed palette indices
+PALETTE_COLOR_TYPE = 3
+PALETTE_RAWMODES = {1: "P;1", 2: "P;2", 4: "P;4", 8: "P"}
+
+# Amount of compressed data read from the file per step
+READ_SIZE = 64 * 1024
+
+
+def read_png_header(fp: BinaryIO) -> Optional[Dict[str, Any]]:
+    """
+    Read the PNG signature and IHDR chunk.
+
+    Args:
+        fp: Binary file object positioned at the start of the file
+
+    Returns:
+        Dictionary with width, height, bit_depth, color_type and interlace,
+        or None if the file is not a PNG
+    """
+    if fp.read(8) != PNG_SIGNATURE:
+        return None
+
+    length, chunk_type = struct.unpack(">I4s", fp.read(8))
+    if chunk_type != b"IHDR" or length != 13:
+        return None
+
+    width, height, bit_depth, color_type, _, _, interlace = struct.unpack(">IIBBBBB", fp.read(13))
+    fp.read(4)  # CRC
+
+    return {
+        "width": width,
+        "height": height,
+        "bit_depth": bit_depth,
+        "color_type": color_type,
+        "interlace": interlace,
+    }
+
+
+def is_streamable_png(header: Optional[Dict[str, Any]]) -> bool:
+    """
+    Check whether a PNG header describes an image this module can decode in strips.
+
+    Args:
+        header: Result of read_png_header
+
+    Returns:
+        True for non-interlaced 8-bit grayscale/RGB images with optional alpha
+        and non-interlaced palette images
+    """
+    if header is None or header["interlace"] != 0:
+        return False
+    if header["color_type"] == PALETTE_COLOR_TYPE:
+        return header["bit_depth"] in PALETTE_RAWMODES
+    return header["bit_depth"] == 8 and header["color_type"] in COLOR_TYPE_MODES
+
+
+def iter_idat_data(fp: BinaryIO, palette_chunks: Optional[Dict[bytes, bytes]] = None) -> Iterator[bytes]:
+    """
+    Yield compressed IDAT payload in bounded pieces, skipping other chunks.
+
+    Args:
+        fp: Binary file object positioned just after the IHDR chunk
+        palette_chunks: Optional dictionary that receives the PLTE and tRNS
+            payloads, which precede the first IDAT chunk
+
+    Returns:
+        Iterator of compressed data pieces
+    """
+    while True:
+        chunk_header = fp.read(8)
+        if len(chunk_header) < 8:
+            return
+        length, chunk_type = struct.unpack(">I4s", chunk_header)
+
+        if chunk_type == b"IEND":
+            return
+        if palette_chunks is not None and chunk_type in (b"PLTE", b"tRNS"):
+            palette_chunks[chunk_type] = fp.read(length)
+            fp.read(4)  # CRC
+            continue
+        if chunk_type != b"IDAT":
+            fp.seek(length + 4, 1)
+            continue
+
+        remaining = length
+        while remaining > 0:
+            piece = fp.read(min(READ_SIZE, remaining))
+            if not piece:
+                return
+            remaining -= len(piece)
+            yield piece
+        fp.read(4)  # CRC
+
+
+def _palette_from_chunks(palette_chunks: Dict[bytes, bytes]) -> Tuple[bytes, str]:
+    """Build PIL palette data from PLTE and tRNS payloads, with alpha if present."""
+    palette = palette_chunks.get(b"PLTE")
+    if not palette:
+        raise ValueError("PNG palette image has no PLTE chunk")
+
+    alphas = palette_chunks.get(b"tRNS")
+    if alphas is None:
+        return palette, "RGB"
+
+    entries = len(palette) // 3
+    alphas = alphas[:entries].ljust(entries, b"\xff")
+    rgba = b"".join(palette[index * 3:index * 3 + 3] + alphas[index:index + 1] for index in range(entries))
+    return rgba, "RGBA"
+
+
+def iter_png_strips(fp: BinaryIO, header: Dict[str, Any], strip_height: int) -> Iterator["Image.Image"]:
+    """
+    Decode a streamable PNG into horizontal strips.
+
+    Palette images are returned as P strips with the palette attached, and
+    an RGBA palette if the image has a tRNS chunk.
+
+    Args:
+        fp: Binary file object positioned just after the IHDR chunk
+        header: Result of read_png_header
+        strip_height: Number of rows per strip
+
+    Returns:
+        Iterator of PIL images, each `width` wide and up to `strip_height` rows tall
+
+    Raises:
+        ValueError: If the image data is truncated or a palette image has no palette
+    """
+    Image = get_image_module()
+    width, height = header["width"], header["height"]
+
+    if header["color_type"] == PALETTE_COLOR_TYPE:
+        # Filters work on whole bytes (one per pixel at most), so rows are
+        # unfiltered as 8-bit gray and the packed indices unpacked afterwards
+        rawmode = PALETTE_RAWMODES[header["bit_depth"]]
+        filter_mode, filter_width = "L", (width * header["bit_depth"] + 7) // 8
+        row_size = 1 + filter_width
+    else:
+        filter_mode, bytes_per_pixel = COLOR_TYPE_MODES[header["color_type"]]
+        filter_width = width
+        row_size = 1 + width * bytes_per_pixel
+
+    palette_chunks = {}
+    palette = None
+    inflater = zlib.decompressobj()
+    compressed = iter_idat_data(fp, palette_chunks)
+    pending = bytearray()
+    previous_row = b""
+    rows_done = 0
+
+    while rows_done < height:
+        rows = min(strip_height, height - rows_done)
+        needed = rows * row_size
+
+        # Inflate just enough data for this strip
+        while len(pending) < needed:
+            if inflater.unconsumed_tail:
+                data = inflater.unconsumed_tail
+            else:
+                data = next(compressed, b"")
+                if not data:
+                    raise ValueError("PNG image data ends before the last row")
+            pending += inflater.decompress(data, needed - len(pending))
+
+        filtered = bytes(pending[:needed])
+        del pending[:needed]
+
+        # Prepend the previous row unfiltered so Up/Average/Paeth rows decode correctly
+        if previous_row:
+            block = b"\x00" + previous_row + filtered
+            decoded = Image.frombytes(
+                filter_mode, (filter_width, rows + 1), zlib.compress(block, 0), "zip", filter_mode
+            )
+            strip = decoded.crop((0, 1, filter_width, rows + 1))
+        else:
+            strip = Image.frombytes(
+                filter_mode, (filter_width, rows), zlib.compress(filtered, 0), "zip", filter_mode
+            )
+
+        previous_row = strip.crop((0, rows - 1, filter_width, rows)).tobytes()
+        rows_done += rows
+
+        if header["color_type"] == PALETTE_COLOR_TYPE:
+            # PLTE and tRNS precede the first IDAT chunk, so they have been read by now
+            if palette is None:
+                palette = _palette_from_chunks(palette_chunks)
+            strip = Image.frombytes("P", (width, rows), strip.tobytes(), "raw", rawmode)
+            strip.putpalette(*palette)
+        yield strip
+
+
+def write_png_chunk(fp: BinaryIO, chunk_type: bytes, data: bytes) -> None:
+    """
+    Write a single PNG chunk with its length and CRC.
+
+    Args:
+        fp: Writable binary file object
+        chunk_type: Four-byte chunk type
+        data: Chunk payload
+    """
+    fp.write(struct.pack(">I", len(data)))
+    fp.write(chunk_type)
+    fp.write(data)
+    fp.write(struct.pack(">I", zlib.crc32(chunk_type + data) & 0xFFFFFFFF))
+
+
+def write_png_strips(
+    fp: BinaryIO,
+    width: int,
+    height: int,
+    mode: str,
+    strips: Iterable["Image.Image"],
+    compress_level: int = 6
+) -> int:
+    """
+    Encode a PNG from horizontal strips without holding the whole image.
+
+    Args:
+        fp: Writable binary file object
+        width: Image width in pixels
+        height: Image height in pixels
+        mode: PIL mode of every strip (L, LA, RGB or RGBA)
+        strips: Iterable of strips, top to bottom
+        compress_level: zlib compression level
+
+    Returns:
+        Number of rows written
+
+    Raises:
+        ValueError: If the mode is unsupported or a strip does not match the image
+    """
+    if mode not in MODE_COLOR_TYPES:
+        raise ValueError(f"Cannot stream PNG output for mode '{mode}'")
+
+    fp.write(PNG_SIGNATURE)
+    write_png_chunk(fp, b"IHDR", struct.pack(">IIBBBBB", width, height, 8, MODE_COLOR_TYPES[mode], 0, 0, 0))
+
+    deflater = zlib.compressobj(compress_level)
+    rows_written = 0
+
+    for strip in strips:
+        if strip.mode != mode or strip.width != width:
+            raise ValueError(f"Strip {strip.mode} {strip.size} does not match {mode} image {width} wide")
+
+        raw = strip.tobytes()
+        row_size = len(raw) // strip.height
+        # Filter type 0 (None) keeps rows independent of the previous strip
+        filtered = b"".join(
+            b"\x00" + raw[offset:offset + row_size]
+            for offset in range(0, len(raw), row_size)
+        )
+        compressed = deflater.compress(filtered)
+        if compressed:
+            write_png_chunk(fp, b"IDAT", compressed)
+        rows_written += strip.height
+
+    if rows_written != height:
+        raise ValueError(f"Expected {height} rows, got {rows_written}")
+
+    write_png_chunk(fp, b"IDAT", deflater.flush())
+    write_png_chunk(fp, b"IEND", b"")
+
+    return rows_written
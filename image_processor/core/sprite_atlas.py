@@ -0,0 +1,338 @@
+"""
+Sprite atlas module for packing image thumbnails into a few contact sheets.
+
+Thumbnails are laid out on fixed-size sheets with a shelf bin-packing algorithm,
+and a JSON atlas maps each image (by uuid, or by its name within the directory or
+archive when there is none) to its sheet and rectangle.
+
+Rebuilding against a previous atlas is incremental: sprites of unchanged sources
+keep their sheet and position, removed or changed sprites free their space, and
+only new or changed sources are decoded and placed into free space on existing
+shelves, on new shelves, or on a new sheet. Only sheets whose content changed are
+rewritten, with the unchanged sprites copied over from the old sheet image.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from .image_loader import get_image_module, open_image_file
+from .metadata_extractor import extract_filename_components
+from ..utils.file_ops import image_name, iter_entry_files, load_json, save_json
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+ATLAS_VERSION = 2
+
+
+def sprite_key(file_path: str) -> str:
+    """
+    Get the atlas key for an image: its uuid if the filename has one, else its name.
+
+    Archive members are named by their full member path (see image_name), so
+    members with the same basename in different archive directories get
+    different keys.
+
+    Args:
+        file_path: Path to the image file or virtual `<archive>!/<member>` path
+
+    Returns:
+        Atlas key
+    """
+    name = image_name(file_path)
+    return extract_filename_components(os.path.basename(name)).get("uuid", name)
+
+
+def make_thumbnail(source: Any, thumb_size: int, filename: Optional[str] = None) -> "Image.Image":
+    """
+    Decode an image into an RGBA thumbnail that fits in a thumb_size square.
+
+    Args:
+        source: Path to the image file or a binary file object
+        thumb_size: Maximum thumbnail width and height
+        filename: Name used to pick the plugin when source is a file object
+
+    Returns:
+        PIL Image object
+    """
+    with open_image_file(source, filename=filename) as img:
+        # Let JPEG decode at reduced scale when possible
+        img.draft("RGB", (thumb_size, thumb_size))
+        img.thumbnail((thumb_size, thumb_size))
+        return img.convert("RGBA")
+
+
+def find_shelf_gap(spans: List[Tuple[int, int]], width: int, sheet_width: int) -> Optional[int]:
+    """
+    Find the leftmost free gap on a shelf that is wide enough.
+
+    Args:
+        spans: Occupied (start, end) x ranges on the shelf
+        width: Width needed, padding included
+        sheet_width: Sheet width in pixels
+
+    Returns:
+        x position of the gap, or None if the shelf has no room
+    """
+    x = 0
+    for start, end in sorted(spans):
+        if start - x >= width:
+            return x
+        x = max(x, end)
+    return x if sheet_width - x >= width else None
+
+
+def place_sprite(
+    shelves: List[List[Dict[str, int]]],
+    spans: Dict[Tuple[int, int], List[Tuple[int, int]]],
+    width: int,
+    height: int,
+    sheet_size: int
+) -> Tuple[int, int, int]:
+    """
+    Place a rectangle in the free space of a shelf layout, first fit.
+
+    Existing shelves that are tall enough are tried first, then a new shelf
+    below the last one of any sheet, then a new sheet. The layout is updated
+    in place.
+
+    Args:
+        shelves: Shelves ({"y", "height"}) of every sheet, top to bottom
+        spans: Occupied x ranges by (sheet index, shelf y)
+        width: Rectangle width, padding included
+        height: Rectangle height, padding included
+        sheet_size: Maximum sheet width and height
+
+    Returns:
+        Tuple of (sheet index, x, y)
+    """
+    for sheet, sheet_shelves in enumerate(shelves):
+        for shelf in sheet_shelves:
+            if shelf["height"] < height:
+                continue
+            shelf_spans = spans.setdefault((sheet, shelf["y"]), [])
+            x = find_shelf_gap(shelf_spans, width, sheet_size)
+            if x is not None:
+                shelf_spans.append((x, x + width))
+                return sheet, x, shelf["y"]
+
+    for sheet, sheet_shelves in enumerate(shelves):
+        bottom = max((shelf["y"] + shelf["height"] for shelf in sheet_shelves), default=0)
+        if bottom + height <= sheet_size:
+            break
+    else:
+        sheet, bottom = len(shelves), 0
+        shelves.append([])
+
+    shelves[sheet].append({"y": bottom, "height": height})
+    spans[(sheet, bottom)] = [(0, width)]
+    return sheet, 0, bottom
+
+
+def source_fingerprint(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Get the stat fields used to detect changed sources.
+
+    Args:
+        entry: File entry from scan_image_entries
+
+    Returns:
+        Dictionary with source_size and source_mtime
+    """
+    return {"source_size": entry["size_bytes"], "source_mtime": entry["mtime"]}
+
+
+def build_sprite_atlas(
+    image_entries: List[Dict[str, Any]],
+    output_directory: str,
+    name: str = "atlas",
+    thumb_size: int = 128,
+    sheet_size: int = 2048,
+    padding: int = 2
+) -> Dict[str, Any]:
+    """
+    Pack thumbnails of images into sprite sheets and write a JSON atlas.
+
+    If `<name>.json` already exists in the output directory (built with the same
+    thumb, sheet and padding sizes), the atlas is updated incrementally: unchanged
+    sprites keep their positions, only new or changed sources are decoded, and
+    sheets without changes are kept as they are.
+
+    Args:
+        image_entries: File entries (path, size_bytes, mtime) from scan_image_entries
+        output_directory: Directory for the sheets and atlas
+        name: Base name of the sheet files and atlas JSON
+        thumb_size: Maximum thumbnail width and height
+        sheet_size: Maximum sheet width and height
+        padding: Empty pixels between sprites
+
+    Returns:
+        Atlas dictionary (also written to `<name>.json`), with a "stats" entry
+        reporting how many thumbnails were decoded/reused and sheets written/kept
+
+    Raises:
+        ValueError: If two images share an atlas key (e.g. the same uuid) or a
+            thumbnail does not fit on a sheet
+    """
+    Image = get_image_module()
+    os.makedirs(output_directory, exist_ok=True)
+    atlas_path = os.path.join(output_directory, f"{name}.json")
+
+    entries: Dict[str, Dict[str, Any]] = {}
+    for entry in image_entries:
+        key = sprite_key(entry["path"])
+        if key in entries:
+            raise ValueError(f"'{entries[key]['path']}' and '{entry['path']}' share the atlas key '{key}'")
+        entries[key] = entry
+    fingerprints = {key: source_fingerprint(entry) for key, entry in entries.items()}
+
+    previous = load_json(atlas_path) if os.path.exists(atlas_path) else None
+    previous = previous if isinstance(previous, dict) else {}
+    compatible = (
+        previous.get("version") == ATLAS_VERSION
+        and previous.get("thumb_size") == thumb_size
+        and previous.get("sheet_size") == sheet_size
+        and previous.get("padding") == padding
+    )
+    previous_sheets = previous.get("sheets", []) if compatible else []
+    previous_sprites = previous.get("sprites", {}) if compatible else {}
+
+    # Unchanged sprites keep their place; the space of the others is freed
+    shelves = [[dict(shelf) for shelf in sheet.get("shelves", [])] for sheet in previous_sheets]
+    spans: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+    sprites: Dict[str, Dict[str, Any]] = {}
+    touched = set()
+    for key, sprite in previous_sprites.items():
+        try:
+            sheet_file = previous_sheets[sprite["sheet"]]["file"]
+            unchanged = (
+                key in fingerprints
+                and all(sprite[field] == value for field, value in fingerprints[key].items())
+                and sheet_file is not None
+                and os.path.exists(os.path.join(output_directory, sheet_file))
+            )
+        except (IndexError, KeyError, TypeError):
+            continue
+        if unchanged:
+            sprites[key] = sprite
+            spans.setdefault((sprite["sheet"], sprite["y"]), []).append(
+                (sprite["x"], sprite["x"] + sprite["width"] + padding)
+            )
+        else:
+            touched.add(sprite["sheet"])
+
+    # Emptied shelves at the bottom of a sheet give their space back to new shelves
+    for index, sheet_shelves in enumerate(shelves):
+        while sheet_shelves and not spans.get((index, sheet_shelves[-1]["y"])):
+            sheet_shelves.pop()
+
+    # Only new and changed sources are decoded (archive members in one pass)
+    thumbnails: Dict[str, "Image.Image"] = {}
+    missing = [entry for key, entry in entries.items() if key not in sprites]
+    for entry, fp in iter_entry_files(missing):
+        try:
+            thumbnails[sprite_key(entry["path"])] = make_thumbnail(fp, thumb_size, entry["name"])
+        except Exception:
+            # Skip files with errors
+            continue
+
+    # Tallest first, so shelves opened by new sprites are filled well
+    for key in sorted(thumbnails, key=lambda key: (-thumbnails[key].height, -thumbnails[key].width, key)):
+        width, height = thumbnails[key].size
+        if width + padding > sheet_size or height + padding > sheet_size:
+            raise ValueError(f"Sprite '{key}' ({width}x{height}) does not fit on a sheet")
+        sheet, x, y = place_sprite(shelves, spans, width + padding, height + padding, sheet_size)
+        touched.add(sheet)
+        sprites[key] = {
+            "filename": image_name(entries[key]["path"]),
+            "sheet": sheet,
+            "x": x,
+            "y": y,
+            "width": width,
+            "height": height,
+            **fingerprints[key],
+        }
+
+    sheet_members: Dict[int, Dict[str, Dict[str, Any]]] = {}
+    for key in sorted(sprites):
+        sheet_members.setdefault(sprites[key]["sheet"], {})[key] = sprites[key]
+
+    # Sheets left empty at the end are dropped; emptied sheets in between keep their index
+    while shelves and not sheet_members.get(len(shelves) - 1):
+        shelves.pop()
+
+    sheets = []
+    written = 0
+    for index, sheet_shelves in enumerate(shelves):
+        members = sheet_members.get(index, {})
+        filename = f"{name}_{index}.png"
+        sheet_path = os.path.join(output_directory, filename)
+        if not members:
+            sheets.append({"file": None, "width": 0, "height": 0, "signature": None, "shelves": sheet_shelves})
+            continue
+
+        sheet_width = max(sprite["x"] + sprite["width"] for sprite in members.values())
+        sheet_height = max(sprite["y"] + sprite["height"] for sprite in members.values())
+        signature = hashlib.sha1(
+            json.dumps([thumb_size, sheet_width, sheet_height, members], sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+        previous_sheet = previous_sheets[index] if index < len(previous_sheets) else {}
+        unchanged = (
+            index not in touched
+            and previous_sheet.get("signature") == signature
+            and os.path.exists(sheet_path)
+        )
+        if not unchanged:
+            canvas = Image.new("RGBA", (sheet_width, sheet_height), (0, 0, 0, 0))
+            kept = [key for key in members if key not in thumbnails]
+            if kept:
+                # Unchanged sprites are copied from the old sheet at the same position
+                with Image.open(os.path.join(output_directory, previous_sheet["file"])) as old_sheet:
+                    old_sheet = old_sheet.convert("RGBA")
+                for key in kept:
+                    sprite = members[key]
+                    box = (sprite["x"], sprite["y"], sprite["x"] + sprite["width"], sprite["y"] + sprite["height"])
+                    canvas.paste(old_sheet.crop(box), box[:2])
+            for key in members:
+                if key in thumbnails:
+                    canvas.paste(thumbnails.pop(key), (members[key]["x"], members[key]["y"]))
+            canvas.save(sheet_path, optimize=True)
+            written += 1
+
+        sheets.append({
+            "file": filename,
+            "width": sheet_width,
+            "height": sheet_height,
+            "signature": signature,
+            "shelves": sheet_shelves,
+        })
+
+    # Remove sheet files that are no longer part of the atlas
+    current_files = {sheet["file"] for sheet in sheets}
+    for stale in previous.get("sheets", []):
+        stale_file = stale.get("file") if isinstance(stale, dict) else None
+        if stale_file and stale_file not in current_files and os.path.isfile(os.path.join(output_directory, stale_file)):
+            os.remove(os.path.join(output_directory, stale_file))
+
+    atlas = {
+        "version": ATLAS_VERSION,
+        "thumb_size": thumb_size,
+        "sheet_size": sheet_size,
+        "padding": padding,
+        "sheets": sheets,
+        "sprites": {key: sprites[key] for key in sorted(sprites)},
+    }
+    save_json(atlas, atlas_path)
+
+    decoded = sum(1 for key in sprites if key not in previous_sprites or sprites[key] is not previous_sprites[key])
+    atlas["stats"] = {
+        "thumbnails_decoded": decoded,
+        "thumbnails_reused": len(sprites) - decoded,
+        "sheets_written": written,
+        "sheets_kept": sum(1 for sheet in sheets if sheet["file"] is not None) - written,
+    }
+    return atlas
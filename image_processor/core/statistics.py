@@ -0,0 +1,284 @@
+"""
+Statistics module with constant-memory, mergeable aggregators over image metadata.
+
+Aggregate state is a plain JSON-serializable dictionary, so partial results from
+parallel workers or shards can be saved, loaded and combined with merge_stats.
+Every aggregator merges exactly: counts and sums add up, histograms use fixed
+power-of-two buckets, quantiles come from a log-bucket sketch with bounded
+relative error, and top-k lists keep the k best entries of both sides.
+"""
+
+import math
+from typing import Any, Dict, Iterable, List, Optional
+
+STATS_VERSION = 1
+
+# Relative accuracy of quantile estimates (1%)
+QUANTILE_ACCURACY = 0.01
+QUANTILE_GAMMA = (1 + QUANTILE_ACCURACY) / (1 - QUANTILE_ACCURACY)
+
+REPORTED_QUANTILES = [0.5, 0.9, 0.99]
+
+# Numeric fields summarized with a histogram and quantile sketch
+NUMERIC_FIELDS = ["size_bytes", "width", "height", "megapixels"]
+
+
+def new_stats(top_k: int = 10) -> Dict[str, Any]:
+    """
+    Create an empty aggregate state.
+
+    Args:
+        top_k: Number of largest and oldest files to keep
+
+    Returns:
+        Aggregate state dictionary
+    """
+    return {
+        "version": STATS_VERSION,
+        "top_k": top_k,
+        "file_count": 0,
+        "error_count": 0,
+        "total_bytes": 0,
+        "formats": {},
+        "color_modes": {},
+        "numeric": {
+            field: {"histogram": {}, "sketch": {}, "zero_count": 0, "min": None, "max": None}
+            for field in NUMERIC_FIELDS
+        },
+        "largest": [],
+        "oldest": [],
+    }
+
+
+def _add_count(counts: Dict[str, int], key: Any) -> None:
+    """Increment a counter stored under a string key."""
+    key = str(key)
+    counts[key] = counts.get(key, 0) + 1
+
+
+def _add_numeric(summary: Dict[str, Any], value: float) -> None:
+    """Add one value to a numeric field's histogram, sketch and range."""
+    summary["min"] = value if summary["min"] is None else min(summary["min"], value)
+    summary["max"] = value if summary["max"] is None else max(summary["max"], value)
+
+    if value <= 0:
+        summary["zero_count"] += 1
+        _add_count(summary["histogram"], 0)
+        return
+
+    # Histogram bucket keyed by its power-of-two lower bound
+    _add_count(summary["histogram"], 2 ** math.floor(math.log2(value)))
+    _add_count(summary["sketch"], math.ceil(math.log(value, QUANTILE_GAMMA)))
+
+
+def _keep_top(entries: List[List[Any]], k: int, reverse: bool) -> List[List[Any]]:
+    """Keep the k first entries of a list of [sort value, path] pairs."""
+    return sorted(entries, key=lambda entry: (entry[0], entry[1]), reverse=reverse)[:k]
+
+
+def add_metadata(stats: Dict[str, Any], metadata: Dict[str, Any]) -> None:
+    """
+    Add one image's metadata to an aggregate state (in place).
+
+    Args:
+        stats: Aggregate state from new_stats
+        metadata: Metadata dictionary from extract_full_metadata
+    """
+    stats["file_count"] += 1
+    if "error" in metadata:
+        stats["error_count"] += 1
+
+    size = metadata.get("size_bytes")
+    path = metadata.get("path", metadata.get("filename", ""))
+    if size is not None:
+        stats["total_bytes"] += size
+        _add_numeric(stats["numeric"]["size_bytes"], size)
+        stats["largest"] = _keep_top(stats["largest"] + [[size, path]], stats["top_k"], reverse=True)
+
+    if metadata.get("modified_time"):
+        stats["oldest"] = _keep_top(stats["oldest"] + [[metadata["modified_time"], path]], stats["top_k"], reverse=False)
+
+    if "format" in metadata:
+        _add_count(stats["formats"], metadata["format"])
+    if "color_mode" in metadata:
+        _add_count(stats["color_modes"], metadata["color_mode"])
+
+    dimensions = metadata.get("dimensions")
+    if dimensions:
+        width, height = dimensions.get("width", 0), dimensions.get("height", 0)
+        _add_numeric(stats["numeric"]["width"], width)
+        _add_numeric(stats["numeric"]["height"], height)
+        _add_numeric(stats["numeric"]["megapixels"], width * height / 1_000_000)
+
+
+def _merge_counts(a: Dict[str, int], b: Dict[str, int]) -> Dict[str, int]:
+    """Add two counters together."""
+    merged = dict(a)
+    for key, count in b.items():
+        merged[key] = merged.get(key, 0) + count
+    return merged
+
+
+def _merge_optional(a: Optional[float], b: Optional[float], choose) -> Optional[float]:
+    """Combine two optional extremes with min or max."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return choose(a, b)
+
+
+def validate_stats(stats: Any) -> None:
+    """
+    Check that a loaded aggregate state has this version's layout.
+
+    Args:
+        stats: Aggregate state, e.g. a partial result loaded from JSON
+
+    Raises:
+        ValueError: If the state is from a different version or is missing fields
+    """
+    if not isinstance(stats, dict):
+        raise ValueError("Statistics must be a JSON object")
+    if stats.get("version") != STATS_VERSION:
+        raise ValueError(f"Cannot use statistics of version {stats.get('version')!r} (expected {STATS_VERSION})")
+
+    template = new_stats()
+    for field, empty in template.items():
+        if not isinstance(stats.get(field), type(empty)):
+            raise ValueError(f"Statistics field '{field}' is missing or has the wrong type")
+    for field, empty in template["numeric"].items():
+        summary = stats["numeric"].get(field)
+        if not isinstance(summary, dict) or not set(empty) <= set(summary):
+            raise ValueError(f"Statistics of numeric field '{field}' are missing or incomplete")
+
+
+def merge_stats(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Combine two aggregate states into a new one.
+
+    Args:
+        a: Aggregate state
+        b: Aggregate state
+
+    Returns:
+        Merged aggregate state; identical to aggregating both inputs in one pass
+
+    Raises:
+        ValueError: If a state is malformed, or the states have incompatible
+            versions or top_k settings
+    """
+    validate_stats(a)
+    validate_stats(b)
+    # A state with a smaller top_k has already dropped entries the other would keep
+    if a["top_k"] != b["top_k"]:
+        raise ValueError(f"Cannot merge statistics with different top_k ({a['top_k']} and {b['top_k']})")
+
+    top_k = a["top_k"]
+    numeric = {}
+    for field in NUMERIC_FIELDS:
+        left, right = a["numeric"][field], b["numeric"][field]
+        numeric[field] = {
+            "histogram": _merge_counts(left["histogram"], right["histogram"]),
+            "sketch": _merge_counts(left["sketch"], right["sketch"]),
+            "zero_count": left["zero_count"] + right["zero_count"],
+            "min": _merge_optional(left["min"], right["min"], min),
+            "max": _merge_optional(left["max"], right["max"], max),
+        }
+
+    return {
+        "version": STATS_VERSION,
+        "top_k": top_k,
+        "file_count": a["file_count"] + b["file_count"],
+        "error_count": a["error_count"] + b["error_count"],
+        "total_bytes": a["total_bytes"] + b["total_bytes"],
+        "formats": _merge_counts(a["formats"], b["formats"]),
+        "color_modes": _merge_counts(a["color_modes"], b["color_modes"]),
+        "numeric": numeric,
+        "largest": _keep_top(a["largest"] + b["largest"], top_k, reverse=True),
+        "oldest": _keep_top(a["oldest"] + b["oldest"], top_k, reverse=False),
+    }
+
+
+def estimate_quantile(summary: Dict[str, Any], quantile: float) -> Optional[float]:
+    """
+    Estimate a quantile from a numeric field's sketch.
+
+    Args:
+        summary: Numeric field summary from an aggregate state
+        quantile: Quantile between 0 and 1
+
+    Returns:
+        Estimated value (within QUANTILE_ACCURACY relative error), or None if empty
+    """
+    total = summary["zero_count"] + sum(summary["sketch"].values())
+    if total == 0:
+        return None
+
+    rank = quantile * (total - 1)
+    seen = summary["zero_count"]
+    if rank < seen:
+        return 0.0
+
+    for index in sorted(summary["sketch"], key=int):
+        seen += summary["sketch"][index]
+        if rank < seen:
+            estimate = 2 * QUANTILE_GAMMA ** int(index) / (QUANTILE_GAMMA + 1)
+            # Never report beyond the exact observed range
+            return min(max(estimate, summary["min"]), summary["max"])
+
+    return summary["max"]
+
+
+def summarize_stats(stats: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Turn an aggregate state into a human-readable report.
+
+    Args:
+        stats: Aggregate state
+
+    Returns:
+        Report dictionary with counts, totals, histograms, quantiles and top files
+    """
+    numeric = {}
+    for field, summary in stats["numeric"].items():
+        numeric[field] = {
+            "min": summary["min"],
+            "max": summary["max"],
+            "quantiles": {
+                f"p{round(q * 100)}": estimate_quantile(summary, q)
+                for q in REPORTED_QUANTILES
+            },
+            "histogram": {
+                bucket: summary["histogram"][bucket]
+                for bucket in sorted(summary["histogram"], key=float)
+            },
+        }
+
+    return {
+        "file_count": stats["file_count"],
+        "error_count": stats["error_count"],
+        "total_bytes": stats["total_bytes"],
+        "formats": dict(sorted(stats["formats"].items())),
+        "color_modes": dict(sorted(stats["color_modes"].items())),
+        "numeric": numeric,
+        "largest_files": [{"size_bytes": size, "path": path} for size, path in stats["largest"]],
+        "oldest_files": [{"modified_time": time, "path": path} for time, path in stats["oldest"]],
+    }
+
+
+def aggregate_metadata(records: Iterable[Dict[str, Any]], top_k: int = 10) -> Dict[str, Any]:
+    """
+    Aggregate a stream of metadata records in one pass.
+
+    Args:
+        records: Iterable of metadata dictionaries
+        top_k: Number of largest and oldest files to keep
+
+    Returns:
+        Aggregate state
+    """
+    stats = new_stats(top_k)
+    for metadata in records:
+        add_metadata(stats, metadata)
+    return stats
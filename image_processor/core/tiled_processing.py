@@ -0,0 +1,220 @@
+"""
+Tiled processing module for applying tile-local transforms to very large images.
+
+Images are processed in full-width horizontal strips sized from a memory budget,
+and the output is written incrementally, so peak memory depends on the budget
+rather than on the image size. Transforms must be tile-local (per-pixel color
+adjustments, point filters, channel operations): each strip is transformed on its
+own, without access to neighbouring rows. Strips always reach the transform in
+one of the modes the streaming PNG writer supports (L, LA, RGB or RGBA).
+"""
+
+from itertools import chain
+from typing import Any, Callable, Iterator, Optional, Tuple, TYPE_CHECKING
+
+from .image_loader import open_image_file
+from ..utils.file_ops import open_source_file
+from .png_stream import (
+    COLOR_TYPE_MODES,
+    MODE_COLOR_TYPES,
+    PALETTE_COLOR_TYPE,
+    is_streamable_png,
+    iter_png_strips,
+    read_png_header,
+    write_png_strips
+)
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+# Default memory budget for strip buffers (64 MiB)
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+
+# Copies of a strip alive at once: inflated data, decoded strip, transformed strip, encoded rows
+STRIP_COPIES = 4
+
+
+def strip_height_for_budget(width: int, bytes_per_pixel: int, memory_budget: int) -> int:
+    """
+    Compute how many rows fit in one strip under a memory budget.
+
+    Args:
+        width: Image width in pixels
+        bytes_per_pixel: Bytes per pixel of the decoded image
+        memory_budget: Maximum bytes to spend on strip buffers
+
+    Returns:
+        Number of rows per strip (at least 1)
+    """
+    row_bytes = max(1, width * bytes_per_pixel * STRIP_COPIES)
+    return max(1, memory_budget // row_bytes)
+
+
+def strip_mode(image: "Image.Image") -> str:
+    """
+    Pick the mode that strips of an image are converted to before the transform.
+
+    Palette and other color images become RGB, or RGBA if they carry any
+    transparency; bilevel and 16-bit grayscale images become L.
+
+    Args:
+        image: Image or strip to inspect
+
+    Returns:
+        One of L, LA, RGB or RGBA
+    """
+    mode = image.mode
+    if mode in MODE_COLOR_TYPES:
+        return mode
+    if mode in ("1", "F") or mode.startswith("I"):
+        return "L"
+    if mode == "La":
+        return "LA"
+
+    has_alpha = (
+        any(band in ("A", "a") for band in image.getbands())
+        or "transparency" in image.info
+        or (mode == "P" and image.palette is not None and image.palette.mode == "RGBA")
+    )
+    return "RGBA" if has_alpha else "RGB"
+
+
+def normalize_strip(strip: "Image.Image", mode: str) -> "Image.Image":
+    """
+    Convert a strip to the mode chosen by strip_mode.
+
+    Args:
+        strip: Strip to convert
+        mode: Target mode (L, LA, RGB or RGBA)
+
+    Returns:
+        The strip itself if it already has the mode, else a converted copy
+    """
+    if strip.mode == mode:
+        return strip
+    if strip.mode.startswith("I;16"):
+        # PIL clips rather than scales 16-bit values when converting to L
+        return strip.convert("I").point(lambda value: value / 256).convert("L")
+    return strip.convert(mode)
+
+
+def iter_image_strips(
+    source: Any,
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    filename: Optional[str] = None
+) -> Tuple[Tuple[int, int], Iterator["Image.Image"]]:
+    """
+    Open an image and iterate over it in horizontal strips.
+
+    Non-interlaced 8-bit and palette PNGs are decoded strip by strip without ever
+    holding the full image, and bypass PIL's decompression-bomb guard since memory
+    stays bounded. Other formats are decoded whole by PIL and then split into
+    strips. Every strip is converted to L, LA, RGB or RGBA (see strip_mode).
+
+    Args:
+        source: Path to the image file or a seekable binary file object (left open)
+        memory_budget: Maximum bytes to spend on strip buffers
+        filename: Name used to pick the plugin when source is a file object
+
+    Returns:
+        Tuple of ((width, height), iterator of strips)
+    """
+    owned = isinstance(source, str)
+    fp = open_source_file(source) if owned else source
+    try:
+        header = read_png_header(fp)
+    except Exception:
+        # A truncated signature or IHDR chunk
+        if owned:
+            fp.close()
+        raise
+
+    if is_streamable_png(header):
+        if header["color_type"] == PALETTE_COLOR_TYPE:
+            # Palette strips are converted to RGB or RGBA
+            bytes_per_pixel = 4
+        else:
+            _, bytes_per_pixel = COLOR_TYPE_MODES[header["color_type"]]
+        strip_height = strip_height_for_budget(header["width"], bytes_per_pixel, memory_budget)
+        size = (header["width"], header["height"])
+        strips = _iter_normalized_strips(iter_png_strips(fp, header, strip_height))
+        return size, _close_after(fp, strips) if owned else strips
+
+    if owned:
+        fp.close()
+        image = open_image_file(source)
+    else:
+        fp.seek(0)
+        image = open_image_file(fp, filename=filename)
+    strips = _iter_normalized_strips(_iter_loaded_strips(image, memory_budget))
+    return image.size, _close_after(image, strips)
+
+
+def _iter_loaded_strips(image: "Image.Image", memory_budget: int) -> Iterator["Image.Image"]:
+    """Split an image that PIL decodes in one piece into strips."""
+    width, height = image.size
+    _, converted_bytes_per_pixel = COLOR_TYPE_MODES[MODE_COLOR_TYPES[strip_mode(image)]]
+    bytes_per_pixel = max(len(image.getbands()), converted_bytes_per_pixel)
+    strip_height = strip_height_for_budget(width, bytes_per_pixel, memory_budget)
+
+    for top in range(0, height, strip_height):
+        yield image.crop((0, top, width, min(top + strip_height, height)))
+
+
+def _iter_normalized_strips(strips: Iterator["Image.Image"]) -> Iterator["Image.Image"]:
+    """Convert strips to the mode picked from the first one, so all strips agree."""
+    mode = None
+    for strip in strips:
+        if mode is None:
+            mode = strip_mode(strip)
+        yield normalize_strip(strip, mode)
+
+
+def _close_after(resource, strips: Iterator["Image.Image"]) -> Iterator["Image.Image"]:
+    """Close a file or image once its strips are exhausted or abandoned."""
+    try:
+        yield from strips
+    finally:
+        resource.close()
+
+
+def process_image_in_strips(
+    source: Any,
+    output_path: str,
+    transform_fn: Callable[["Image.Image"], "Image.Image"],
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    filename: Optional[str] = None
+) -> bool:
+    """
+    Apply a tile-local transform strip by strip and stream the result to a PNG.
+
+    Strips reach the transform as L, LA, RGB or RGBA (palette, CMYK, bilevel and
+    16-bit sources are converted first). The transform must keep the strip size
+    unchanged; it may change the mode to any of L, LA, RGB or RGBA as long as it
+    does so consistently.
+
+    Args:
+        source: Path to the source image or a seekable binary file object (left open)
+        output_path: Path of the PNG to write
+        transform_fn: Function applied to each strip
+        memory_budget: Maximum bytes to spend on strip buffers
+        filename: Name used to pick the plugin when source is a file object
+
+    Returns:
+        True if successful
+
+    Raises:
+        ValueError: If a transformed strip changes size or has an unsupported mode
+    """
+    (width, height), strips = iter_image_strips(source, memory_budget, filename)
+
+    transformed = (transform_fn(strip) for strip in strips)
+    first = next(transformed, None)
+    if first is None:
+        return False
+
+    with open(output_path, "wb") as output_file:
+        write_png_strips(output_file, width, height, first.mode, chain([first], transformed))
+
+    return True
@@ -0,0 +1,595 @@
+"""
+Content-addressed memoization of transformation outputs.
+
+A cached output is keyed by the SHA-256 of the input bytes, the identity of the
+transform (its code and everything it closes over or references, plus an
+optional version) and the encoder settings (output format, save options and
+Pillow version). Outputs live in a store directory under
+`objects/<key[:2]>/<key><ext>` and are hard-linked (or
+copied across filesystems) to the requested output paths, so unchanged inputs
+through unchanged transforms are never decoded or re-encoded.
+
+The index records the SHA-256 of every object, which is checked before the
+object is reused: an object that was rewritten in place through one of its
+links is dropped and recomputed instead of being served. Input hashes are
+remembered per size and mtime, and the store is trimmed to a byte budget by
+evicting the least recently used objects, in the order kept in the index (the
+mtime of an object is shared with every output linked to it, so it is left alone).
+"""
+
+import enum
+import functools
+import hashlib
+import importlib
+import os
+import sys
+import sysconfig
+import time
+import types
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+from ..utils.file_ops import load_json, open_source_file, save_json, write_file_atomically
+
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+INDEX_FILENAME = "index.json"
+
+
+# Plain values whose repr is stable across runs
+STABLE_SCALARS = (type(None), bool, int, float, complex, str, bytes)
+
+# Nesting limit when hashing transform state
+MAX_STATE_DEPTH = 32
+
+
+class UnstableTransformError(ValueError):
+    """Raised when part of a transform's state cannot be hashed stably."""
+
+
+def _code_digest(code: Any, digest: "hashlib._Hash") -> None:
+    """Feed a code object's bytecode and constants (recursively) into a digest."""
+    digest.update(code.co_code)
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            _code_digest(const, digest)
+        else:
+            digest.update(repr(const).encode("utf-8"))
+    digest.update(repr(code.co_names).encode("utf-8"))
+
+
+def _referenced_names(code: Any) -> List[str]:
+    """Collect the global and attribute names used by a code object and its nested code."""
+    names = list(code.co_names)
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            names.extend(_referenced_names(const))
+    return sorted(set(names))
+
+
+@functools.lru_cache(maxsize=None)
+def _library_directories() -> Tuple[str, ...]:
+    """Directories of the standard library and installed packages."""
+    paths = sysconfig.get_paths()
+    return tuple(sorted({
+        os.path.join(os.path.realpath(paths[name]), "")
+        for name in ("stdlib", "platstdlib", "purelib", "platlib")
+        if name in paths
+    }))
+
+
+def _is_library_module(module_name: Optional[str]) -> bool:
+    """Check whether a module is built in or installed rather than part of the caller's code."""
+    module = sys.modules.get(module_name or "")
+    if module is None:
+        return False
+    path = getattr(module, "__file__", None)
+    if path is None:
+        return True
+    return os.path.realpath(path).startswith(_library_directories())
+
+
+def _library_version(module_name: str) -> str:
+    """Version of the top-level package a library module belongs to."""
+    package = sys.modules.get(module_name.split(".")[0])
+    return str(getattr(package, "__version__", ""))
+
+
+def _module_attributes_digest(
+    module: types.ModuleType,
+    names: List[str],
+    digest: "hashlib._Hash",
+    seen: Dict[Any, int],
+    depth: int
+) -> None:
+    """Feed the attributes of a project module that a function may access into a digest."""
+    marker = ("attributes", id(module))
+    if marker in seen:
+        return
+    seen[marker] = len(seen)
+
+    namespace = vars(module)
+    for name in names:
+        if name not in namespace:
+            continue
+        attribute = namespace[name]
+        digest.update(f"attribute:{module.__name__}.{name}\0".encode("utf-8"))
+        if isinstance(attribute, types.ModuleType) and not _is_library_module(attribute.__name__):
+            # Reached as module.submodule.name
+            _module_attributes_digest(attribute, names, digest, seen, depth + 1)
+        else:
+            _state_digest(attribute, digest, seen, depth + 1)
+
+
+def _state_digest(value: Any, digest: "hashlib._Hash", seen: Dict[Any, int], depth: int = 0) -> None:
+    """
+    Feed a stable description of a value (and everything it depends on) into a digest.
+
+    Functions contribute their code, defaults, closure cells and referenced
+    globals, including attributes they may access on modules of the caller's
+    code; bound methods and callable objects their function and instance
+    state. Modules, functions and classes of the standard library and
+    installed packages contribute only their name and package version.
+
+    Raises:
+        UnstableTransformError: If a value has no stable description
+    """
+    update = lambda text: digest.update(f"{text}\0".encode("utf-8"))
+
+    if isinstance(value, STABLE_SCALARS):
+        update(f"{type(value).__name__}:{value!r}")
+        return
+    if depth > MAX_STATE_DEPTH:
+        raise UnstableTransformError("Transform state is nested too deeply to hash")
+    if id(value) in seen:
+        # Cycles (e.g. a recursive function referring to itself) are described by position
+        update(f"ref:{seen[id(value)]}")
+        return
+    seen[id(value)] = len(seen)
+    depth += 1
+
+    if isinstance(value, types.ModuleType):
+        module_name = value.__name__
+    elif isinstance(value, (types.FunctionType, type)):
+        module_name = value.__module__
+    else:
+        module_name = None
+    if module_name is not None and _is_library_module(module_name):
+        name = getattr(value, "__qualname__", "")
+        update(f"library:{module_name}.{name}@{_library_version(module_name)}")
+        return
+
+    if isinstance(value, (tuple, list)):
+        update(f"{type(value).__name__}:{len(value)}")
+        for item in value:
+            _state_digest(item, digest, seen, depth)
+    elif isinstance(value, dict):
+        update(f"dict:{len(value)}")
+        for key in sorted(value, key=repr):
+            _state_digest(key, digest, seen, depth)
+            _state_digest(value[key], digest, seen, depth)
+    elif isinstance(value, (set, frozenset)):
+        update(f"set:{len(value)}")
+        for item in sorted(value, key=repr):
+            _state_digest(item, digest, seen, depth)
+    elif isinstance(value, enum.Enum):
+        update(f"enum:{type(value).__module__}.{type(value).__qualname__}.{value.name}")
+    elif isinstance(value, types.ModuleType):
+        # Attributes are described by the functions that access them
+        update(f"module:{value.__name__}")
+    elif isinstance(value, functools.partial):
+        update("partial")
+        _state_digest(value.func, digest, seen, depth)
+        _state_digest(value.args, digest, seen, depth)
+        _state_digest(value.keywords, digest, seen, depth)
+    elif isinstance(value, types.FunctionType):
+        update(f"function:{value.__module__}.{value.__qualname__}")
+        _code_digest(value.__code__, digest)
+        _state_digest(value.__defaults__, digest, seen, depth)
+        _state_digest(value.__kwdefaults__, digest, seen, depth)
+        cells = value.__closure__ or ()
+        try:
+            contents = [cell.cell_contents for cell in cells]
+        except ValueError:
+            raise UnstableTransformError(f"'{value.__qualname__}' has an unbound closure variable")
+        _state_digest(contents, digest, seen, depth)
+        names = _referenced_names(value.__code__)
+        for name in names:
+            if name in value.__globals__:
+                update(f"global:{name}")
+                referenced = value.__globals__[name]
+                _state_digest(referenced, digest, seen, depth)
+                if isinstance(referenced, types.ModuleType) and not _is_library_module(referenced.__name__):
+                    _module_attributes_digest(referenced, names, digest, seen, depth)
+    elif isinstance(value, types.MethodType):
+        update("method")
+        _state_digest(value.__func__, digest, seen, depth)
+        _state_digest(value.__self__, digest, seen, depth)
+    elif isinstance(value, types.BuiltinFunctionType):
+        update(f"builtin:{getattr(value, '__module__', None)}.{value.__qualname__}")
+        owner = value.__self__
+        if owner is not None and not isinstance(owner, types.ModuleType):
+            _state_digest(owner, digest, seen, depth)
+    elif isinstance(value, type):
+        update(f"class:{value.__module__}.{value.__qualname__}")
+        for name, attribute in sorted(vars(value).items()):
+            if isinstance(attribute, (types.FunctionType, staticmethod, classmethod)):
+                update(f"attribute:{name}")
+                _state_digest(getattr(attribute, "__func__", attribute), digest, seen, depth)
+    elif hasattr(value, "__dict__") or hasattr(type(value), "__slots__"):
+        # Instances (callable objects included): their class and their attribute values
+        _state_digest(type(value), digest, seen, depth)
+        state = dict(getattr(value, "__dict__", {}))
+        for klass in type(value).__mro__:
+            for slot in getattr(klass, "__slots__", ()):
+                if hasattr(value, slot):
+                    state[slot] = getattr(value, slot)
+        _state_digest(state, digest, seen, depth)
+    else:
+        raise UnstableTransformError(f"Cannot hash a value of type '{type(value).__qualname__}' stably")
+
+
+def transform_identity(transform_fn: Callable[..., Any], version: Optional[str] = None) -> str:
+    """
+    Describe a transform so that changing its code, state or version changes the description.
+
+    The description covers the function's code, defaults, closure cells and
+    the globals it references (recursively, including functions reached as
+    attributes of the caller's own modules), partial arguments, and the
+    instance state of bound methods and callable objects. Code from the
+    standard library and installed packages is identified by name and package
+    version only. An explicit version (or a `version` attribute on the
+    transform) additionally lets callers invalidate outputs when behavior
+    changes in ways this cannot show, such as a library upgrade that keeps its
+    version or data files read by the transform.
+
+    Args:
+        transform_fn: Transformation function
+        version: Optional version string of the transform
+
+    Returns:
+        Identity string
+
+    Raises:
+        UnstableTransformError: If part of the transform cannot be hashed stably
+            and no version is given
+    """
+    if version is None:
+        version = getattr(transform_fn, "version", None)
+
+    digest = hashlib.sha256()
+    try:
+        _state_digest(transform_fn, digest, {})
+        state = digest.hexdigest()
+    except UnstableTransformError as e:
+        if version is None:
+            raise UnstableTransformError(f"{e}; pass transform_version to cache this transform")
+        # The caller vouches for the transform through its version
+        state = "unhashed"
+
+    name = getattr(transform_fn, "__qualname__", type(transform_fn).__qualname__)
+    parts = [f"{getattr(transform_fn, '__module__', '')}.{name}", state]
+    if version is not None:
+        parts.append(f"v{version}")
+
+    return "|".join(parts)
+
+
+def encoder_settings(output_ext: str, save_options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Collect the settings that determine the encoded output bytes.
+
+    Args:
+        output_ext: Output file extension (including the dot)
+        save_options: Keyword arguments passed to Image.save
+
+    Returns:
+        Dictionary with format, options and Pillow version
+    """
+    return {
+        "format": output_ext.lower(),
+        "options": sorted((save_options or {}).items()),
+        "pillow": importlib.import_module("PIL").__version__,
+    }
+
+
+def make_cache_key(input_hash: str, identity: str, settings: Dict[str, Any]) -> str:
+    """
+    Combine input hash, transform identity and encoder settings into a cache key.
+
+    Args:
+        input_hash: SHA-256 hex digest of the input bytes
+        identity: Transform identity from transform_identity
+        settings: Encoder settings from encoder_settings
+
+    Returns:
+        SHA-256 hex digest
+    """
+    material = f"{CACHE_VERSION}\n{input_hash}\n{identity}\n{settings!r}"
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def hash_file(file_path: str) -> str:
+    """
+    Compute the SHA-256 of a file (or archive member) in chunks.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        Hex digest
+    """
+    with open_source_file(file_path) as f:
+        return hash_stream(f)
+
+
+def hash_stream(fp: BinaryIO) -> str:
+    """
+    Compute the SHA-256 of the rest of a binary file object in chunks.
+
+    Args:
+        fp: Readable binary file object
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: fp.read(HASH_CHUNK_SIZE), b""):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def open_transform_cache(cache_directory: str, max_bytes: int = DEFAULT_CACHE_MAX_BYTES) -> Dict[str, Any]:
+    """
+    Open (or create) a transformation output store.
+
+    Args:
+        cache_directory: Directory of the store
+        max_bytes: Size cap of the stored objects
+
+    Returns:
+        Cache state dictionary
+    """
+    os.makedirs(os.path.join(cache_directory, "objects"), exist_ok=True)
+    index = load_json(os.path.join(cache_directory, INDEX_FILENAME))
+    if not isinstance(index, dict) or index.get("version") != CACHE_VERSION:
+        index = {"version": CACHE_VERSION, "input_hashes": {}}
+    # Key -> {"sha256", "last_used"} of every object written through the index
+    index.setdefault("objects", {})
+
+    return {
+        "directory": cache_directory,
+        "max_bytes": max_bytes,
+        "index": index,
+        "hits": 0,
+        "misses": 0,
+    }
+
+
+def remembered_input_hash(cache: Dict[str, Any], file_path: str, size: int, mtime: float) -> Optional[str]:
+    """
+    Get the remembered content hash of an input if its size and mtime still match.
+
+    Args:
+        cache: Cache state from open_transform_cache
+        file_path: Path to the input
+        size: Input size in bytes
+        mtime: Input modification time
+
+    Returns:
+        SHA-256 hex digest, or None if the input has to be hashed
+    """
+    remembered = cache["index"]["input_hashes"].get(file_path)
+    if remembered and remembered["size"] == size and remembered["mtime"] == mtime:
+        return remembered["sha256"]
+    return None
+
+
+def get_input_hash(
+    cache: Dict[str, Any],
+    file_path: str,
+    size: int,
+    mtime: float,
+    fp: Optional[BinaryIO] = None
+) -> str:
+    """
+    Get the content hash of an input, reusing the remembered one while size and mtime match.
+
+    Args:
+        cache: Cache state from open_transform_cache
+        file_path: Path to the input
+        size: Input size in bytes
+        mtime: Input modification time
+        fp: Already open binary file object of the input, read from its current position
+
+    Returns:
+        SHA-256 hex digest
+    """
+    input_hash = remembered_input_hash(cache, file_path, size, mtime)
+    if input_hash is not None:
+        return input_hash
+
+    input_hash = hash_stream(fp) if fp is not None else hash_file(file_path)
+    cache["index"]["input_hashes"][file_path] = {"size": size, "mtime": mtime, "sha256": input_hash}
+    return input_hash
+
+
+def object_path(cache: Dict[str, Any], key: str, output_ext: str) -> str:
+    """
+    Get the store path of a cached output.
+
+    Args:
+        cache: Cache state
+        key: Cache key
+        output_ext: Output file extension
+
+    Returns:
+        Path inside the store
+    """
+    return os.path.join(cache["directory"], "objects", key[:2], f"{key}{output_ext.lower()}")
+
+
+def materialize(stored_path: str, output_path: str) -> None:
+    """
+    Place a stored object at an output path, hard-linking when possible.
+
+    Args:
+        stored_path: Path of the object in the store
+        output_path: Requested output path
+    """
+    if os.path.exists(output_path):
+        if os.path.samefile(stored_path, output_path):
+            return
+        os.remove(output_path)
+
+    try:
+        os.link(stored_path, output_path)
+    except OSError:
+        # Different filesystem (or no hard link support): fall back to a copy
+        import shutil
+        shutil.copyfile(stored_path, output_path)
+
+
+def restore_cached(cache: Dict[str, Any], key: str, output_path: str) -> bool:
+    """
+    Link a stored output to the output path if the store has an intact copy.
+
+    Args:
+        cache: Cache state
+        key: Cache key from make_cache_key
+        output_path: Requested output path
+
+    Returns:
+        True if the output came from the store
+    """
+    stored_path = object_path(cache, key, os.path.splitext(output_path)[1])
+    recorded = cache["index"]["objects"].get(key)
+    if recorded is None or not os.path.exists(stored_path):
+        return False
+
+    if hash_file(stored_path) != recorded["sha256"]:
+        # Rewritten in place through a linked output: drop it so it is recomputed
+        os.remove(stored_path)
+        del cache["index"]["objects"][key]
+        return False
+
+    recorded["last_used"] = time.time()
+    materialize(stored_path, output_path)
+    cache["hits"] += 1
+    return True
+
+
+def cached_transform(
+    cache: Dict[str, Any],
+    key: str,
+    output_path: str,
+    produce: Callable[[str], None]
+) -> bool:
+    """
+    Write a transformation output through the store.
+
+    On a hit the stored object is linked to the output path; on a miss `produce`
+    writes the output into a temporary file in the store first.
+
+    Args:
+        cache: Cache state
+        key: Cache key from make_cache_key
+        output_path: Requested output path
+        produce: Function that encodes the output to the path it is given
+
+    Returns:
+        True if the output came from the store, False if it was computed
+    """
+    if restore_cached(cache, key, output_path):
+        return True
+
+    stored_path = object_path(cache, key, os.path.splitext(output_path)[1])
+    os.makedirs(os.path.dirname(stored_path), exist_ok=True)
+    recorded = {}
+
+    def produce_and_hash(path: str) -> None:
+        produce(path)
+        recorded["sha256"] = hash_file(path)
+
+    write_file_atomically(stored_path, produce_and_hash)
+    cache["index"]["objects"][key] = {"sha256": recorded["sha256"], "last_used": time.time()}
+
+    materialize(stored_path, output_path)
+    cache["misses"] += 1
+    return False
+
+
+def list_cached_objects(cache_directory: str) -> List[Tuple[str, int, str]]:
+    """
+    List the objects in a store.
+
+    Args:
+        cache_directory: Directory of the store
+
+    Returns:
+        List of (key, size, path) tuples
+    """
+    objects = []
+    for root, _, files in os.walk(os.path.join(cache_directory, "objects")):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                size = os.stat(path).st_size
+            except OSError:
+                continue
+            objects.append((name.split(".", 1)[0], size, path))
+    return objects
+
+
+def evict_cached_objects(cache: Dict[str, Any]) -> int:
+    """
+    Delete least recently used objects until the store fits its size cap.
+
+    Objects missing from the index (e.g. left over from an interrupted run)
+    go first. Outputs that were hard-linked elsewhere keep their data; only the
+    store's link is removed.
+
+    Args:
+        cache: Cache state
+
+    Returns:
+        Number of objects evicted
+    """
+    recorded = cache["index"]["objects"]
+    objects = sorted(
+        list_cached_objects(cache["directory"]),
+        key=lambda item: recorded.get(item[0], {}).get("last_used", 0.0)
+    )
+    total = sum(size for _, size, _ in objects)
+    evicted = 0
+
+    for key, size, path in objects:
+        if total <= cache["max_bytes"]:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        recorded.pop(key, None)
+        total -= size
+        evicted += 1
+
+    return evicted
+
+
+def close_transform_cache(cache: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Enforce the size cap, save the index and report cache activity.
+
+    Args:
+        cache: Cache state
+
+    Returns:
+        Dictionary with hits, misses and evicted counts
+    """
+    evicted = evict_cached_objects(cache)
+    save_json(cache["index"], os.path.join(cache["directory"], INDEX_FILENAME))
+    return {"hits": cache["hits"], "misses": cache["misses"], "evicted": evicted}
@@ -0,0 +1,181 @@
+"""
+Transform graph module with pure functions for decode-once, multi-output processing.
+
+A graph is a dictionary mapping node names to node dictionaries created with
+`make_transform_node`. Each node applies a transform to the decoded source image
+("source") or to the result of another node, so shared intermediate steps are
+computed once per image and every derivative is produced from a single decode.
+"""
+
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+# Name under which the decoded source image is available to nodes
+SOURCE_NODE = "source"
+
+
+def make_transform_node(
+    transform_fn: Callable[["Image.Image"], "Image.Image"],
+    input_node: str = SOURCE_NODE,
+    suffix: Optional[str] = None,
+    extension: Optional[str] = None,
+    save_options: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Create a transform graph node.
+
+    The transform must return a new image rather than modify its input in place,
+    since the input may be shared with other nodes.
+
+    Args:
+        transform_fn: Function applied to the input node's image
+        input_node: Name of the node whose result feeds this one ("source" for the decoded image)
+        suffix: Suffix added to output filenames; None makes this an intermediate-only node
+        extension: Output file extension (e.g. ".webp"); defaults to the source extension
+        save_options: Keyword arguments passed to PIL's Image.save (quality, optimize, ...)
+
+    Returns:
+        Node dictionary
+    """
+    return {
+        "transform_fn": transform_fn,
+        "input": input_node,
+        "suffix": suffix,
+        "extension": extension,
+        "save_options": dict(save_options or {}),
+    }
+
+
+def check_output_names(graph: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Check that no two output nodes can write the same file for an image.
+
+    Output names are the source name plus the node's suffix and extension, so
+    nodes collide when they share a suffix and their extensions match (ignoring
+    case). A node without an extension keeps the source's, which may be any
+    extension, so it collides with every other node of the same suffix.
+
+    Args:
+        graph: Mapping of node names to node dictionaries
+
+    Raises:
+        ValueError: If two output nodes can produce the same output name
+    """
+    # Suffix -> (lowercased extension or None, node name) of the outputs seen so far
+    outputs: Dict[str, List[Tuple[Optional[str], str]]] = {}
+    for name, node in graph.items():
+        if node["suffix"] is None:
+            continue
+        extension = node["extension"].lower() if node["extension"] else None
+        for other_extension, other in outputs.get(node["suffix"], []):
+            if extension is None or other_extension is None or extension == other_extension:
+                raise ValueError(
+                    f"Transform nodes '{other}' and '{name}' can write the same output "
+                    f"(suffix '{node['suffix']}'); give them different suffixes or extensions"
+                )
+        outputs.setdefault(node["suffix"], []).append((extension, name))
+
+
+def resolve_transform_order(graph: Dict[str, Dict[str, Any]]) -> List[str]:
+    """
+    Topologically sort the nodes of a transform graph.
+
+    Also validates the graph, including that output names are unique (see
+    check_output_names).
+
+    Args:
+        graph: Mapping of node names to node dictionaries
+
+    Returns:
+        Node names in an order where every node follows its input
+
+    Raises:
+        ValueError: If a node references an unknown input, the graph has a cycle,
+            or two output nodes can write the same file
+    """
+    if SOURCE_NODE in graph:
+        raise ValueError(f"'{SOURCE_NODE}' is reserved for the decoded source image")
+    check_output_names(graph)
+
+    order: List[str] = []
+    state: Dict[str, str] = {}
+
+    for start in graph:
+        # Walk up the input chain until reaching a resolved node or the source
+        chain = []
+        name = start
+        while name != SOURCE_NODE and state.get(name) != "done":
+            if name not in graph:
+                raise ValueError(f"Transform node '{chain[-1]}' has unknown input '{name}'")
+            if state.get(name) == "visiting":
+                raise ValueError(f"Transform graph has a cycle through '{name}'")
+            state[name] = "visiting"
+            chain.append(name)
+            name = graph[name]["input"]
+
+        for name in reversed(chain):
+            state[name] = "done"
+            order.append(name)
+
+    return order
+
+
+def count_consumers(graph: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Count how many nodes read each node's result.
+
+    Args:
+        graph: Mapping of node names to node dictionaries
+
+    Returns:
+        Mapping of node name (including "source") to number of consumers
+    """
+    consumers = {name: 0 for name in graph}
+    consumers[SOURCE_NODE] = 0
+    for node in graph.values():
+        consumers[node["input"]] += 1
+    return consumers
+
+
+def iter_transform_graph(
+    image: "Image.Image",
+    graph: Dict[str, Dict[str, Any]],
+    order: Optional[List[str]] = None
+) -> Iterator[Tuple[str, "Image.Image"]]:
+    """
+    Run a transform graph on one decoded image.
+
+    Each node is computed exactly once; intermediate results are released as soon
+    as their last consumer has run.
+
+    Args:
+        image: Decoded source image
+        graph: Mapping of node names to node dictionaries
+        order: Precomputed result of resolve_transform_order (optional)
+
+    Returns:
+        Iterator of (node name, result image) for every node with an output suffix
+    """
+    if order is None:
+        order = resolve_transform_order(graph)
+
+    remaining = count_consumers(graph)
+    results: Dict[str, "Image.Image"] = {SOURCE_NODE: image}
+
+    for name in order:
+        node = graph[name]
+        input_name = node["input"]
+        result = node["transform_fn"](results[input_name])
+
+        remaining[input_name] -= 1
+        if remaining[input_name] == 0 and input_name != SOURCE_NODE:
+            del results[input_name]
+
+        if remaining[name] > 0:
+            results[name] = result
+
+        if node["suffix"] is not None:
+            yield name, result
@@ -0,0 +1,306 @@
+"""
+Archive utility module for treating zip and tar archives as virtual directories.
+
+Image members are addressed with virtual paths of the form
+`<archive path>!/<member name>` and are streamed straight out of the archive
+without temporary files. Zip members are opened by random access; tar archives
+are read in a single sequential pass when iterating, and through a cached
+member index for individual lookups. Compressed tars have no random access:
+opening one member decompresses the archive up to that member, so anything
+that reads many members goes through iter_archive_images instead.
+
+Truncated or corrupt archives do not abort a whole pass: members that cannot
+be read are still yielded, with a stand-in file object that raises the
+archive's error when read, so callers record them like any unreadable file.
+"""
+
+import io
+import os
+import tarfile
+import time
+import zipfile
+import zlib
+from functools import lru_cache
+from typing import Any, BinaryIO, Collection, Dict, Iterator, List, Optional, Tuple
+
+from .file_ops import (
+    ARCHIVE_MEMBER_SEPARATOR,
+    IMAGE_EXTENSIONS,
+    ZIP_SUFFIXES,
+    image_name,
+    split_member_path
+)
+
+# Errors raised while reading truncated or corrupt archives
+ARCHIVE_ERRORS = (OSError, EOFError, zlib.error, zipfile.BadZipFile, tarfile.TarError)
+try:
+    import lzma
+    ARCHIVE_ERRORS += (lzma.LZMAError,)
+except ImportError:
+    pass
+
+
+class UnreadableMember(io.RawIOBase):
+    """
+    Stand-in file object for an archive member that could not be read.
+
+    Seeking is allowed, but every read raises an OSError describing the
+    archive error, so callers handle the member like any unreadable file.
+    """
+
+    def __init__(self, error: Exception):
+        super().__init__()
+        self.error = error
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return 0
+
+    def readinto(self, buffer) -> int:
+        raise OSError(f"Cannot read archive member: {self.error}")
+
+
+def make_member_path(archive_path: str, member_name: str) -> str:
+    """
+    Build the virtual path of an archive member.
+
+    Args:
+        archive_path: Path to the archive
+        member_name: Name of the member inside the archive
+
+    Returns:
+        Virtual path
+    """
+    return f"{os.path.abspath(archive_path)}{ARCHIVE_MEMBER_SEPARATOR}{member_name}"
+
+
+def is_image_member(member_name: str) -> bool:
+    """
+    Check whether an archive member looks like an image by its extension.
+
+    Args:
+        member_name: Name of the member inside the archive
+
+    Returns:
+        True if the extension is a known image extension
+    """
+    return os.path.splitext(member_name.lower())[1].lstrip(".") in IMAGE_EXTENSIONS
+
+
+def _zip_entry(archive_path: str, info: zipfile.ZipInfo) -> Dict[str, Any]:
+    """Describe a zip member as a file entry."""
+    return {
+        "path": make_member_path(archive_path, info.filename),
+        "name": image_name(make_member_path(archive_path, info.filename)),
+        "archive_path": os.path.abspath(archive_path),
+        "member_path": info.filename,
+        "size_bytes": info.file_size,
+        "mtime": _zip_mtime(info),
+    }
+
+
+def _zip_mtime(info: zipfile.ZipInfo) -> float:
+    """Convert a zip member's DOS timestamp to a POSIX timestamp."""
+    return time.mktime(info.date_time + (0, 0, -1))
+
+
+def _tar_entry(archive_path: str, info: tarfile.TarInfo) -> Dict[str, Any]:
+    """Describe a tar member as a file entry."""
+    return {
+        "path": make_member_path(archive_path, info.name),
+        "name": image_name(make_member_path(archive_path, info.name)),
+        "archive_path": os.path.abspath(archive_path),
+        "member_path": info.name,
+        "size_bytes": info.size,
+        "mtime": float(info.mtime),
+    }
+
+
+@lru_cache(maxsize=8)
+def _tar_index(archive_path: str, archive_mtime: float) -> Dict[str, tarfile.TarInfo]:
+    """
+    Read and cache the member headers of a tar archive (keyed on its mtime).
+
+    A truncated or corrupt archive keeps the members whose headers could be read.
+    """
+    members = {}
+    with tarfile.open(archive_path, "r:*") as archive:
+        try:
+            for info in archive:
+                if info.isfile():
+                    members[info.name] = info
+        except ARCHIVE_ERRORS:
+            pass
+    return members
+
+
+def _get_tar_index(archive_path: str) -> Dict[str, tarfile.TarInfo]:
+    """Get the cached member index of a tar archive."""
+    archive_path = os.path.abspath(archive_path)
+    return _tar_index(archive_path, os.stat(archive_path).st_mtime)
+
+
+def list_archive_entries(archive_path: str) -> List[Dict[str, Any]]:
+    """
+    List the image members of an archive with their sizes and timestamps.
+
+    Args:
+        archive_path: Path to a zip or tar archive
+
+    Returns:
+        List of entries with path, name, archive_path, member_path, size_bytes and mtime
+    """
+    try:
+        if archive_path.lower().endswith(ZIP_SUFFIXES):
+            with zipfile.ZipFile(archive_path) as archive:
+                return [
+                    _zip_entry(archive_path, info)
+                    for info in archive.infolist()
+                    if not info.is_dir() and is_image_member(info.filename)
+                ]
+
+        return [
+            _tar_entry(archive_path, info)
+            for info in _get_tar_index(archive_path).values()
+            if is_image_member(info.name)
+        ]
+    except ARCHIVE_ERRORS:
+        return []
+
+
+def supports_random_access(archive_path: str) -> bool:
+    """
+    Check whether single members of an archive can be opened without reading the ones before them.
+
+    Args:
+        archive_path: Path to a zip or tar archive
+
+    Returns:
+        True for zip archives and uncompressed tars, False for compressed tars
+    """
+    lowered = archive_path.lower()
+    return lowered.endswith(ZIP_SUFFIXES) or lowered.endswith(".tar")
+
+
+def iter_archive_images(
+    archive_path: str,
+    member_names: Optional[Collection[str]] = None
+) -> Iterator[Tuple[Dict[str, Any], BinaryIO]]:
+    """
+    Iterate over the image members of an archive in one pass.
+
+    Tar archives (including compressed ones) are read as a stream, so every
+    member is visited exactly once in archive order. Each yielded file object
+    is only valid until the next iteration. Members that cannot be read
+    because the archive is truncated or corrupt are yielded with an
+    UnreadableMember (after the readable ones, for tars).
+
+    Args:
+        archive_path: Path to a zip or tar archive
+        member_names: Names of the members to read (default: all images)
+
+    Returns:
+        Iterator of (entry, readable and seekable binary file object)
+    """
+    def wanted(name: str) -> bool:
+        return is_image_member(name) if member_names is None else name in member_names
+
+    delivered = set()
+    try:
+        if archive_path.lower().endswith(ZIP_SUFFIXES):
+            with zipfile.ZipFile(archive_path) as archive:
+                for info in archive.infolist():
+                    if info.is_dir() or not wanted(info.filename):
+                        continue
+                    # Members are independent, so a bad one only affects itself
+                    delivered.add(info.filename)
+                    try:
+                        member = archive.open(info)
+                    except ARCHIVE_ERRORS as e:
+                        yield _zip_entry(archive_path, info), UnreadableMember(e)
+                        continue
+                    with member:
+                        yield _zip_entry(archive_path, info), member
+            return
+
+        with tarfile.open(archive_path, "r|*") as archive:
+            for info in archive:
+                if not info.isfile() or not wanted(info.name) or info.name in delivered:
+                    continue
+                member = archive.extractfile(info)
+                if member is None:
+                    continue
+                # Stream-mode members cannot seek, which PIL needs; buffer this one member
+                data = member.read()
+                delivered.add(info.name)
+                yield _tar_entry(archive_path, info), io.BytesIO(data)
+    except ARCHIVE_ERRORS as e:
+        # The rest of the archive cannot be reached: report the members not read yet
+        for entry in list_archive_entries(archive_path):
+            if entry["member_path"] not in delivered and wanted(entry["member_path"]):
+                yield entry, UnreadableMember(e)
+
+
+def get_member_entry(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up the entry of a single archive member by its virtual path.
+
+    Args:
+        path: Virtual path of the member
+
+    Returns:
+        Entry dictionary, or None if the path does not point into an archive
+    """
+    parts = split_member_path(path)
+    if parts is None:
+        return None
+
+    archive_path, member_name = parts
+    if archive_path.lower().endswith(ZIP_SUFFIXES):
+        with zipfile.ZipFile(archive_path) as archive:
+            return _zip_entry(archive_path, archive.getinfo(member_name))
+
+    index = _get_tar_index(archive_path)
+    if member_name not in index:
+        raise KeyError(f"There is no item named '{member_name}' in the archive")
+    return _tar_entry(archive_path, index[member_name])
+
+
+def open_member(path: str) -> BinaryIO:
+    """
+    Open an archive member by its virtual path (random access).
+
+    On compressed tars every call decompresses the archive up to the member;
+    use iter_archive_images to read many members.
+
+    Args:
+        path: Virtual path of the member
+
+    Returns:
+        Readable and seekable binary file object
+
+    Raises:
+        ValueError: If the path does not point into an archive
+        KeyError: If the member does not exist
+    """
+    parts = split_member_path(path)
+    if parts is None:
+        raise ValueError(f"'{path}' is not an archive member path")
+
+    archive_path, member_name = parts
+    if archive_path.lower().endswith(ZIP_SUFFIXES):
+        # The member keeps the underlying file open after the ZipFile is closed
+        with zipfile.ZipFile(archive_path) as archive:
+            return archive.open(member_name)
+
+    index = _get_tar_index(archive_path)
+    if member_name not in index:
+        raise KeyError(f"There is no item named '{member_name}' in the archive")
+    with tarfile.open(archive_path, "r:*") as archive:
+        member = archive.extractfile(index[member_name])
+        return io.BytesIO(member.read())
@@ -0,0 +1,138 @@
+"""
+Streaming base64 encoding utilities.
+
+Files are read in fixed-size chunks aligned to 3-byte boundaries, so every chunk
+encodes to a standalone run of base64 characters and memory use stays constant
+regardless of the input size.
+"""
+
+import binascii
+import io
+from typing import BinaryIO, Iterator
+
+# 3 input bytes encode to 4 output characters; keep chunks a multiple of 3
+DEFAULT_CHUNK_SIZE = 3 * 64 * 1024
+
+# Leading bytes used to sniff the MIME type of common image formats
+MIME_SIGNATURES = [
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"BM", "image/bmp"),
+    (b"II*\x00", "image/tiff"),
+    (b"MM\x00*", "image/tiff"),
+]
+
+
+def sniff_mime_type(header: bytes) -> str:
+    """
+    Guess the MIME type of an image from its first bytes.
+
+    Args:
+        header: At least the first 12 bytes of the file
+
+    Returns:
+        MIME type string, application/octet-stream if unknown
+    """
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+
+    for signature, mime_type in MIME_SIGNATURES:
+        if header.startswith(signature):
+            return mime_type
+
+    return "application/octet-stream"
+
+
+def iter_base64_chunks(
+    stream: BinaryIO,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    head: bytes = b""
+) -> Iterator[bytes]:
+    """
+    Encode a binary stream to base64 one chunk at a time.
+
+    Args:
+        stream: Readable binary file object
+        chunk_size: Number of input bytes per chunk (rounded down to a multiple of 3)
+        head: Bytes already read from the stream that should be encoded first
+
+    Returns:
+        Iterator of base64-encoded chunks
+    """
+    chunk_size = max(3, chunk_size - chunk_size % 3)
+    pending = head
+
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        if pending:
+            chunk = pending + chunk
+
+        # Short reads (pipes, archives) may leave bytes that belong to the next group
+        usable = len(chunk) - len(chunk) % 3
+        pending = chunk[usable:]
+        if usable:
+            yield binascii.b2a_base64(memoryview(chunk)[:usable], newline=False)
+
+    if pending:
+        yield binascii.b2a_base64(pending, newline=False)
+
+
+def write_base64_stream(
+    source: BinaryIO,
+    destination: BinaryIO,
+    data_uri: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> int:
+    """
+    Stream base64-encoded data from one binary file object to another.
+
+    Args:
+        source: Readable binary file object (positioned at the start of the data)
+        destination: Writable binary file object
+        data_uri: Whether to prefix the output with a data: URI header
+        chunk_size: Number of input bytes per chunk
+
+    Returns:
+        Number of bytes written to the destination
+    """
+    written = 0
+    header = b""
+
+    if data_uri:
+        header = source.read(12)
+        prefix = f"data:{sniff_mime_type(header)};base64,".encode("ascii")
+        destination.write(prefix)
+        written += len(prefix)
+
+    for encoded in iter_base64_chunks(source, chunk_size, head=header):
+        destination.write(encoded)
+        written += len(encoded)
+
+    return written
+
+
+def encode_base64_string(
+    source: BinaryIO,
+    data_uri: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> str:
+    """
+    Encode a binary file object to a base64 string, reading it chunk by chunk.
+
+    The raw input is never held whole; memory is bounded by the encoded result.
+
+    Args:
+        source: Readable binary file object (positioned at the start of the data)
+        data_uri: Whether to prefix the result with a data: URI header
+        chunk_size: Number of input bytes per chunk
+
+    Returns:
+        Base64-encoded data (or data: URI)
+    """
+    encoded = io.BytesIO()
+    write_base64_stream(source, encoded, data_uri, chunk_size)
+    return encoded.getvalue().decode("ascii")
@@ -0,0 +1,376 @@
+"""
+Offset index utility module for random access into exported metadata catalogs.
+
+An export (NDJSON or JSON list) can carry a sidecar `<export>.idx` file mapping
+the uuid, path and filename of every record to the byte offset and length of
+that record in the export. The index is a sorted array of fixed-size entries
+keyed by a 64-bit hash, so a lookup is a binary search over a memory-mapped
+file followed by parsing just the matching records, which are sliced out of a
+memory map of the export in file order.
+
+Index layout (big-endian): a 32-byte header (magic, export size, export mtime
+in nanoseconds, entry count) followed by entries of (key hash: 8 bytes,
+offset: 8 bytes, length: 4 bytes) sorted by key hash. The stored size and
+mtime let readers detect an index that no longer matches its export.
+"""
+
+import codecs
+import hashlib
+import json
+import mmap
+import os
+import struct
+import textwrap
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .json_stream import detect_json_layout, iter_json_list_spans
+
+INDEX_MAGIC = b"IPCIDX01"
+INDEX_SUFFIX = ".idx"
+
+HEADER = struct.Struct(">8sQqQ")
+ENTRY = struct.Struct(">QQI")
+
+# Record fields that can be looked up
+INDEX_FIELDS = ("uuid", "path", "filename")
+
+
+def index_path_for(export_path: str) -> str:
+    """
+    Get the sidecar index path of an export.
+
+    Args:
+        export_path: Path to the export file
+
+    Returns:
+        Path to the index file
+    """
+    return export_path + INDEX_SUFFIX
+
+
+def key_hash(field: str, value: str) -> int:
+    """
+    Hash a (field, value) lookup key to 64 bits.
+
+    Args:
+        field: Record field name
+        value: Field value
+
+    Returns:
+        Unsigned 64-bit hash
+    """
+    digest = hashlib.blake2b(f"{field}\0{value}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def record_index_entries(record: Dict[str, Any], offset: int, length: int) -> Iterator[Tuple[int, int, int]]:
+    """
+    Build the index entries of one record.
+
+    Args:
+        record: Metadata record
+        offset: Byte offset of the record in the export
+        length: Byte length of the record
+
+    Returns:
+        Iterator of (key hash, offset, length) for each indexed field present
+    """
+    for field in INDEX_FIELDS:
+        value = record.get(field)
+        if isinstance(value, str):
+            yield key_hash(field, value), offset, length
+
+
+def write_index(export_path: str, entries: List[Tuple[int, int, int]]) -> None:
+    """
+    Write the sidecar index of an export.
+
+    Args:
+        export_path: Path to the (already written) export file
+        entries: Index entries of all records
+    """
+    entries.sort()
+    stat = os.stat(export_path)
+    temp_path = f"{index_path_for(export_path)}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(HEADER.pack(INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, len(entries)))
+        for entry in entries:
+            f.write(ENTRY.pack(*entry))
+    os.replace(temp_path, index_path_for(export_path))
+
+
+def write_indexed_ndjson(records: Iterable[Dict[str, Any]], output_path: str) -> int:
+    """
+    Write records as NDJSON together with a sidecar index.
+
+    Args:
+        records: Iterable of JSON-serializable dictionaries
+        output_path: Path of the NDJSON file
+
+    Returns:
+        Number of records written
+    """
+    entries: List[Tuple[int, int, int]] = []
+    count = 0
+    with open(output_path, "wb") as f:
+        for record in records:
+            data = json.dumps(record, separators=(",", ":")).encode("utf-8")
+            entries.extend(record_index_entries(record, f.tell(), len(data)))
+            f.write(data)
+            f.write(b"\n")
+            count += 1
+
+    write_index(output_path, entries)
+    return count
+
+
+def write_indexed_json_list(records: Iterable[Dict[str, Any]], output_path: str) -> int:
+    """
+    Write records as a JSON list (formatted like save_json) together with a sidecar index.
+
+    Args:
+        records: Iterable of JSON-serializable dictionaries
+        output_path: Path of the JSON file
+
+    Returns:
+        Number of records written
+    """
+    entries: List[Tuple[int, int, int]] = []
+    count = 0
+    with open(output_path, "wb") as f:
+        f.write(b"[")
+        for record in records:
+            f.write(b"\n  " if count == 0 else b",\n  ")
+            # Same layout as json.dump(records, indent=2)
+            data = textwrap.indent(json.dumps(record, indent=2), "  ")[2:].encode("utf-8")
+            entries.extend(record_index_entries(record, f.tell(), len(data)))
+            f.write(data)
+            count += 1
+        f.write(b"\n]" if count else b"]")
+
+    write_index(output_path, entries)
+    return count
+
+
+def build_catalog_index(export_path: str) -> int:
+    """
+    Build the sidecar index of an existing NDJSON or JSON list export in one pass.
+
+    Args:
+        export_path: Path to the export file
+
+    Returns:
+        Number of records indexed
+
+    Raises:
+        ValueError: If the export is not an NDJSON or JSON list file
+    """
+    entries: List[Tuple[int, int, int]] = []
+    count = 0
+
+    # The text is read with its line endings intact and any BOM skipped, so
+    # character positions map back to byte offsets in the file
+    with open(export_path, "rb") as f:
+        bom_size = len(codecs.BOM_UTF8) if f.read(len(codecs.BOM_UTF8)) == codecs.BOM_UTF8 else 0
+    with open(export_path, "r", encoding="utf-8-sig", newline="") as f:
+        layout = detect_json_layout(f)
+    if layout == "document":
+        raise ValueError("Only NDJSON and JSON list exports can be indexed")
+
+    if layout == "list":
+        with open(export_path, "r", encoding="utf-8-sig", newline="") as f:
+            for record, start, end in iter_json_list_spans(f, bom_size):
+                if isinstance(record, dict):
+                    entries.extend(record_index_entries(record, start, end - start))
+                count += 1
+    else:
+        with open(export_path, "rb") as f:
+            f.seek(bom_size)
+            offset = bom_size
+            for line in f:
+                stripped = line.rstrip(b"\r\n")
+                if stripped.strip():
+                    entries.extend(record_index_entries(json.loads(stripped), offset, len(stripped)))
+                    count += 1
+                offset += len(line)
+
+    write_index(export_path, entries)
+    return count
+
+
+def is_index_current(export_path: str) -> bool:
+    """
+    Check whether an export has a sidecar index that matches its current contents.
+
+    Args:
+        export_path: Path to the export file
+
+    Returns:
+        True if the index exists and its stored size and mtime match the export
+    """
+    try:
+        with open(index_path_for(export_path), "rb") as f:
+            magic, size, mtime_ns, _ = HEADER.unpack(f.read(HEADER.size))
+        stat = os.stat(export_path)
+    except (OSError, struct.error):
+        return False
+    return magic == INDEX_MAGIC and size == stat.st_size and mtime_ns == stat.st_mtime_ns
+
+
+def find_index_entries(index: Any, count: int, target: int) -> List[Tuple[int, int]]:
+    """
+    Binary search an index for all entries with a key hash.
+
+    Args:
+        index: Buffer holding the index file (e.g. an mmap)
+        count: Number of entries
+        target: Key hash
+
+    Returns:
+        List of (offset, length) of matching entries
+    """
+    low, high = 0, count
+    while low < high:
+        middle = (low + high) // 2
+        if ENTRY.unpack_from(index, HEADER.size + middle * ENTRY.size)[0] < target:
+            low = middle + 1
+        else:
+            high = middle
+
+    matches = []
+    while low < count:
+        hash_value, offset, length = ENTRY.unpack_from(index, HEADER.size + low * ENTRY.size)
+        if hash_value != target:
+            break
+        matches.append((offset, length))
+        low += 1
+    return matches
+
+
+def open_catalog_reader(export_path: str) -> Dict[str, Any]:
+    """
+    Open an export and its sidecar index for repeated lookups.
+
+    Both files are memory-mapped once, so each lookup afterwards only costs a
+    binary search and the parse of the matching records.
+
+    Args:
+        export_path: Path to the export file
+
+    Returns:
+        Reader state dictionary (close with close_catalog_reader)
+
+    Raises:
+        ValueError: If the index is missing or stale
+    """
+    if not is_index_current(export_path):
+        raise ValueError(f"No current index for '{export_path}'")
+
+    reader: Dict[str, Any] = {"export_path": export_path, "files": [], "index": None, "export": None, "count": 0}
+    for name in ("index", "export"):
+        path = index_path_for(export_path) if name == "index" else export_path
+        f = open(path, "rb")
+        reader["files"].append(f)
+        if os.fstat(f.fileno()).st_size:
+            reader[name] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    reader["count"] = HEADER.unpack_from(reader["index"], 0)[3]
+    return reader
+
+
+def close_catalog_reader(reader: Dict[str, Any]) -> None:
+    """
+    Release the memory maps and files of a reader.
+
+    Args:
+        reader: Reader state from open_catalog_reader
+    """
+    for name in ("index", "export"):
+        if reader[name] is not None:
+            reader[name].close()
+            reader[name] = None
+    for f in reader["files"]:
+        f.close()
+    reader["files"] = []
+
+
+def read_records(reader: Dict[str, Any], field: str, values: Iterable[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Fetch the records whose field equals each of the given values from an open reader.
+
+    Matching records are read in file order.
+
+    Args:
+        reader: Reader state from open_catalog_reader
+        field: Record field to match ("uuid", "path" or "filename")
+        values: Values to look up
+
+    Returns:
+        Dictionary mapping each value to its matching records (empty list if none)
+
+    Raises:
+        ValueError: If the field is not indexed
+    """
+    if field not in INDEX_FIELDS:
+        raise ValueError(f"Field must be one of {', '.join(INDEX_FIELDS)}")
+
+    values = list(dict.fromkeys(values))
+    results: Dict[str, List[Dict[str, Any]]] = {value: [] for value in values}
+    spans = sorted(
+        (offset, length, value)
+        for value in values
+        for offset, length in find_index_entries(reader["index"], reader["count"], key_hash(field, value))
+    )
+
+    export = reader["export"]
+    for offset, length, value in spans:
+        record = json.loads(export[offset:offset + length])
+        # Guard against hash collisions
+        if record.get(field) == value:
+            results[value].append(record)
+
+    return results
+
+
+def lookup_records(export_path: str, field: str, values: Iterable[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Fetch the records whose field equals each of the given values, using the sidecar index.
+
+    Opens a reader for the duration of the call; keep a reader from
+    open_catalog_reader instead when doing many separate lookups.
+
+    Args:
+        export_path: Path to the export file
+        field: Record field to match ("uuid", "path" or "filename")
+        values: Values to look up
+
+    Returns:
+        Dictionary mapping each value to its matching records (empty list if none)
+
+    Raises:
+        ValueError: If the field is not indexed or the index is missing or stale
+    """
+    reader = open_catalog_reader(export_path)
+    try:
+        return read_records(reader, field, values)
+    finally:
+        close_catalog_reader(reader)
+
+
+def get_record(export_path: str, field: str, value: str) -> Optional[Dict[str, Any]]:
+    """
+    Fetch the first record whose field equals a value, using the sidecar index.
+
+    Args:
+        export_path: Path to the export file
+        field: Record field to match ("uuid", "path" or "filename")
+        value: Value to look up
+
+    Returns:
+        The record, or None if there is none
+
+    Raises:
+        ValueError: If the field is not indexed or the index is missing or stale
+    """
+    matches = lookup_records(export_path, field, [value])[value]
+    return matches[0] if matches else None
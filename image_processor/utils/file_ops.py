@@ -4,7 +4,15 @@ File operations utility module with pure functions.
 
 import os
 import json
-from typing import List, Dict, Any, Callable, Optional
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple, BinaryIO
+
+# Common image extensions
+IMAGE_EXTENSIONS = ['jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'webp']
+
+# Archives readable as virtual directories; members are addressed as <archive>!/<member>
+ARCHIVE_MEMBER_SEPARATOR = "!/"
+ZIP_SUFFIXES = (".zip",)
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
 
 
 def list_files_in_directory(directory_path: str) -> List[str]:
@@ -86,6 +94,28 @@ def load_json(input_path: str) -> Optional[Any]:
         return None
 
 
+def write_file_atomically(output_path: str, write_fn: Callable[[str], None]) -> None:
+    """
+    Write a file through a temporary file that is renamed over the output path.
+
+    The output is replaced rather than rewritten in place, so other hard links
+    to an existing output keep their contents. The temporary file keeps the
+    output's extension, so writers that pick a format from it still work.
+
+    Args:
+        output_path: Path of the file to write
+        write_fn: Function that writes the file to the path it is given
+    """
+    base, ext = os.path.splitext(output_path)
+    temp_path = f"{base}.{os.getpid()}.tmp{ext}"
+    try:
+        write_fn(temp_path)
+        os.replace(temp_path, output_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
 def process_files_with_function(file_paths: List[str], process_fn: Callable[[str], Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Process multiple files with a provided function.
@@ -100,21 +130,189 @@ def process_files_with_function(file_paths: List[str], process_fn: Callable[[str
     return [process_fn(file_path) for file_path in file_paths]
 
 
+def is_archive_path(path: str) -> bool:
+    """
+    Check whether a path points to a zip or tar archive.
+    
+    Args:
+        path: Path to check
+        
+    Returns:
+        True for existing zip or tar files
+    """
+    return path.lower().endswith(ZIP_SUFFIXES + TAR_SUFFIXES) and os.path.isfile(path)
+
+
+def split_member_path(path: str) -> Optional[Tuple[str, str]]:
+    """
+    Split a virtual `<archive>!/<member>` path into archive path and member name.
+    
+    Args:
+        path: Path that may point inside an archive
+        
+    Returns:
+        Tuple of (archive path, member name), or None for regular paths
+    """
+    if ARCHIVE_MEMBER_SEPARATOR not in path:
+        return None
+    
+    archive_path, member_name = path.split(ARCHIVE_MEMBER_SEPARATOR, 1)
+    if not archive_path.lower().endswith(ZIP_SUFFIXES + TAR_SUFFIXES):
+        return None
+    return archive_path, member_name
+
+
+def image_name(path: str) -> str:
+    """
+    Get the name of an image relative to its directory or archive.
+    
+    Archive members are named by their full path inside the archive (with "/"
+    separators, and without leading slashes, "." or ".." parts), so members with
+    the same basename in different archive directories keep distinct names.
+    
+    Args:
+        path: Regular path or `<archive>!/<member>` path
+        
+    Returns:
+        Basename of a regular file, or the member path of an archive member
+    """
+    parts = split_member_path(path)
+    if parts is None:
+        return os.path.basename(path)
+    
+    segments = parts[1].replace("\\", "/").split("/")
+    return "/".join(segment for segment in segments if segment not in ("", ".", ".."))
+
+
+def output_path_in(output_directory: str, name: str) -> str:
+    """
+    Place an output named after an image inside an output directory.
+    
+    Names of archive members keep their member directories, which are created
+    under the output directory as needed.
+    
+    Args:
+        output_directory: Directory for the outputs
+        name: Output name derived from image_name, with "/" separators
+        
+    Returns:
+        Path of the output file
+    """
+    output_path = os.path.join(output_directory, *name.split("/"))
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    return output_path
+
+
+def open_source_file(path: str) -> BinaryIO:
+    """
+    Open a regular file or a virtual archive member for binary reading.
+    
+    Args:
+        path: Regular path or `<archive>!/<member>` path
+        
+    Returns:
+        Readable binary file object
+    """
+    if split_member_path(path) is not None:
+        from .archive_ops import open_member
+        return open_member(path)
+    return open(path, "rb")
+
+
 def get_image_files_in_directory(directory_path: str) -> List[str]:
     """
     Get all image files in a directory. A composition of other functions.
     
+    Zip and tar archives are treated as directories and yield virtual
+    `<archive>!/<member>` paths.
+    
     Args:
-        directory_path: Path to the directory
+        directory_path: Path to the directory or archive
         
     Returns:
         List of image file paths
     """
-    # Common image extensions
-    image_extensions = ['jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'webp']
+    # Archive support is imported on demand to keep zipfile/tarfile off the startup path
+    if is_archive_path(directory_path):
+        from .archive_ops import list_archive_entries
+        return [entry["path"] for entry in list_archive_entries(directory_path)]
     
     # List and filter files
     all_files = list_files_in_directory(directory_path)
-    image_files = filter_files_by_extension(all_files, image_extensions)
+    image_files = filter_files_by_extension(all_files, IMAGE_EXTENSIONS)
+    
+    return image_files
+
+
+def scan_image_entries(directory_path: str) -> List[Dict[str, Any]]:
+    """
+    Cheaply discover image files with their stat information, without opening them.
+    
+    Args:
+        directory_path: Path to the directory or archive
+        
+    Returns:
+        List of dictionaries with path, name, size_bytes and mtime
+    """
+    if is_archive_path(directory_path):
+        from .archive_ops import list_archive_entries
+        return list_archive_entries(directory_path)
+    
+    if not os.path.isdir(directory_path):
+        return []
+    
+    extensions = {f".{ext}" for ext in IMAGE_EXTENSIONS}
+    entries = []
+    with os.scandir(directory_path) as it:
+        for entry in it:
+            if os.path.splitext(entry.name.lower())[1] not in extensions:
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                stats = entry.stat()
+            except OSError:
+                continue
+            entries.append({
+                "path": entry.path,
+                "name": entry.name,
+                "size_bytes": stats.st_size,
+                "mtime": stats.st_mtime,
+            })
+    
+    return entries
+
+
+def iter_entry_files(entries: List[Dict[str, Any]]) -> Iterator[Tuple[Dict[str, Any], BinaryIO]]:
+    """
+    Open the files of scanned entries one after the other.
+    
+    Regular files are opened in the given order. Archive members are read
+    afterwards in a single pass over each archive, in archive order, since
+    compressed tars cannot open members by random access. Regular files that
+    cannot be opened are skipped; members of truncated or corrupt archives are
+    yielded with a file object that raises when read. Each file object is only
+    valid until the next iteration.
+    
+    Args:
+        entries: File entries from scan_image_entries
+        
+    Returns:
+        Iterator of (entry, readable and seekable binary file object)
+    """
+    member_names: Dict[str, set] = {}
+    for entry in entries:
+        if entry.get("archive_path") is not None:
+            member_names.setdefault(entry["archive_path"], set()).add(entry["member_path"])
+            continue
+        try:
+            f = open(entry["path"], "rb")
+        except OSError:
+            continue
+        with f:
+            yield entry, f
     
-    return image_files
\ No newline at end of file
+    if member_names:
+        from .archive_ops import iter_archive_images
+        for archive_path, names in member_names.items():
+            yield from iter_archive_images(archive_path, names)
\ No newline at end of file
@@ -0,0 +1,205 @@
+"""
+Streaming JSON utility module for reading and writing metadata records.
+
+Supports the two export layouts: a JSON list of records (as written by save_json)
+and newline-delimited JSON (one record per line). Records are parsed one at a
+time, so memory use does not grow with the size of the file.
+"""
+
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional, TextIO, Tuple
+
+# Number of characters read per step when parsing a JSON list
+READ_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+
+
+def detect_json_layout(fp: TextIO) -> str:
+    """
+    Detect whether a file holds a JSON list, NDJSON or a single JSON document.
+
+    The file position is restored afterwards.
+
+    Args:
+        fp: Text file object positioned at the start of the data
+
+    Returns:
+        "list", "ndjson" or "document"
+    """
+    start = fp.tell()
+    first_line = fp.readline()
+    fp.seek(start)
+
+    stripped = first_line.strip()
+    if stripped.startswith("["):
+        return "list"
+    if not stripped:
+        return "ndjson"
+
+    try:
+        json.loads(stripped)
+        return "ndjson"
+    except ValueError:
+        # A pretty-printed object spans several lines
+        return "document"
+
+
+def _scan_json_list(
+    fp: TextIO,
+    track_bytes: bool,
+    base_offset: int = 0
+) -> Iterator[Tuple[Any, Optional[int], Optional[int]]]:
+    """
+    Incrementally parse a top-level JSON list, optionally tracking UTF-8 byte spans.
+
+    Byte offsets are derived by encoding each consumed character exactly once,
+    so tracking stays linear in the size of the file.
+    """
+    buffer = ""
+    position = 0
+    eof = False
+    # "start" expects "[", "first" a value or "]", "item" a value, "separator" "," or "]"
+    state = "start"
+    # Byte offset of buffer[0], and a (character, byte) mark within the buffer
+    base = base_offset
+    mark = [0, 0]
+
+    def byte_offset(index: int) -> int:
+        mark[1] += len(buffer[mark[0]:index].encode("utf-8"))
+        mark[0] = index
+        return base + mark[1]
+
+    while True:
+        while position < len(buffer) and buffer[position].isspace():
+            position += 1
+
+        if position >= len(buffer):
+            if eof:
+                raise ValueError("Unexpected end of JSON list")
+            if track_bytes:
+                base, mark = byte_offset(len(buffer)), [0, 0]
+            buffer = fp.read(READ_SIZE)
+            position = 0
+            eof = not buffer
+            continue
+
+        char = buffer[position]
+        if state == "start":
+            if char != "[":
+                raise ValueError("Expected a JSON list")
+            position += 1
+            state = "first"
+            continue
+        if char == "]" and state in ("first", "separator"):
+            return
+        if state == "separator":
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' in JSON list, got {char!r}")
+            position += 1
+            state = "item"
+            continue
+
+        # A value is only complete if something follows it in the buffer
+        end = None
+        try:
+            item, end = _decoder.raw_decode(buffer, position)
+        except ValueError:
+            if eof:
+                raise
+        if end is not None and (end < len(buffer) or eof):
+            if track_bytes:
+                yield item, byte_offset(position), byte_offset(end)
+            else:
+                yield item, None, None
+            position = end
+            state = "separator"
+            continue
+
+        # Need more data: drop the consumed prefix and read the next block
+        if track_bytes:
+            base, mark = byte_offset(position), [0, 0]
+        data = fp.read(READ_SIZE)
+        buffer = buffer[position:] + data
+        position = 0
+        eof = not data
+
+
+def iter_json_list(fp: TextIO) -> Iterator[Any]:
+    """
+    Incrementally parse the items of a top-level JSON list.
+
+    Args:
+        fp: Text file object positioned at the opening bracket (leading whitespace allowed)
+
+    Returns:
+        Iterator of parsed items
+
+    Raises:
+        ValueError: If the data is not a well-formed JSON list
+    """
+    for item, _, _ in _scan_json_list(fp, track_bytes=False):
+        yield item
+
+
+def iter_json_list_spans(fp: TextIO, base_offset: int = 0) -> Iterator[Tuple[Any, int, int]]:
+    """
+    Incrementally parse a top-level JSON list, with the byte span of each item.
+
+    Offsets are only exact if the file was opened with newline="", so that
+    CRLF line endings reach the parser unchanged.
+
+    Args:
+        fp: UTF-8 text file object opened with newline=""
+        base_offset: Byte offset of the current file position (e.g. the size of a skipped BOM)
+
+    Returns:
+        Iterator of (item, start byte offset, end byte offset)
+
+    Raises:
+        ValueError: If the data is not a well-formed JSON list
+    """
+    yield from _scan_json_list(fp, track_bytes=True, base_offset=base_offset)
+
+
+def iter_json_records(input_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream metadata records from a JSON list, NDJSON or gallery export.
+
+    Args:
+        input_path: Path to the export file
+
+    Returns:
+        Iterator of record dictionaries
+    """
+    with open(input_path, "r", encoding="utf-8") as f:
+        layout = detect_json_layout(f)
+
+        if layout == "list":
+            yield from iter_json_list(f)
+        elif layout == "ndjson":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            document = json.load(f)
+            yield from document.get("items", [document])
+
+
+def write_ndjson(records: Iterable[Dict[str, Any]], fp: TextIO) -> int:
+    """
+    Write records as newline-delimited JSON.
+
+    Args:
+        records: Iterable of JSON-serializable dictionaries
+        fp: Writable text file object
+
+    Returns:
+        Number of records written
+    """
+    count = 0
+    for record in records:
+        fp.write(json.dumps(record, separators=(",", ":")))
+        fp.write("\n")
+        count += 1
+    return count
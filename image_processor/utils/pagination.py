@@ -0,0 +1,157 @@
+"""
+Pagination utility module with pure functions for sorting and paging file entries.
+
+Pages are selected either by offset or by an opaque cursor token. Cursors encode
+the sort order and the sort key of the last returned entry (keyset pagination),
+so they stay stable when files are added or removed between requests.
+"""
+
+import base64
+import bisect
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+# Sort keys supported for file entries, mapped to the entry field they read
+SORT_FIELDS = {
+    "name": "name",
+    "mtime": "mtime",
+    "size": "size_bytes",
+}
+
+
+def entry_sort_key(entry: Dict[str, Any], sort_by: str) -> Tuple[Any, str]:
+    """
+    Build the sort key of a file entry; the name breaks ties so the order is total.
+
+    Args:
+        entry: File entry from scan_image_entries
+        sort_by: One of the SORT_FIELDS keys
+
+    Returns:
+        Tuple of (sort value, name)
+    """
+    return (entry[SORT_FIELDS[sort_by]], entry["name"])
+
+
+def sort_entries(entries: List[Dict[str, Any]], sort_by: str = "name", descending: bool = False) -> List[Dict[str, Any]]:
+    """
+    Sort file entries by a supported sort key.
+
+    Args:
+        entries: File entries from scan_image_entries
+        sort_by: One of the SORT_FIELDS keys
+        descending: Whether to sort in descending order
+
+    Returns:
+        New sorted list of entries
+
+    Raises:
+        ValueError: If sort_by is not supported
+    """
+    if sort_by not in SORT_FIELDS:
+        raise ValueError(f"Unsupported sort key '{sort_by}' (expected one of {', '.join(SORT_FIELDS)})")
+
+    return sorted(entries, key=lambda entry: entry_sort_key(entry, sort_by), reverse=descending)
+
+
+def encode_cursor(entry: Dict[str, Any], sort_by: str, descending: bool) -> str:
+    """
+    Create an opaque cursor pointing just after an entry.
+
+    Args:
+        entry: Last entry of the current page
+        sort_by: Sort key used for the page
+        descending: Sort direction used for the page
+
+    Returns:
+        URL-safe cursor token
+    """
+    payload = {"s": sort_by, "d": descending, "k": list(entry_sort_key(entry, sort_by))}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decode a cursor token created by encode_cursor.
+
+    Args:
+        cursor: Cursor token
+
+    Returns:
+        Dictionary with sort_by, descending and key
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        sort_by, descending, key = payload["s"], bool(payload["d"]), tuple(payload["k"])
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {str(e)}")
+
+    if sort_by not in SORT_FIELDS or len(key) != 2:
+        raise ValueError("Invalid cursor: unknown sort key")
+
+    return {"sort_by": sort_by, "descending": descending, "key": key}
+
+
+def paginate_entries(
+    entries: List[Dict[str, Any]],
+    sort_by: str = "name",
+    descending: bool = False,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Sort file entries and select one page of them.
+
+    When a cursor is given it overrides sort_by, descending and offset.
+
+    Args:
+        entries: File entries from scan_image_entries
+        sort_by: One of the SORT_FIELDS keys
+        descending: Whether to sort in descending order
+        offset: Number of entries to skip
+        limit: Maximum number of entries in the page (None for all)
+        cursor: Cursor token from a previous page
+
+    Returns:
+        Dictionary with entries (the page), total_count, offset, sort_by,
+        descending and next_cursor (None on the last page)
+
+    Raises:
+        ValueError: If the sort key or cursor is invalid
+    """
+    if cursor:
+        position = decode_cursor(cursor)
+        sort_by, descending = position["sort_by"], position["descending"]
+
+    ordered = sort_entries(entries, sort_by, descending)
+
+    if cursor:
+        keys = [entry_sort_key(entry, sort_by) for entry in ordered]
+        if descending:
+            # bisect needs ascending keys; search the reversed list instead
+            offset = len(keys) - bisect.bisect_left(keys[::-1], position["key"])
+        else:
+            offset = bisect.bisect_right(keys, position["key"])
+
+    offset = max(0, offset)
+    end = len(ordered) if limit is None else offset + max(0, limit)
+    page = ordered[offset:end]
+
+    next_cursor = None
+    if page and end < len(ordered):
+        next_cursor = encode_cursor(page[-1], sort_by, descending)
+
+    return {
+        "entries": page,
+        "total_count": len(ordered),
+        "offset": offset,
+        "sort_by": sort_by,
+        "descending": descending,
+        "next_cursor": next_cursor,
+    }
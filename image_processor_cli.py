@@ -3,6 +3,8 @@
 Command-line interface for the image processor package.
 
 This CLI provides access to the image metadata extraction and processing features.
+The package API is imported inside each command handler so a command only pays
+the import cost of what it actually uses.
 """
 
 import argparse
@@ -11,14 +13,7 @@ import os
 import json
 from typing import Dict, Any
 
-from image_processor.api.processor import (
-    get_metadata_for_file,
-    get_metadata_for_directory,
-    export_metadata_to_json,
-    get_image_gallery,
-    get_image_with_metadata,
-    encode_image_to_base64
-)
+from image_processor.utils.file_ops import is_archive_path, split_member_path
 
 
 def parse_arguments():
@@ -39,27 +34,107 @@ def parse_arguments():
     
     # Extract metadata for a directory of images
     dir_parser = subparsers.add_parser("directory", help="Process a directory of images")
-    dir_parser.add_argument("directory_path", help="Path to the directory containing images")
+    dir_parser.add_argument("directory_path", help="Path to the directory (or zip/tar archive) containing images")
     dir_parser.add_argument("--output", "-o", help="Output file path (JSON)")
+    dir_parser.add_argument("--ndjson", action="store_true",
+                          help="Write newline-delimited JSON instead of a JSON list (requires --output)")
+    dir_parser.add_argument("--index", action="store_true",
+                          help="Also write a sidecar offset index for lookups (requires --output)")
     
     # Create a gallery with metadata (and optionally image data)
     gallery_parser = subparsers.add_parser("gallery", help="Create a gallery of images with metadata")
     gallery_parser.add_argument("directory_path", help="Path to the directory containing images")
     gallery_parser.add_argument("--include-images", action="store_true", 
                              help="Include base64-encoded image data")
+    gallery_parser.add_argument("--offset", type=int, default=0, help="Number of images to skip")
+    gallery_parser.add_argument("--limit", type=int, help="Maximum number of images to return")
+    gallery_parser.add_argument("--sort", choices=["name", "mtime", "size"], default="name",
+                             help="Sort key")
+    gallery_parser.add_argument("--desc", action="store_true", help="Sort in descending order")
+    gallery_parser.add_argument("--cursor", help="Cursor token from a previous page")
     gallery_parser.add_argument("--output", "-o", help="Output file path (JSON)")
     
     # Export base64-encoded image
-    base64_parser = subparsers.add_parser("base64", help="Export an image as base64")
-    base64_parser.add_argument("file_path", help="Path to the image file")
-    base64_parser.add_argument("--output", "-o", help="Output file path")
+    base64_parser = subparsers.add_parser("base64", help="Export one or more images as base64")
+    base64_parser.add_argument("file_paths", nargs="+", metavar="file_path",
+                            help="Path to the image file(s)")
+    base64_destination = base64_parser.add_mutually_exclusive_group()
+    base64_destination.add_argument("--output", "-o", help="Output file path (single image only)")
+    base64_destination.add_argument("--output-dir", help="Write one .b64 file per image into this directory")
+    base64_parser.add_argument("--data-uri", action="store_true",
+                            help="Prefix output with a data: URI header")
+    
+    # Pack thumbnails into sprite sheets
+    atlas_parser = subparsers.add_parser("atlas", help="Pack image thumbnails into sprite sheets with a JSON atlas")
+    atlas_parser.add_argument("directory_path", help="Path to the directory containing images")
+    atlas_parser.add_argument("--output-dir", "-o", required=True, help="Directory for sheets and atlas JSON")
+    atlas_parser.add_argument("--name", default="atlas", help="Base name of the sheet and atlas files")
+    atlas_parser.add_argument("--thumb-size", type=int, default=128, help="Maximum thumbnail size in pixels")
+    atlas_parser.add_argument("--sheet-size", type=int, default=2048, help="Maximum sheet size in pixels")
+    atlas_parser.add_argument("--offset", type=int, default=0, help="Number of images to skip")
+    atlas_parser.add_argument("--limit", type=int, help="Maximum number of images to pack")
+    atlas_parser.add_argument("--sort", choices=["name", "mtime", "size"], default="name",
+                           help="Sort key")
+    atlas_parser.add_argument("--desc", action="store_true", help="Sort in descending order")
+    atlas_parser.add_argument("--cursor", help="Cursor token from a gallery page")
+    
+    # Aggregate statistics over a directory
+    stats_parser = subparsers.add_parser("stats", help="Compute summary statistics for a directory of images")
+    stats_parser.add_argument("directory_path", nargs="?", help="Path to the directory containing images")
+    stats_parser.add_argument("--workers", "-w", type=int, default=1,
+                           help="Number of threads extracting metadata")
+    stats_parser.add_argument("--prefetch", type=int, default=0,
+                           help="Number of files to read ahead on slow storage (0 disables)")
+    stats_parser.add_argument("--top", type=int, default=10, help="Number of largest and oldest files to list")
+    stats_parser.add_argument("--partial", action="store_true",
+                           help="Output mergeable aggregate state instead of a report")
+    stats_parser.add_argument("--merge", nargs="+", metavar="PARTIAL",
+                           help="Combine partial results (from --partial) instead of scanning")
+    stats_parser.add_argument("--output", "-o", help="Output file path (JSON)")
+    
+    # Extract PNG text chunks without decoding pixels
+    text_parser = subparsers.add_parser("text", help="Extract PNG text chunks (prompts, parameters) as NDJSON")
+    text_parser.add_argument("directory_path", help="Path to the directory (or zip/tar archive) containing PNGs")
+    text_parser.add_argument("--keyword", "-k", action="append", dest="keywords", metavar="KEYWORD",
+                          help="Only keep this text keyword (repeatable)")
+    text_parser.add_argument("--output", "-o", help="Output file path (NDJSON)")
+    
+    # Look up records in a large export through its offset index
+    lookup_parser = subparsers.add_parser("lookup", help="Fetch records from a metadata export by uuid, path or filename")
+    lookup_parser.add_argument("export_path", help="Path to the export (JSON list or NDJSON)")
+    lookup_parser.add_argument("values", nargs="+", metavar="value", help="Values to look up")
+    lookup_parser.add_argument("--by", choices=["uuid", "path", "filename"], default="uuid",
+                            help="Record field to match")
+    
+    # Compare two metadata exports
+    diff_parser = subparsers.add_parser("diff", help="Compare two metadata exports (NDJSON output)")
+    diff_parser.add_argument("old_path", help="Path to the older export (JSON list or NDJSON)")
+    diff_parser.add_argument("new_path", help="Path to the newer export (JSON list or NDJSON)")
+    diff_parser.add_argument("--key", choices=["path", "uuid"], default="path",
+                          help="Record field to match images on")
+    diff_parser.add_argument("--include-unchanged", action="store_true",
+                          help="Also emit records for unchanged images")
+    diff_parser.add_argument("--output", "-o", help="Output file path (NDJSON)")
     
     return parser.parse_args()
 
 
+def file_exists(path: str) -> bool:
+    """Check that a path is an existing file or names a member inside an archive."""
+    parts = split_member_path(path)
+    return os.path.isfile(parts[0]) if parts else os.path.exists(path)
+
+
+def directory_exists(path: str) -> bool:
+    """Check that a path is an existing directory or a zip/tar archive."""
+    return os.path.isdir(path) or is_archive_path(path)
+
+
 def handle_file_command(args):
     """Handle the 'file' command."""
-    if not os.path.exists(args.file_path):
+    from image_processor.api.processor import get_image_with_metadata, get_metadata_for_file
+    
+    if not file_exists(args.file_path):
         print(f"Error: File '{args.file_path}' does not exist.")
         return 1
         
@@ -80,18 +155,30 @@ def handle_file_command(args):
 
 def handle_directory_command(args):
     """Handle the 'directory' command."""
-    if not os.path.exists(args.directory_path) or not os.path.isdir(args.directory_path):
+    from image_processor.api.processor import (
+        export_metadata_to_json,
+        export_metadata_to_ndjson,
+        get_metadata_for_directory
+    )
+    
+    if not directory_exists(args.directory_path):
         print(f"Error: Directory '{args.directory_path}' does not exist.")
         return 1
         
     success = False
     
     if args.output:
-        success = export_metadata_to_json(args.directory_path, args.output)
+        if args.ndjson:
+            success = export_metadata_to_ndjson(args.directory_path, args.output, args.index)
+        else:
+            success = export_metadata_to_json(args.directory_path, args.output, args.index)
         if success:
-            print(f"Metadata saved to '{args.output}'")
+            print(f"Metadata saved to '{args.output}'" + (" (with offset index)" if args.index else ""))
         else:
             print(f"Error: Failed to save metadata to '{args.output}'")
+    elif args.ndjson or args.index:
+        print("Error: --ndjson and --index require --output.")
+        return 1
     else:
         results = get_metadata_for_directory(args.directory_path)
         print(json.dumps(results, indent=2))
@@ -102,11 +189,21 @@ def handle_directory_command(args):
 
 def handle_gallery_command(args):
     """Handle the 'gallery' command."""
-    if not os.path.exists(args.directory_path) or not os.path.isdir(args.directory_path):
+    from image_processor.api.processor import get_image_gallery
+    
+    if not directory_exists(args.directory_path):
         print(f"Error: Directory '{args.directory_path}' does not exist.")
         return 1
         
-    gallery = get_image_gallery(args.directory_path, args.include_images)
+    try:
+        gallery = get_image_gallery(
+            args.directory_path, args.include_images,
+            offset=args.offset, limit=args.limit,
+            sort_by=args.sort, descending=args.desc, cursor=args.cursor
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
     
     if args.output:
         with open(args.output, 'w') as f:
@@ -120,24 +217,186 @@ def handle_gallery_command(args):
 
 def handle_base64_command(args):
     """Handle the 'base64' command."""
-    if not os.path.exists(args.file_path):
-        print(f"Error: File '{args.file_path}' does not exist.")
+    from image_processor.api.processor import (
+        stream_image_to_base64,
+        export_images_to_base64_files
+    )
+    
+    for file_path in args.file_paths:
+        if not file_exists(file_path):
+            print(f"Error: File '{file_path}' does not exist.")
+            return 1
+    
+    if args.output_dir:
+        written = export_images_to_base64_files(args.file_paths, args.output_dir, args.data_uri)
+        print(f"Base64 data for {len(written)} of {len(args.file_paths)} images saved to '{args.output_dir}'")
+        return 0 if len(written) == len(args.file_paths) else 1
+    
+    if args.output:
+        if len(args.file_paths) > 1:
+            print("Error: --output accepts a single image; use --output-dir for several.")
+            return 1
+        with open(args.output, 'wb') as f:
+            success = stream_image_to_base64(args.file_paths[0], f, args.data_uri)
+        if success:
+            print(f"Base64 data saved to '{args.output}'")
+            return 0
+        print(f"Error: Failed to encode '{args.file_paths[0]}' to base64.")
         return 1
-        
-    base64_data = encode_image_to_base64(args.file_path)
     
-    if base64_data:
+    # Stream straight to stdout, one line per image
+    stdout = sys.stdout.buffer
+    for file_path in args.file_paths:
+        if not stream_image_to_base64(file_path, stdout, args.data_uri):
+            stdout.flush()
+            print(f"\nError: Failed to encode '{file_path}' to base64.")
+            return 1
+        stdout.write(b"\n")
+    stdout.flush()
+    
+    return 0
+
+
+def handle_atlas_command(args):
+    """Handle the 'atlas' command."""
+    from image_processor.api.processor import create_sprite_atlas
+    
+    if not directory_exists(args.directory_path):
+        print(f"Error: Directory '{args.directory_path}' does not exist.")
+        return 1
+    
+    try:
+        atlas = create_sprite_atlas(
+            args.directory_path, args.output_dir, args.name,
+            args.thumb_size, args.sheet_size,
+            offset=args.offset, limit=args.limit,
+            sort_by=args.sort, descending=args.desc, cursor=args.cursor
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    
+    stats = atlas["stats"]
+    print(f"Atlas with {len(atlas['sprites'])} sprites on {len(atlas['sheets'])} sheets saved to "
+          f"'{os.path.join(args.output_dir, args.name + '.json')}' "
+          f"({stats['thumbnails_decoded']} decoded, {stats['thumbnails_reused']} reused, "
+          f"{stats['sheets_written']} sheets written, {stats['sheets_kept']} kept)")
+    return 0
+
+
+def handle_stats_command(args):
+    """Handle the 'stats' command."""
+    from image_processor.api.processor import (
+        compute_directory_stats,
+        combine_directory_stats,
+        get_stats_report
+    )
+    from image_processor.utils.file_ops import load_json
+    
+    partials = []
+    for partial_path in args.merge or []:
+        partial = load_json(partial_path)
+        if partial is None:
+            print(f"Error: Failed to load partial statistics from '{partial_path}'.")
+            return 1
+        partials.append(partial)
+    
+    if args.directory_path:
+        if not directory_exists(args.directory_path):
+            print(f"Error: Directory '{args.directory_path}' does not exist.")
+            return 1
+        partials.append(compute_directory_stats(
+            args.directory_path, args.workers, args.top, args.prefetch
+        ))
+    
+    if not partials:
+        print("Error: Specify a directory and/or --merge partial results.")
+        return 1
+    
+    try:
+        stats = combine_directory_stats(partials)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    
+    result = stats if args.partial else get_stats_report(stats)
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"Statistics saved to '{args.output}'")
+    else:
+        print(json.dumps(result, indent=2))
+    
+    return 0
+
+
+def handle_diff_command(args):
+    """Handle the 'diff' command."""
+    from image_processor.api.processor import export_metadata_diff
+    
+    for path in (args.old_path, args.new_path):
+        if not os.path.isfile(path):
+            print(f"Error: File '{path}' does not exist.")
+            return 1
+    
+    try:
         if args.output:
             with open(args.output, 'w') as f:
-                f.write(base64_data)
-            print(f"Base64 data saved to '{args.output}'")
+                summary = export_metadata_diff(
+                    args.old_path, args.new_path, f, args.key, args.include_unchanged
+                )
+            counts = ", ".join(f"{count} {change}" for change, count in sorted(summary.items()))
+            print(f"Diff saved to '{args.output}' ({counts or 'no changes'})")
         else:
-            print(base64_data)
-            
-        return 0
-    else:
-        print(f"Error: Failed to encode '{args.file_path}' to base64.")
+            export_metadata_diff(args.old_path, args.new_path, sys.stdout, args.key, args.include_unchanged)
+    except ValueError as e:
+        print(f"Error: Failed to read metadata export: {e}")
+        return 1
+    
+    return 0
+
+
+def handle_lookup_command(args):
+    """Handle the 'lookup' command."""
+    from image_processor.api.processor import lookup_metadata_records
+    
+    if not os.path.isfile(args.export_path):
+        print(f"Error: File '{args.export_path}' does not exist.")
+        return 1
+    
+    try:
+        results = lookup_metadata_records(args.export_path, args.values, args.by)
+    except ValueError as e:
+        print(f"Error: Failed to read metadata export: {e}")
+        return 1
+    
+    missing = [value for value, records in results.items() if not records]
+    for records in results.values():
+        for record in records:
+            print(json.dumps(record))
+    for value in missing:
+        print(f"Error: No record with {args.by} '{value}'")
+    
+    return 1 if missing else 0
+
+
+def handle_text_command(args):
+    """Handle the 'text' command."""
+    from image_processor.api.processor import export_png_text_to_ndjson
+    
+    if not directory_exists(args.directory_path):
+        print(f"Error: Directory '{args.directory_path}' does not exist.")
         return 1
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            count = export_png_text_to_ndjson(args.directory_path, f, args.keywords)
+        print(f"Text chunks of {count} PNGs saved to '{args.output}'")
+    else:
+        export_png_text_to_ndjson(args.directory_path, sys.stdout, args.keywords)
+    
+    return 0
 
 
 def main():
@@ -152,6 +411,16 @@ def main():
         return handle_gallery_command(args)
     elif args.command == "base64":
         return handle_base64_command(args)
+    elif args.command == "atlas":
+        return handle_atlas_command(args)
+    elif args.command == "stats":
+        return handle_stats_command(args)
+    elif args.command == "diff":
+        return handle_diff_command(args)
+    elif args.command == "text":
+        return handle_text_command(args)
+    elif args.command == "lookup":
+        return handle_lookup_command(args)
     else:
         print("Error: No command specified. Use -h for help.")
         return 1